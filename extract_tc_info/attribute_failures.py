@@ -0,0 +1,208 @@
+import argparse
+import json
+import logging
+import os.path
+import posixpath
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import extract_tc_info as et
+
+logger = logging.getLogger(__name__)
+
+CommitHash = str
+CommitData = dict
+Revision = str
+
+# NOTE: 'collect_git_info' keeps modified renamed files in 'Changed_files: ' as '{old => new}' or 'old => new' text.
+RENAMED_PATH_PATTERN = re.compile(r'{(.*?)\s*=>\s*(.*?)}')
+RENAME_SEPARATOR = " => "
+
+
+@dataclass
+class GitHistoryIndex:
+    """Commits of 'collect_git_info' output in 'git log' order, indexed by hash for constant time lookups"""
+
+    commits: list[CommitData] = field(default_factory=list)
+    positions: dict[CommitHash, int] = field(default_factory=dict)
+
+    def add(self, commit_data: CommitData):
+        self.positions[commit_data.get("Commit: ", "")] = len(self.commits)
+        self.commits.append(commit_data)
+
+    def get_position(self, revision: Revision) -> int | None:
+        """Position of the commit in 'git log' order, the newest commit is the first, None for unknown revision"""
+
+        return self.positions.get(revision)
+
+
+def load_git_info(git_info_file: Path) -> GitHistoryIndex:
+    """Reads 'collect_git_info' output in 'json' (also 'json-stream') or 'jsonl' format"""
+
+    history_index = GitHistoryIndex()
+    with open(git_info_file, "r", encoding="UTF-8") as file:
+        if git_info_file.suffix == ".jsonl":
+            commits_data: Iterable[CommitData] = (json.loads(line) for line in file if line.strip())
+        else:
+            commits_data = json.load(file).values()
+
+        for commit_data in commits_data:
+            history_index.add(commit_data)
+
+    return history_index
+
+
+def collect_test_paths(builds: Iterable[dict], test_paths: dict[et.TestCaseName, str]) -> Iterator[dict]:
+    """Passes builds through, keeping path of every test file relative to test automation repository"""
+
+    for build in builds:
+        for test in et.traverse_json(build, keys=["properties", "test_scenario", "tests"]) or []:
+            if test.get("test_path"):
+                test_paths[test.get("test_file", "")] = test["test_path"]
+        yield build
+
+
+def split_renamed_path(changed_file: str) -> list[str]:
+    """Returns old and new path of renamed 'Changed_files: ' entry, the entry itself if it's not renamed"""
+
+    if RENAME_SEPARATOR not in changed_file:
+        return [changed_file]
+    if "{" in changed_file:
+        return [RENAMED_PATH_PATTERN.sub(r'\1', changed_file).replace("//", "/"),
+                RENAMED_PATH_PATTERN.sub(r'\2', changed_file).replace("//", "/")]
+    return changed_file.split(RENAME_SEPARATOR, 1)
+
+
+def get_changed_paths(commit_data: CommitData) -> list[str]:
+    """Paths changed by the commit, renamed files with both their old and new paths"""
+
+    changed_paths = [path for changed_file in commit_data.get("Changed_files: ", [])
+                     for path in split_renamed_path(changed_file)]
+    if "Renamed_paths: " in commit_data:
+        changed_paths.extend(path for renamed_paths in commit_data["Renamed_paths: "] for path in renamed_paths)
+    else:
+        changed_paths.extend(path for key, path in commit_data.get("Renamed_files: ", {}).items()
+                             if key.startswith("new_"))
+    return list(dict.fromkeys(changed_paths))
+
+
+def is_related_file(path: str, test_path: str) -> bool:
+    """Test file itself and files next to it (helpers, data, conftest) are related to the test"""
+
+    return path == test_path or posixpath.dirname(path) == posixpath.dirname(test_path)
+
+
+def attribute_failure(test_path: str, revision_results: dict[Revision, dict[str, int]],
+                      history_index: GitHistoryIndex) -> dict | None:
+    """Finds the newest failing revision of test and the closest older green revision, returns commits between them,
+    which touched files related to the test. None if test does not fail on any known revision.
+    """
+
+    failing_positions = []
+    green_positions = []
+    for revision, results in revision_results.items():
+        position = history_index.get_position(revision)
+        if position is None:
+            continue
+        if results["failed"]:
+            failing_positions.append(position)
+        elif results["passed"]:
+            green_positions.append(position)
+
+    if not failing_positions:
+        return None
+
+    failing_position = min(failing_positions)
+    # NOTE: Older commits have bigger positions, the closest green revision is the smallest older position.
+    green_position = min((position for position in green_positions if position > failing_position), default=None)
+    end_position = len(history_index.commits) if green_position is None else green_position
+
+    commits = []
+    for commit_data in history_index.commits[failing_position:end_position]:
+        related_files = [path for path in get_changed_paths(commit_data) if is_related_file(path, test_path)]
+        if related_files:
+            commits.append({
+                "commit": commit_data.get("Commit: ", ""),
+                "author": commit_data.get("Author: ", ""),
+                "date": commit_data.get("Date: ", ""),
+                "related_files": related_files,
+            })
+
+    return {
+        "failing_revision": history_index.commits[failing_position].get("Commit: ", ""),
+        "green_revision": (history_index.commits[green_position].get("Commit: ", "")
+                           if green_position is not None else None),
+        "commits": commits,
+    }
+
+
+def attribute_failures(builds: Iterable[dict], history_index: GitHistoryIndex) -> dict[et.TestCaseName, dict]:
+    """Aggregates builds once, then attributes failure of every failing test to commits touching related files"""
+
+    test_paths: dict[et.TestCaseName, str] = {}
+    accumulators = et.aggregate_builds(collect_test_paths(builds, test_paths))
+
+    attributed_failures = {}
+    for test_file, accumulator in accumulators.items():
+        if not accumulator.failed:
+            continue
+
+        if test_file not in test_paths:
+            logger.info(f"Test {test_file} has no 'test_path', its failure can't be attributed")
+            continue
+
+        attributed_failure = attribute_failure(test_paths[test_file], accumulator.revision_results, history_index)
+        if attributed_failure is not None:
+            attributed_failures[test_file] = attributed_failure
+
+    return attributed_failures
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-g", "--git_info_file", type=Path, required=True,
+                        help="Specify 'collect_git_info' output of test automation repository (json or jsonl)")
+    parser.add_argument("-i", "--input_file", type=Path, default="data_input.json",
+                        help="Specify the json file with test runs data")
+    parser.add_argument("-j", "--json_file", type=Path, default="failures_attribution.json",
+                        help="Specify the json file name, where attributed failures will be kept")
+    parser.add_argument("-log", "--log-file", default="failures_attribution.log",
+                        help="Specify the file name, where logs should be kept")
+    return parser.parse_args()
+
+
+def main(logger_: logging.Logger):
+    logger_.info(" >>> Running the script\n")
+
+    try:
+        history_index = load_git_info(args.git_info_file)
+    except (OSError, json.JSONDecodeError) as e:
+        logger_.error(f"Error occurred trying to read {args.git_info_file}: \n{e}")
+        sys.exit(1)
+
+    try:
+        attributed_failures = attribute_failures(et.iter_builds_from_file(args.input_file), history_index)
+    except (OSError, ValueError) as e:
+        logger_.error(f"Error occurred trying to read {args.input_file}: \n{e}")
+        sys.exit(1)
+
+    try:
+        et.create_json_file(attributed_failures, args.json_file)
+    except Exception as e:
+        logger_.error(f"Error occurred trying write {args.json_file}: \n{e}")
+        sys.exit(1)
+
+    logger_.info(f" >>> Was generated {args.json_file} file in {os.getcwd()} directory")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    logger = et.configure_logger(args.log_file)
+    start = time.time()
+    main(logger_=logger)
+    end_time = time.time()
+    print(end_time - start)
@@ -0,0 +1,80 @@
+import argparse
+import json
+import logging
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+import extract_tc_info as et
+
+
+def process_with_dicts(run_tests_data: dict) -> dict:
+    """Collects runs the way 'process_the_run_tests_data' did before 'TestRun', one dict per run"""
+
+    extracted_info = defaultdict(list)
+    for build in run_tests_data["builds"]:
+        tests_info = et.traverse_json(build, keys=["properties", "test_scenario", "tests"])
+        if tests_info is None:
+            return {}
+
+        for test in tests_info:
+            extracted_info[test.get("test_file", "")].append(
+                {
+                    "submission_time": test.get("submission_time", ""),
+                    "results": build.get("results", ""),
+                    "revision": build.get("properties", {}).get("revision", "")
+                }
+            )
+
+    return extracted_info
+
+
+def load_test_runs_data(input_file: Path, repeat: int) -> dict:
+    """Loads test runs data, every repetition is decoded separately, so strings are not shared between them"""
+
+    builds = []
+    text = input_file.read_text(encoding="UTF-8")
+    for _ in range(repeat):
+        builds.extend(json.loads(text)["builds"])
+    return {"builds": builds}
+
+
+def measure_allocated_memory(process, run_tests_data: dict) -> tuple[int, int]:
+    """Returns bytes kept allocated by the result of 'process' and amount of runs in it"""
+
+    tracemalloc.start()
+    snapshot_before = tracemalloc.take_snapshot()
+    extracted_info = process(run_tests_data)
+    snapshot_after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocated = sum(statistic.size_diff for statistic in snapshot_after.compare_to(snapshot_before, "filename"))
+    amount_of_runs = sum(len(test_runs) for test_runs in extracted_info.values())
+    return allocated, amount_of_runs
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-i", "--input_file", type=Path, default=Path(__file__).parent / "data_input.json",
+                        help="Specify the json file with test runs data")
+    parser.add_argument("-r", "--repeat", type=int, default=20,
+                        help="Specify how many times builds of the input file are repeated")
+    return parser.parse_args()
+
+
+def main():
+    logging.disable(logging.CRITICAL)
+    run_tests_data = load_test_runs_data(args.input_file, args.repeat)
+
+    results = {}
+    for name, process in [("dicts", process_with_dicts), ("TestRun", et.process_the_run_tests_data)]:
+        allocated, amount_of_runs = measure_allocated_memory(process, run_tests_data)
+        results[name] = allocated / amount_of_runs
+        print(f"{name:>8}: {allocated / 1024:.1f} KiB for {amount_of_runs} runs, {results[name]:.1f} B per run")
+
+    print(f"{'saving':>8}: {1 - results['TestRun'] / results['dicts']:.0%}")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main()
@@ -1,17 +1,32 @@
 import argparse
+import bisect
+import codecs
+import fnmatch
+import functools
+import heapq
 import json
 import logging
 import os.path
+import subprocess
 import sys
+import threading
 import time
+from array import array
 from collections import defaultdict
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
 from pathlib import Path
 
 import requests
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,22 +44,34 @@ class DataConverter:
         return f"{self.ratio*100}%"
 
 
-def collect_test_cases_from_directory(test_automation_directory: Path) -> list[Path]:
-    """From given TA directory, collects all 'test_*.py' files from '/test_cases/'"""
+TEST_CASE_PATTERN = "test_*.py"
+DirectoryEntry = dict
 
+
+def get_test_cases_directory(test_automation_directory: Path) -> Path | None:
     if not isinstance(test_automation_directory, Path):
         logger.error(
             f"'{test_automation_directory}' expected to be Path type, got {type(test_automation_directory)} instead"
         )
-        return []
+        return None
 
     test_cases_directory = test_automation_directory / "test_cases"
 
     if not test_cases_directory.is_dir():
         logger.error(f"{test_cases_directory} - is not a directory")
+        return None
+
+    return test_cases_directory
+
+
+def collect_test_cases_from_directory(test_automation_directory: Path) -> list[Path]:
+    """From given TA directory, collects all 'test_*.py' files from '/test_cases/'"""
+
+    test_cases_directory = get_test_cases_directory(test_automation_directory)
+    if test_cases_directory is None:
         return []
 
-    test_cases_files = list(Path(test_cases_directory).rglob("test_*.py"))
+    test_cases_files = list(Path(test_cases_directory).rglob(TEST_CASE_PATTERN))
 
     if not test_cases_files:
         logger.warning(f"{test_cases_directory} doesn't have any 'test_*.py' files")
@@ -53,7 +80,159 @@ def collect_test_cases_from_directory(test_automation_directory: Path) -> list[P
     return test_cases_files
 
 
-def fetch_test_runs_data(ip_address: str, project_name: str, limit: int) -> dict | None:
+def collect_test_cases_from_git(test_automation_directory: Path) -> list[Path]:
+    """Collects 'test_*.py' files under '/test_cases/', which are tracked by git, without walking the directory"""
+
+    test_cases_directory = get_test_cases_directory(test_automation_directory)
+    if test_cases_directory is None:
+        return []
+
+    result = subprocess.run(["git", "-C", str(test_cases_directory), "ls-files", "-z", "--full-name", "--", "."],
+                            capture_output=True)
+    if result.returncode != 0:
+        logger.error(f"{test_cases_directory} is not in a git repository: \n{' '.join(result.args)}\n{result.stderr}\n")
+        return []
+
+    top_level = subprocess.run(["git", "-C", str(test_cases_directory), "rev-parse", "--show-toplevel"],
+                               capture_output=True, text=True).stdout.strip()
+    test_cases_files = [
+        Path(top_level) / path
+        for path in result.stdout.decode("UTF-8", errors="surrogateescape").split("\0")
+        if path and fnmatch.fnmatch(path.rsplit("/", 1)[-1], TEST_CASE_PATTERN)
+    ]
+
+    if not test_cases_files:
+        logger.warning(f"{test_cases_directory} doesn't have any tracked 'test_*.py' files")
+
+    return test_cases_files
+
+
+def scan_directory(directory: Path) -> DirectoryEntry:
+    """Lists directory once, keeping its subdirectories and test cases with their metadata"""
+
+    directory_entry = {"mtime_ns": os.stat(directory).st_mtime_ns, "subdirectories": [], "test_cases": []}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            # NOTE: Symlinked directories are not followed, the same as 'Path.rglob' does.
+            if entry.is_dir(follow_symlinks=False):
+                directory_entry["subdirectories"].append(entry.name)
+            elif fnmatch.fnmatch(entry.name, TEST_CASE_PATTERN) and entry.is_file():
+                stat = entry.stat()
+                directory_entry["test_cases"].append(
+                    {"name": entry.name, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+                )
+
+    return directory_entry
+
+
+def revalidate_directory(directory: Path, cached_entry: DirectoryEntry | None) -> DirectoryEntry | None:
+    """Returns cached entry if directory was not changed since it was scanned, otherwise scans it again"""
+
+    try:
+        # NOTE: Adding, removing or renaming an entry changes the mtime of directory, which contains it.
+        if cached_entry is not None and os.stat(directory).st_mtime_ns == cached_entry["mtime_ns"]:
+            return cached_entry
+        return scan_directory(directory)
+    except OSError as e:
+        logger.warning(f"Failed to scan {directory}: {e}")
+        return None
+
+
+def load_directory_index(index_file: Path, test_cases_directory: Path) -> dict[str, DirectoryEntry]:
+    if not index_file.is_file():
+        return {}
+
+    try:
+        with open(index_file, "r", encoding="UTF-8") as file:
+            index = json.load(file)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring damaged index {index_file}: {e}")
+        return {}
+
+    if index.get("root") != str(test_cases_directory.resolve()):
+        logger.info(f"Index {index_file} was created for {index.get('root')}, scanning from scratch")
+        return {}
+
+    return index.get("directories", {})
+
+
+def create_directory_index_file(directories: dict[str, DirectoryEntry], test_cases_directory: Path, index_file: Path):
+    with open(index_file, "w", encoding="UTF-8") as file:
+        json.dump({"root": str(test_cases_directory.resolve()), "directories": directories}, file,
+                  ensure_ascii=False, separators=(",", ":"))
+
+
+def collect_test_cases_indexed(test_automation_directory: Path, index_file: Path, jobs: int = 8) -> list[Path]:
+    """Same as 'collect_test_cases_from_directory', but only directories changed since the previous run are listed.
+
+    Directories are revalidated level by level, every level is stat-ed in parallel.
+    """
+
+    test_cases_directory = get_test_cases_directory(test_automation_directory)
+    if test_cases_directory is None:
+        return []
+
+    cached_directories = load_directory_index(index_file, test_cases_directory)
+    directories: dict[str, DirectoryEntry] = {}
+    amount_of_scanned_directories = 0
+
+    level = ["."]
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+        while level:
+            directory_entries = executor.map(
+                lambda relative_path: revalidate_directory(test_cases_directory / relative_path,
+                                                           cached_directories.get(relative_path)),
+                level
+            )
+
+            next_level = []
+            for relative_path, directory_entry in zip(level, directory_entries):
+                if directory_entry is None:
+                    continue
+                if directory_entry is not cached_directories.get(relative_path):
+                    amount_of_scanned_directories += 1
+
+                directories[relative_path] = directory_entry
+                next_level.extend(os.path.normpath(os.path.join(relative_path, subdirectory))
+                                  for subdirectory in directory_entry["subdirectories"])
+            level = next_level
+
+    logger.info(f"{amount_of_scanned_directories} of {len(directories)} directories were listed again")
+
+    try:
+        create_directory_index_file(directories, test_cases_directory, index_file)
+    except OSError as e:
+        logger.error(f"Error occurred trying write {index_file}: \n{e}")
+
+    test_cases_files = [
+        test_cases_directory / relative_path / test_case["name"]
+        for relative_path, directory_entry in directories.items()
+        for test_case in directory_entry["test_cases"]
+    ]
+
+    if not test_cases_files:
+        logger.warning(f"{test_cases_directory} doesn't have any 'test_*.py' files")
+
+    return test_cases_files
+
+
+TEST_CASES_SOURCES = ["rglob", "index", "git"]
+
+
+def collect_test_cases(test_automation_directory: Path, source: str = "rglob", index_file: Path | None = None,
+                       jobs: int = 8) -> list[Path]:
+    if source == "index":
+        return collect_test_cases_indexed(test_automation_directory, index_file, jobs)
+    if source == "git":
+        return collect_test_cases_from_git(test_automation_directory)
+    return collect_test_cases_from_directory(test_automation_directory)
+
+
+# NOTE: Field filter in Buildbot REST API style, server returns only builds with bigger 'buildid'.
+NEWER_THAN_BUILDID_PARAMETER = "buildid__gt"
+
+
+def fetch_test_runs_data(ip_address: str, project_name: str, limit: int, newer_than_buildid: int = 0) -> dict | None:
     """Fetches test runs data from a remote server, returning the response JSON data as a formatted string."""
 
     url = f"http://{ip_address}/test_runs"
@@ -61,6 +240,8 @@ def fetch_test_runs_data(ip_address: str, project_name: str, limit: int) -> dict
         "project": project_name,
         "limit": limit
     }
+    if newer_than_buildid:
+        params[NEWER_THAN_BUILDID_PARAMETER] = newer_than_buildid
     headers = {
         "accept": "application/json"
     }
@@ -75,7 +256,241 @@ def fetch_test_runs_data(ip_address: str, project_name: str, limit: int) -> dict
             f"Failed to fetch data. URL: {response.url}\nStatus: {response.status_code}\nReason: {response.reason}\n")
         return None
 
-    return response.json()
+    try:
+        return response.json()
+    except ValueError as e:
+        logger.error(f"Response of {response.url} is not valid JSON:\n{e}")
+        return None
+
+
+def create_session(concurrency: int) -> requests.Session:
+    """Creates session, which keeps up to 'concurrency' connections open for reuse"""
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max(concurrency, 1))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def fetch_test_runs_page(session: requests.Session, url: str, params: dict, retries: int,
+                         backoff: float) -> dict | None:
+    """Fetches single page of test runs, retrying failed requests with exponential backoff"""
+
+    headers = {
+        "accept": "application/json"
+    }
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(backoff * 2 ** (attempt - 1))
+
+        try:
+            response = session.get(url, params=params, headers=headers, data=json.dumps(params), timeout=5)
+        except requests.RequestException as e:
+            logger.warning(f"Request of page with offset {params['offset']} failed, attempt {attempt + 1}:\n{e}")
+            continue
+
+        if response.status_code == 200:
+            try:
+                return response.json()
+            except ValueError as e:
+                logger.warning(f"Page with offset {params['offset']} is not valid JSON, attempt {attempt + 1}:\n{e}")
+                continue
+
+        logger.warning(f"Failed to fetch page. URL: {response.url}\nStatus: {response.status_code}\n"
+                       f"Reason: {response.reason}\nAttempt: {attempt + 1}")
+        # NOTE: Client errors will not be fixed by repeating the same request.
+        if 400 <= response.status_code < 500 and response.status_code != 429:
+            break
+
+    return None
+
+
+def fetch_test_runs_data_paginated(ip_address: str, project_name: str, limit: int, page_size: int = 100,
+                                   concurrency: int = 4, retries: int = 3, backoff: float = 0.5,
+                                   newer_than_buildid: int = 0) -> dict | None:
+    """Fetches up to 'limit' test runs as concurrently requested pages, returns them as single response data"""
+
+    url = f"http://{ip_address}/test_runs"
+    page_offsets = range(0, limit, page_size)
+    pages_params = [
+        {
+            "project": project_name,
+            "limit": min(page_size, limit - offset),
+            "offset": offset
+        }
+        for offset in page_offsets
+    ]
+    if newer_than_buildid:
+        for params in pages_params:
+            params[NEWER_THAN_BUILDID_PARAMETER] = newer_than_buildid
+
+    with create_session(concurrency) as session:
+        with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+            pages = list(executor.map(lambda params: fetch_test_runs_page(session, url, params, retries, backoff),
+                                      pages_params))
+
+    if any(page is None for page in pages):
+        failed_offsets = [params["offset"] for params, page in zip(pages_params, pages) if page is None]
+        logger.error(f"Failed to fetch pages with offsets {failed_offsets} from {url}")
+        return None
+
+    # NOTE: Pages are joined in offset order, so builds are in the same order as single request returns.
+    test_runs_data = dict(pages[0]) if pages else {}
+    test_runs_data["builds"] = join_pages_builds(pages)
+    return test_runs_data
+
+
+def join_pages_builds(pages: list[dict]) -> list[dict]:
+    """Joins builds of pages, dropping builds repeated on the next page.
+
+    Builds arriving while pages are fetched shift the feed, so the last builds of a page can be returned again.
+    """
+
+    builds = []
+    seen_buildids: set[BuildId] = set()
+    for page in pages:
+        for build in page.get("builds", []):
+            buildid = build.get("buildid")
+            if buildid is not None:
+                if buildid in seen_buildids:
+                    continue
+                seen_buildids.add(buildid)
+            builds.append(build)
+    return builds
+
+
+JSON_CHUNK_SIZE = 64 * 1024
+
+
+class JsonStreamReader:
+    """Decodes JSON values one by one from stream of text chunks, keeping only not decoded text in memory"""
+
+    def __init__(self, chunks: Iterable[str]):
+        self.chunks = iter(chunks)
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.position = 0
+        self.exhausted = False
+
+    def read_chunk(self) -> bool:
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.exhausted = True
+            return False
+
+        # NOTE: Decoded text is dropped only once in a while, slicing the buffer after every value is quadratic.
+        if self.position > JSON_CHUNK_SIZE:
+            self.buffer = self.buffer[self.position:]
+            self.position = 0
+        self.buffer += chunk
+        return True
+
+    def peek(self) -> str:
+        """Skips whitespaces, returns the next character, empty string at the end of stream"""
+
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in " \t\n\r":
+                self.position += 1
+            if self.position < len(self.buffer) or not self.read_chunk():
+                return self.buffer[self.position:self.position + 1]
+
+    def expect(self, characters: str) -> str:
+        character = self.peek()
+        if not character or character not in characters:
+            raise json.JSONDecodeError(f"Expecting one of {characters!r}", self.buffer, self.position)
+        self.position += 1
+        return character
+
+    def decode_value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if self.read_chunk():
+                    continue
+                raise
+
+            # NOTE: Number at the end of the buffer can continue in the next chunk.
+            if end == len(self.buffer) and self.read_chunk():
+                continue
+
+            self.position = end
+            return value
+
+
+def iter_json_array_items(chunks: Iterable[str], key: str) -> Iterator:
+    """Yields items of the array under top level 'key' of JSON object, one item at a time"""
+
+    reader = JsonStreamReader(chunks)
+    reader.expect("{")
+    if reader.peek() == "}":
+        logger.error(f"Key {key!r} does not exists in given data")
+        return
+
+    while True:
+        current_key = reader.decode_value()
+        reader.expect(":")
+
+        if current_key == key:
+            break
+
+        # NOTE: Values of other keys are small, they are decoded and dropped.
+        reader.decode_value()
+        if reader.expect(",}") == "}":
+            logger.error(f"Key {key!r} does not exists in given data")
+            return
+
+    reader.expect("[")
+    if reader.peek() == "]":
+        return
+
+    while True:
+        yield reader.decode_value()
+        if reader.expect(",]") == "]":
+            return
+
+
+def iter_builds_from_file(input_file: Path) -> Iterator[dict]:
+    """Streams builds from test runs JSON file, without loading the whole file"""
+
+    with open(input_file, "r", encoding="UTF-8") as file:
+        yield from iter_json_array_items(iter(lambda: file.read(JSON_CHUNK_SIZE), ""), "builds")
+
+
+def fetch_test_runs_builds_streamed(ip_address: str, project_name: str, limit: int,
+                                    newer_than_buildid: int = 0) -> Iterator[dict] | None:
+    """Fetches test runs data from a remote server, decoding builds while response body is being received"""
+
+    url = f"http://{ip_address}/test_runs"
+    params = {
+        "project": project_name,
+        "limit": limit
+    }
+    if newer_than_buildid:
+        params[NEWER_THAN_BUILDID_PARAMETER] = newer_than_buildid
+    headers = {
+        "accept": "application/json"
+    }
+    try:
+        response = requests.get(url, params=params, headers=headers, data=json.dumps(params), timeout=5, stream=True)
+    except Exception as e:
+        logger.error(f"The request timed out. Error message:\n{e}.")
+        return None
+
+    if response.status_code != 200:
+        logger.error(
+            f"Failed to fetch data. URL: {response.url}\nStatus: {response.status_code}\nReason: {response.reason}\n")
+        response.close()
+        return None
+
+    def iter_builds() -> Iterator[dict]:
+        with response:
+            chunks = codecs.iterdecode(response.iter_content(JSON_CHUNK_SIZE), response.encoding or "UTF-8")
+            yield from iter_json_array_items(chunks, "builds")
+
+    return iter_builds()
 
 
 def traverse_json(data: dict, keys: list) -> dict | None:
@@ -92,20 +507,46 @@ def traverse_json(data: dict, keys: list) -> dict | None:
     return current_data
 
 
-def get_latest_submission_time(test_case_info) -> datetime | None:
-    """From Run tests data extract the latest execution date of test case"""
+SUBMISSION_TIME_FORMAT = "%Y_%m_%d_%Hh_%Mm"
+# NOTE: Characters of SUBMISSION_TIME_FORMAT between the numbers, e.g. '2024_03_18_16h_26m'.
+SUBMISSION_TIME_SEPARATORS = "___h_m"
 
-    if test_case_info is None:
+
+@functools.lru_cache(maxsize=65536)
+def parse_submission_time(submission_time: str) -> datetime | None:
+    """Parses fixed width SUBMISSION_TIME_FORMAT without 'strptime', returns None for damaged submission time.
+
+    Dumps repeat the same submission times a lot, so parsed values are memoized.
+    """
+
+    if not isinstance(submission_time, str) or len(submission_time) != 18:
+        logger.info(f"Invalid submission time format: {submission_time!r}")
+        return None
+
+    separators = (submission_time[4] + submission_time[7] + submission_time[10] + submission_time[13:15]
+                  + submission_time[17])
+    digits = (submission_time[0:4] + submission_time[5:7] + submission_time[8:10] + submission_time[11:13]
+              + submission_time[15:17])
+    if separators != SUBMISSION_TIME_SEPARATORS or not (digits.isascii() and digits.isdigit()):
+        logger.info(f"Invalid submission time format: {submission_time!r}")
         return None
 
-    latest_submission = max(test_case_info, key=lambda x: x["submission_time"])
     try:
-        latest_submission = datetime.strptime(latest_submission["submission_time"], "%Y_%m_%d_%Hh_%Mm")
+        return datetime(int(digits[0:4]), int(digits[4:6]), int(digits[6:8]), int(digits[8:10]), int(digits[10:12]))
     except ValueError:
-        logger.info(f"Invalid submission time format: {latest_submission}")
+        logger.info(f"Invalid submission time: {submission_time!r}")
+        return None
+
+
+def get_latest_submission_time(test_case_info) -> datetime | None:
+    """From Run tests data extract the latest execution date of test case, runs with damaged date are skipped"""
+
+    if test_case_info is None:
         return None
 
-    return latest_submission
+    submission_times = (parse_submission_time(test_run.submission_time) for test_run in test_case_info)
+    return max((submission_time for submission_time in submission_times if submission_time is not None),
+               default=None)
 
 
 def count_amount_of_executions(test_case_info) -> tuple[int, int]:
@@ -119,10 +560,10 @@ def count_amount_of_executions(test_case_info) -> tuple[int, int]:
 
     for test_run in test_case_info:
 
-        if test_run["results"] == 0:
+        if test_run.results == 0:
             passed += 1
 
-        elif test_run["results"] == 2:
+        elif test_run.results == 2:
             failed += 1
 
     return failed, passed
@@ -137,7 +578,7 @@ def collect_revisions(test_case_info) -> list[str]:
         return []
 
     for single_run in test_case_info:
-        revisions.add(single_run["revision"])
+        revisions.add(single_run.revision)
 
     return list(revisions)
 
@@ -156,15 +597,35 @@ TestRunProperty = str | int | float
 TestCaseData = dict[str, TestRunProperty]
 
 
-def process_the_run_tests_data(run_tests_data: dict) -> dict[TestCaseName, [TestCaseData]]:
+def intern_string(value: TestRunProperty) -> TestRunProperty:
+    """Interns strings, so the same revision or submission time is stored once for all runs"""
+
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class TestRun(NamedTuple):
+    """Single run of test case, tuple instead of dict, repeated strings are interned and shared between runs"""
+
+    submission_time: str
+    results: TestRunProperty
+    revision: str
+
+
+def process_the_run_tests_data(run_tests_data: dict) -> dict[TestCaseName, list[TestRun]]:
     """Process the test run data and saves the information in easily accessible format"""
-    extracted_info = defaultdict(list)
 
     if "builds" not in run_tests_data:
         logger.error("Key 'builds' does not exists in given data")
         return {}
 
-    for build in run_tests_data['builds']:
+    return process_builds(run_tests_data['builds'])
+
+
+def process_builds(builds: Iterable[dict]) -> dict[TestCaseName, list[TestRun]]:
+    """Same as 'process_the_run_tests_data', but builds are consumed one by one, so they can be streamed"""
+    extracted_info = defaultdict(list)
+
+    for build in builds:
         tests_info = traverse_json(build, keys=["properties", "test_scenario", "tests"])
 
         if tests_info is None:
@@ -178,37 +639,357 @@ def process_the_run_tests_data(run_tests_data: dict) -> dict[TestCaseName, [Test
             revision = properties.get('revision', "")
 
             extracted_info[test_file].append(
-                {
-                    "submission_time": submission_time,
-                    "results": results,
-                    "revision": revision
-                }
+                TestRun(
+                    submission_time=intern_string(submission_time),
+                    results=results,
+                    revision=intern_string(revision)
+                )
             )
 
     return extracted_info
 
 
-def write_test_cases_data(test_automation_directory: Path, test_runs_data: dict) -> dict[TestCaseName, TestCaseData]:
-    all_test_cases_data: dict[TestCaseName, TestCaseData] = {}
-    test_cases = collect_test_cases_from_directory(test_automation_directory)
+@dataclass
+class ReportWindows:
+    """Rolling windows, in which pass ratios are calculated in addition to the lifetime one"""
+
+    last_runs: int = 0
+    last_days: int = 0
+    reference_time: datetime = field(default_factory=datetime.now)
+
+    @property
+    def since(self) -> datetime | None:
+        if not self.last_days:
+            return None
+        return self.reference_time - timedelta(days=self.last_days)
+
+
+def classify_results(results: TestRunProperty) -> int:
+    """1 - passed run, -1 - failed run, 0 - run with any other result"""
+
+    if results == 0:
+        return 1
+    if results == 2:
+        return -1
+    return 0
+
+
+@dataclass
+class TestCaseAccumulator:
+    """Statistics of single test case, updated once per run, so runs themselves are not kept"""
+
+    passed: int = 0
+    failed: int = 0
+    latest_submission_time: datetime | None = None
+    revision_results: dict[str, dict[str, int]] = field(default_factory=dict)
+    # NOTE: Min-heap of (submission time, classified results), it keeps only 'last_runs' latest runs.
+    latest_runs: list[tuple[datetime, int]] = field(default_factory=list, compare=False)
+    passed_in_days: int = 0
+    failed_in_days: int = 0
+
+    @property
+    def revisions(self) -> set[str]:
+        return set(self.revision_results)
+
+    def add(self, results: TestRunProperty, submission_time: str, revision: str,
+            windows: ReportWindows | None = None):
+        revision_results = self.revision_results.setdefault(revision, {"passed": 0, "failed": 0})
+        classified_results = classify_results(results)
+        if classified_results == 1:
+            self.passed += 1
+            revision_results["passed"] += 1
+        elif classified_results == -1:
+            self.failed += 1
+            revision_results["failed"] += 1
+
+        # NOTE: Run with damaged submission time is counted, but it is left out of time based statistics.
+        parsed_submission_time = parse_submission_time(submission_time)
+        if parsed_submission_time is None:
+            return
+
+        if self.latest_submission_time is None or parsed_submission_time > self.latest_submission_time:
+            self.latest_submission_time = parsed_submission_time
+
+        if windows is None:
+            return
+
+        if windows.last_runs:
+            run = (parsed_submission_time, classified_results)
+            if len(self.latest_runs) < windows.last_runs:
+                heapq.heappush(self.latest_runs, run)
+            elif run > self.latest_runs[0]:
+                heapq.heapreplace(self.latest_runs, run)
+
+        since = windows.since
+        if since is not None and parsed_submission_time >= since:
+            self.passed_in_days += classified_results == 1
+            self.failed_in_days += classified_results == -1
+
+    def get_latest_submission_time(self) -> datetime | None:
+        return self.latest_submission_time
+
+    def get_latest_runs_pass_ratio(self) -> float:
+        passed = sum(1 for _, classified_results in self.latest_runs if classified_results == 1)
+        failed = sum(1 for _, classified_results in self.latest_runs if classified_results == -1)
+        return calculate_pass_ratio(passed, failed)
+
+    def get_days_pass_ratio(self) -> float:
+        return calculate_pass_ratio(self.passed_in_days, self.failed_in_days)
+
+
+def aggregate_builds(builds: Iterable[dict],
+                     windows: ReportWindows | None = None) -> dict[TestCaseName, TestCaseAccumulator]:
+    """Updates statistics of every test case in the build, while builds are consumed one by one"""
+
+    accumulators: dict[TestCaseName, TestCaseAccumulator] = defaultdict(TestCaseAccumulator)
+
+    for build in builds:
+        tests_info = traverse_json(build, keys=["properties", "test_scenario", "tests"])
+
+        if tests_info is None:
+            return {}
+
+        results = build.get('results', "")
+        revision = intern_string(build.get('properties', {}).get('revision', ""))
+        for test in tests_info:
+            accumulators[test.get('test_file', "")].add(results, test.get('submission_time', ""), revision, windows)
+
+    return accumulators
+
+
+class ColumnarTestRuns:
+    """Runs of test cases as parallel arrays of ids, statistics are computed with vectorized NumPy group-by"""
+
+    # NOTE: Missing or not integer result of the build, such runs are neither passed nor failed.
+    UNKNOWN_RESULTS = -1
+
+    def __init__(self):
+        self.test_files: dict[TestCaseName, int] = {}
+        self.submission_times: dict[str, int] = {}
+        self.revisions: dict[str, int] = {}
+        self.test_file_ids = array("i")
+        self.results = array("i")
+        self.submission_time_ids = array("i")
+        self.revision_ids = array("i")
+
+    def add_build(self, build: dict) -> bool:
+        tests_info = traverse_json(build, keys=["properties", "test_scenario", "tests"])
+
+        if tests_info is None:
+            return False
+
+        results = build.get('results', "")
+        if not isinstance(results, int):
+            results = self.UNKNOWN_RESULTS
+        revision_id = self.revisions.setdefault(build.get('properties', {}).get('revision', ""), len(self.revisions))
+
+        for test in tests_info:
+            self.test_file_ids.append(self.test_files.setdefault(test.get('test_file', ""), len(self.test_files)))
+            self.results.append(results)
+            submission_time = test.get('submission_time', "")
+            self.submission_time_ids.append(self.submission_times.setdefault(submission_time,
+                                                                             len(self.submission_times)))
+            self.revision_ids.append(revision_id)
+
+        return True
+
+    def to_accumulators(self, windows: ReportWindows | None = None) -> dict[TestCaseName, TestCaseAccumulator]:
+        """Computes the same statistics as 'aggregate_builds', grouping all runs by test file at once"""
+
+        amount_of_test_files = len(self.test_files)
+        if not amount_of_test_files:
+            return {}
+
+        test_file_ids = np.frombuffer(self.test_file_ids, dtype=np.intc)
+        results = np.frombuffer(self.results, dtype=np.intc)
+        submission_time_ids = np.frombuffer(self.submission_time_ids, dtype=np.intc)
+        revision_ids = np.frombuffer(self.revision_ids, dtype=np.intc).astype(np.int64)
+        passed_runs = results == 0
+        failed_runs = results == 2
+
+        passed = np.bincount(test_file_ids[passed_runs], minlength=amount_of_test_files)
+        failed = np.bincount(test_file_ids[failed_runs], minlength=amount_of_test_files)
+
+        # NOTE: Every distinct submission time is parsed once and ranked, damaged ones get rank -1.
+        #  The latest submission time is the maximal rank in a group.
+        parsed_submission_times = [parse_submission_time(time_) for time_ in self.submission_times]
+        valid_submission_time_ids = [time_id for time_id, parsed in enumerate(parsed_submission_times)
+                                     if parsed is not None]
+        valid_submission_time_ids.sort(key=parsed_submission_times.__getitem__)
+        sorted_submission_times = [parsed_submission_times[time_id] for time_id in valid_submission_time_ids]
+        submission_time_ranks = np.full(len(parsed_submission_times), -1, dtype=np.intc)
+        submission_time_ranks[valid_submission_time_ids] = np.arange(len(valid_submission_time_ids), dtype=np.intc)
+        run_ranks = submission_time_ranks[submission_time_ids]
+        latest_ranks = np.full(amount_of_test_files, -1, dtype=np.intc)
+        np.maximum.at(latest_ranks, test_file_ids, run_ranks)
+
+        amount_of_revisions = len(self.revisions)
+        test_file_revisions, test_file_revision_ids = np.unique(
+            test_file_ids.astype(np.int64) * amount_of_revisions + revision_ids, return_inverse=True)
+        revision_passed = np.bincount(test_file_revision_ids[passed_runs], minlength=len(test_file_revisions))
+        revision_failed = np.bincount(test_file_revision_ids[failed_runs], minlength=len(test_file_revisions))
+        revision_names = list(self.revisions)
+        revision_results = [{} for _ in range(amount_of_test_files)]
+        for test_file_id, revision_id, revision_passed_, revision_failed_ in zip(
+                (test_file_revisions // amount_of_revisions).tolist(),
+                (test_file_revisions % amount_of_revisions).tolist(),
+                revision_passed.tolist(), revision_failed.tolist()):
+            revision_results[test_file_id][revision_names[revision_id]] = {"passed": revision_passed_,
+                                                                           "failed": revision_failed_}
+
+        accumulators = {
+            test_file: TestCaseAccumulator(
+                passed=int(passed[test_file_id]), failed=int(failed[test_file_id]),
+                latest_submission_time=(sorted_submission_times[latest_ranks[test_file_id]]
+                                        if latest_ranks[test_file_id] >= 0 else None),
+                revision_results=revision_results[test_file_id]
+            )
+            for test_file, test_file_id in self.test_files.items()
+        }
+        if windows is not None:
+            self.add_windows(accumulators, windows, test_file_ids, results, run_ranks, sorted_submission_times)
+
+        return accumulators
+
+    def add_windows(self, accumulators: dict[TestCaseName, TestCaseAccumulator], windows: ReportWindows,
+                    test_file_ids, results, run_ranks, sorted_submission_times: list[datetime]):
+        classified_results = np.select([results == 0, results == 2], [1, -1], 0)
+        test_file_names = list(self.test_files)
+        valid_runs = run_ranks >= 0
+
+        if windows.last_runs:
+            # NOTE: Runs sorted by the same key as heap of 'TestCaseAccumulator', the last ones in a group are kept.
+            valid_run_ids = np.flatnonzero(valid_runs)
+            order = valid_run_ids[np.lexsort((classified_results[valid_run_ids], run_ranks[valid_run_ids],
+                                              test_file_ids[valid_run_ids]))]
+            sorted_test_file_ids = test_file_ids[order]
+            group_ends = np.searchsorted(sorted_test_file_ids, np.arange(len(test_file_names)), side="right")
+            latest = order[group_ends[sorted_test_file_ids] - np.arange(len(order)) <= windows.last_runs]
+            for test_file_id, run_rank, classified_results_ in zip(
+                    test_file_ids[latest].tolist(), run_ranks[latest].tolist(), classified_results[latest].tolist()):
+                accumulators[test_file_names[test_file_id]].latest_runs.append(
+                    (sorted_submission_times[run_rank], classified_results_))
+
+        since = windows.since
+        if since is not None:
+            # NOTE: Ranks are in order of submission times, runs since the first rank in the window are in it.
+            first_rank = bisect.bisect_left(sorted_submission_times, since)
+            runs_in_days = valid_runs & (run_ranks >= first_rank)
+            passed_in_days = np.bincount(test_file_ids[runs_in_days & (classified_results == 1)],
+                                         minlength=len(test_file_names))
+            failed_in_days = np.bincount(test_file_ids[runs_in_days & (classified_results == -1)],
+                                         minlength=len(test_file_names))
+            for test_file_id, test_file in enumerate(test_file_names):
+                accumulators[test_file].passed_in_days = int(passed_in_days[test_file_id])
+                accumulators[test_file].failed_in_days = int(failed_in_days[test_file_id])
+
+
+def aggregate_builds_columnar(builds: Iterable[dict],
+                              windows: ReportWindows | None = None) -> dict[TestCaseName, TestCaseAccumulator]:
+    """Collects runs into 'ColumnarTestRuns' and aggregates them vectorized, result is the same as 'aggregate_builds'"""
+
+    columnar_test_runs = ColumnarTestRuns()
+    for build in builds:
+        if not columnar_test_runs.add_build(build):
+            return {}
+
+    return columnar_test_runs.to_accumulators(windows)
+
+
+BACKENDS = ["python", "numpy"]
+
+
+def detect_flaky_tests(extracted_info: dict[TestCaseName, list[TestRun]]) -> list[dict]:
+    """Ranks test cases, which flip between passed and failed on the same revision, by flakiness score.
+
+    Runs of every test case are ordered by submission time and indexed by (test file, revision) in one pass,
+    every run is compared only with the previous run on the same revision. Flakiness score is the share of
+    flips among all consecutive pairs of runs on the same revision.
+    """
+
+    flaky_tests = []
+    for test_file, test_runs in extracted_info.items():
+        revisions: dict[str, dict] = {}
+        ordered_test_runs = sorted(test_runs, key=lambda test_run: parse_submission_time(
+            test_run.submission_time) or datetime.min)
+
+        for test_run in ordered_test_runs:
+            classified_results = classify_results(test_run.results)
+            if not classified_results:
+                continue
+
+            revision = revisions.setdefault(test_run.revision,
+                                            {"runs": 0, "flips": 0, "previous_results": 0})
+            revision["runs"] += 1
+            if revision["previous_results"] and revision["previous_results"] != classified_results:
+                revision["flips"] += 1
+            revision["previous_results"] = classified_results
+
+        flips = sum(revision["flips"] for revision in revisions.values())
+        if not flips:
+            continue
+
+        transitions = sum(revision["runs"] - 1 for revision in revisions.values())
+        flaky_tests.append({
+            "test_file": test_file,
+            "flakiness_score": flips / transitions,
+            "flips": flips,
+            "runs": sum(revision["runs"] for revision in revisions.values()),
+            "flaky_revisions": {revision_name: revision["flips"] for revision_name, revision in revisions.items()
+                                if revision["flips"]},
+        })
+
+    return sorted(flaky_tests, key=lambda flaky_test: (-flaky_test["flakiness_score"], -flaky_test["flips"],
+                                                        flaky_test["test_file"]))
+
+
+def write_test_cases_data(test_automation_directory: Path, test_runs_data: dict | Iterable[dict],
+                          backend: str = "python",
+                          windows: ReportWindows | None = None,
+                          test_cases: list[Path] | None = None) -> dict[TestCaseName, TestCaseData]:
+    """Collects test cases statistics from test runs data or from stream of its builds"""
+
+    if test_cases is None:
+        test_cases = collect_test_cases_from_directory(test_automation_directory)
 
     if not test_cases:
         logger.info(f"No testcases were found in {test_automation_directory}")
         return {}
 
-    extracted_data = process_the_run_tests_data(test_runs_data)
+    if isinstance(test_runs_data, dict):
+        if "builds" not in test_runs_data:
+            logger.error("Key 'builds' does not exists in given data")
+            return {}
+        test_runs_data = test_runs_data["builds"]
+
+    if backend == "numpy" and np is None:
+        logger.warning("NumPy is not installed, falling back to 'python' backend")
+        backend = "python"
 
-    if not extracted_data:
+    if backend == "numpy":
+        accumulators = aggregate_builds_columnar(test_runs_data, windows)
+    else:
+        accumulators = aggregate_builds(test_runs_data, windows)
+
+    if not accumulators:
         logger.info(f"Tests run data is empty")
         return {}
 
+    return create_test_cases_data(test_cases, accumulators, windows)
+
+
+def create_test_cases_data(test_cases: list[Path], accumulators: dict[TestCaseName, TestCaseAccumulator],
+                           windows: ReportWindows | None = None) -> dict[TestCaseName, TestCaseData]:
+    """Converts statistics of every test case into JSON readable test case data"""
+
+    all_test_cases_data: dict[TestCaseName, TestCaseData] = {}
     for test_case in test_cases:
         test_case_file_name = test_case.name
 
-        test_case_info = extracted_data.get(test_case_file_name)
-        failed, passed = count_amount_of_executions(test_case_info)
+        accumulator = accumulators.get(test_case_file_name, TestCaseAccumulator())
+        failed, passed = accumulator.failed, accumulator.passed
 
-        latest_submission_time = get_latest_submission_time(test_case_info)
+        latest_submission_time = accumulator.get_latest_submission_time()
         pass_ratio = calculate_pass_ratio(passed, failed)
 
         # NOTE: Converting data into JSON readable format
@@ -219,15 +1000,274 @@ def write_test_cases_data(test_automation_directory: Path, test_runs_data: dict)
         test_case_data = {
             "latest_submission_date": converted_submission_time,
             "amount_of_executions": passed + failed,
-            "revisions": collect_revisions(test_case_info),
-            "pass_ratio": converted_pass_ratio
+            "revisions": list(accumulator.revisions),
+            "pass_ratio": converted_pass_ratio,
+            "revision_results": accumulator.revision_results
         }
 
+        if windows is not None and windows.last_runs:
+            latest_runs_converter = DataConverter(submission_time=None, ratio=accumulator.get_latest_runs_pass_ratio())
+            test_case_data[f"pass_ratio_last_{windows.last_runs}_runs"] = latest_runs_converter.convert_pass_ratio()
+        if windows is not None and windows.last_days:
+            days_converter = DataConverter(submission_time=None, ratio=accumulator.get_days_pass_ratio())
+            test_case_data[f"pass_ratio_last_{windows.last_days}_days"] = days_converter.convert_pass_ratio()
+
         all_test_cases_data[test_case_file_name] = test_case_data
 
     return all_test_cases_data
 
 
+BuildId = int
+# NOTE: Cache line with this key stores builds, which were not complete yet, instead of build record.
+CACHE_INCOMPLETE_KEY = "incomplete_buildids"
+
+
+def load_builds_cache(cache_file: Path) -> tuple[dict[BuildId, dict], list[BuildId]]:
+    """Reads JSONL builds cache, returns cached builds by 'buildid' and builds not complete at the last run"""
+
+    cached_builds: dict[BuildId, dict] = {}
+    incomplete_buildids: list[BuildId] = []
+
+    if not cache_file.is_file():
+        return {}, []
+
+    with open(cache_file, "r", encoding="UTF-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # NOTE: Interrupted run can leave partially written last line, it is skipped.
+                logger.warning(f"Skipping damaged line {line_number} in {cache_file}")
+                continue
+
+            if CACHE_INCOMPLETE_KEY in record:
+                incomplete_buildids = record[CACHE_INCOMPLETE_KEY]
+                continue
+
+            cached_builds[record["buildid"]] = record
+
+    return cached_builds, incomplete_buildids
+
+
+def get_newest_cached_buildid(cached_builds: dict[BuildId, dict], incomplete_buildids: list[BuildId]) -> BuildId:
+    """Returns 'buildid', after which builds have to be requested again"""
+
+    if not cached_builds:
+        return 0
+
+    # NOTE: Builds with lower 'buildid' can complete later, they are requested again until complete.
+    not_cached_incomplete_buildids = [buildid for buildid in incomplete_buildids if buildid not in cached_builds]
+    if not_cached_incomplete_buildids:
+        return min(not_cached_incomplete_buildids) - 1
+
+    return max(cached_builds)
+
+
+def update_builds_cache(cache_file: Path, new_builds: list[dict],
+                        cached_builds: dict[BuildId, dict] | set[BuildId]) -> int:
+    """Appends new complete builds to JSONL builds cache, returns amount of appended builds"""
+
+    amount_of_new_builds = 0
+    incomplete_buildids = []
+    with open(cache_file, "a", encoding="UTF-8") as file:
+        for build in new_builds:
+            buildid = build.get("buildid")
+            if buildid is None or buildid in cached_builds:
+                continue
+
+            if not build.get("complete", False):
+                incomplete_buildids.append(buildid)
+                continue
+
+            file.write(json.dumps(build, ensure_ascii=False) + "\n")
+            amount_of_new_builds += 1
+
+        file.write(json.dumps({CACHE_INCOMPLETE_KEY: incomplete_buildids}) + "\n")
+
+    return amount_of_new_builds
+
+
+def merge_builds(cached_builds: dict[BuildId, dict], new_builds: list[dict], newer_than_buildid: BuildId) -> dict:
+    """Merges cached and new builds into test runs data, newest builds first"""
+
+    merged_builds = dict(cached_builds)
+    for build in new_builds:
+        buildid = build.get("buildid")
+        # NOTE: Server may ignore the filter, older builds are already in the cache.
+        if buildid is None or (buildid <= newer_than_buildid and buildid in cached_builds):
+            continue
+        merged_builds[buildid] = build
+
+    return {"builds": [merged_builds[buildid] for buildid in sorted(merged_builds, reverse=True)]}
+
+
+def cache_builds(builds: Iterable[dict], cache_file: Path, cached_builds: dict[BuildId, dict]) -> Iterator[dict]:
+    """Passes streamed builds through, appending new complete builds to JSONL builds cache"""
+
+    amount_of_new_builds = 0
+    incomplete_buildids = []
+    with open(cache_file, "a", encoding="UTF-8") as file:
+        for build in builds:
+            buildid = build.get("buildid")
+            if buildid is not None and buildid not in cached_builds:
+                if build.get("complete", False):
+                    file.write(json.dumps(build, ensure_ascii=False) + "\n")
+                    amount_of_new_builds += 1
+                else:
+                    incomplete_buildids.append(buildid)
+            yield build
+
+        # NOTE: Marker is written only when stream was fully read, so interrupted run keeps the previous one.
+        file.write(json.dumps({CACHE_INCOMPLETE_KEY: incomplete_buildids}) + "\n")
+
+    logger.info(f"{amount_of_new_builds} new builds were added to {cache_file}")
+
+
+def iter_merged_builds(cached_builds: dict[BuildId, dict], new_builds: Iterable[dict],
+                       newer_than_buildid: BuildId) -> Iterator[dict]:
+    """Same builds as 'merge_builds' returns, but new builds are streamed first and cached builds after them"""
+
+    merged_buildids = set()
+    for build in new_builds:
+        buildid = build.get("buildid")
+        if buildid is None or (buildid <= newer_than_buildid and buildid in cached_builds):
+            continue
+        if buildid in merged_buildids:
+            continue
+        merged_buildids.add(buildid)
+        yield build
+
+    for buildid, build in cached_builds.items():
+        if buildid not in merged_buildids:
+            yield build
+
+
+class TestCasesState:
+    """Statistics of test cases kept in memory by daemon, new builds are added as they are polled.
+
+    Only complete builds are added, so a running build is not counted twice.
+    """
+
+    def __init__(self, windows: ReportWindows | None = None):
+        self.windows = windows
+        self.accumulators: dict[TestCaseName, TestCaseAccumulator] = defaultdict(TestCaseAccumulator)
+        self.added_buildids: set[BuildId] = set()
+        self.incomplete_buildids: set[BuildId] = set()
+        # NOTE: Output is serialized once per poll, requests only send ready bytes.
+        self.output = b"{}"
+        self.render_pending = True
+
+    def get_newer_than_buildid(self) -> BuildId:
+        """Returns 'buildid', after which builds have to be polled"""
+
+        not_added_incomplete_buildids = self.incomplete_buildids - self.added_buildids
+        if not_added_incomplete_buildids:
+            return min(not_added_incomplete_buildids) - 1
+        return max(self.added_buildids, default=0)
+
+    def add_builds(self, builds: Iterable[dict]) -> int:
+        """Adds not yet added complete builds, returns amount of added builds"""
+
+        amount_of_added_builds = 0
+        for build in builds:
+            buildid = build.get("buildid")
+            if buildid is None or buildid in self.added_buildids:
+                continue
+
+            if not build.get("complete", False):
+                self.incomplete_buildids.add(buildid)
+                continue
+
+            tests_info = traverse_json(build, keys=["properties", "test_scenario", "tests"])
+            if tests_info is None:
+                logger.warning(f"Build {buildid} doesn't have tests, it is skipped")
+                continue
+
+            results = build.get('results', "")
+            revision = intern_string(build.get('properties', {}).get('revision', ""))
+            for test in tests_info:
+                self.accumulators[test.get('test_file', "")].add(results, test.get('submission_time', ""), revision,
+                                                                 self.windows)
+
+            self.added_buildids.add(buildid)
+            self.incomplete_buildids.discard(buildid)
+            amount_of_added_builds += 1
+
+        if amount_of_added_builds:
+            self.render_pending = True
+        return amount_of_added_builds
+
+    def render(self, test_cases: list[Path]):
+        test_cases_data = create_test_cases_data(test_cases, self.accumulators, self.windows)
+        self.output = json.dumps(test_cases_data, indent=4, ensure_ascii=False).encode("UTF-8")
+        self.render_pending = False
+
+
+TEST_CASES_INFO_PATH = "/test_cases_info"
+
+
+class TestCasesInfoServer(ThreadingHTTPServer):
+    """Local HTTP endpoint serving the latest test cases info of the daemon"""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], state: TestCasesState):
+        super().__init__(address, TestCasesInfoHandler)
+        self.state = state
+
+
+class TestCasesInfoHandler(BaseHTTPRequestHandler):
+    server: TestCasesInfoServer
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != TEST_CASES_INFO_PATH:
+            self.send_error(404)
+            return
+
+        body = self.server.state.output
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format_: str, *args_):
+        logger.debug(f"{self.address_string()} - {format_ % args_}")
+
+
+def poll_test_runs(state: TestCasesState, fetch_builds: Callable[[BuildId], list[dict] | None],
+                   collect: Callable[[], list[Path]], cache_file: Path | None = None) -> int | None:
+    """Fetches builds newer than the ones in the state, adds them and renders output again.
+
+    Returns amount of added builds, None if the poll failed. Output of the last successful render is kept then,
+    and render is repeated by the next poll.
+    """
+
+    # NOTE: Daemon keeps serving the last state, a single failed poll must not stop it.
+    try:
+        builds = fetch_builds(state.get_newer_than_buildid())
+        if builds is None:
+            return None
+
+        if cache_file:
+            try:
+                update_builds_cache(cache_file, builds, state.added_buildids)
+            except OSError as e:
+                logger.error(f"Error occurred trying write {cache_file}: \n{e}")
+
+        amount_of_added_builds = state.add_builds(builds)
+        if state.render_pending:
+            state.render(collect())
+    except Exception as e:
+        logger.error(f"Poll of test runs failed, the last test cases info is served: \n{e}")
+        return None
+
+    return amount_of_added_builds
+
+
 def create_json_file(data, json_file_name):
     with open(json_file_name, "w", encoding="UTF-8") as file:
         json.dump(data, file, indent=4, ensure_ascii=False)
@@ -247,7 +1287,54 @@ def parse_args() -> argparse.Namespace:
                         help="Specify the project name to get data for")
     parser.add_argument("-l", "--limit", type=int, default=1000,
                         help="Specify the integer value by which to limit the query size")
-    return parser.parse_args()
+    parser.add_argument("-i", "--input_file", type=Path, default="data_input.json",
+                        help="Specify the json file with test runs data, used when data is not fetched")
+    parser.add_argument("-f", "--fetch", action="store_true",
+                        help="Fetch test runs data from the server, instead of reading the input file")
+    parser.add_argument("-ps", "--page_size", type=int, default=0,
+                        help="Fetch test runs in pages of given size concurrently, 0 - single request")
+    parser.add_argument("-c", "--concurrency", type=int, default=4,
+                        help="Specify the number of pages fetched at the same time")
+    parser.add_argument("-r", "--retries", type=int, default=3,
+                        help="Specify how many times failed page request is repeated")
+    parser.add_argument("-cf", "--cache_file", type=Path,
+                        help="Specify the JSONL file, where complete builds are cached between runs")
+    parser.add_argument("-b", "--backend", choices=BACKENDS, default="python",
+                        help="'python' - aggregate runs one by one, 'numpy' - collect runs into arrays "
+                             "and aggregate them vectorized")
+    parser.add_argument("-wr", "--window_runs", type=int, default=0,
+                        help="Also calculate pass ratio of the given number of the latest runs, 0 - disabled")
+    parser.add_argument("-wd", "--window_days", type=int, default=0,
+                        help="Also calculate pass ratio of runs in the given number of the latest days, 0 - disabled")
+    parser.add_argument("-ts", "--test_cases_source", choices=TEST_CASES_SOURCES, default="rglob",
+                        help="'rglob' - walk the whole test cases directory, 'index' - list only directories "
+                             "changed since the previous run, 'git' - take files tracked by git")
+    parser.add_argument("-ix", "--index_file", type=Path, default="test_cases_index.json",
+                        help="Specify the file, where test cases directory index is kept between runs")
+    parser.add_argument("-dj", "--discovery_jobs", type=int, default=8,
+                        help="Specify the number of directories checked at the same time")
+    parser.add_argument("-fr", "--flaky_report", type=Path,
+                        help="Specify the json file, where test cases flipping results on the same revision "
+                             "are ranked by flakiness")
+    parser.add_argument("-dm", "--daemon", action="store_true",
+                        help="Keep running, poll the server for new builds and serve test cases info over HTTP")
+    parser.add_argument("-pi", "--poll_interval", type=float, default=60,
+                        help="Specify the number of seconds between polls in daemon mode")
+    parser.add_argument("-hh", "--http_host", type=str, default="127.0.0.1",
+                        help="Specify the address, on which daemon serves test cases info")
+    parser.add_argument("-hp", "--http_port", type=int, default=8080,
+                        help="Specify the port, on which daemon serves test cases info")
+    parser.add_argument("-s", "--stream", action="store_true",
+                        help="Decode builds one by one while reading the input file or the response, "
+                             "instead of loading whole test runs data")
+    arguments = parser.parse_args()
+
+    if arguments.flaky_report and (arguments.daemon or arguments.stream):
+        parser.error("--flaky_report needs the whole runs history, it can't be used with --daemon or --stream")
+    if arguments.daemon and arguments.window_days:
+        parser.error("--window_days can't be used with --daemon, runs leaving the window are not subtracted")
+
+    return arguments
 
 
 def configure_logger(filename: str) -> logging.Logger:
@@ -265,36 +1352,151 @@ def configure_logger(filename: str) -> logging.Logger:
     return logger
 
 
+def write_test_cases_file(logger_: logging.Logger, test_runs_data: dict | Iterable[dict]):
+    windows = None
+    if args.window_runs or args.window_days:
+        windows = ReportWindows(last_runs=args.window_runs, last_days=args.window_days)
+
+    test_cases = collect_test_cases(args.test_automation_directory, args.test_cases_source, args.index_file,
+                                    args.discovery_jobs)
+    test_cases_data = write_test_cases_data(args.test_automation_directory, test_runs_data, args.backend, windows,
+                                            test_cases)
+
+    if not test_cases_data:
+        sys.exit(1)
+
+    try:
+        create_json_file(test_cases_data, args.json_file)
+    except Exception as e:
+        logger_.error(f"Error occurred trying write {args.json_file}: \n{e}")
+        sys.exit(1)
+
+    logger_.info(f" >>> Was generated {args.json_file} file in {os.getcwd()} directory")
+
+
+def stream_test_runs_data(logger_: logging.Logger, cached_builds: dict[BuildId, dict], newer_than_buildid: BuildId):
+    """Aggregates builds while they are decoded from the input file or the response, one build at a time"""
+
+    if args.fetch:
+        builds = fetch_test_runs_builds_streamed(ip_address=args.ip_address, project_name=args.project_name,
+                                                 limit=args.limit, newer_than_buildid=newer_than_buildid)
+        if builds is None:
+            sys.exit(1)
+    else:
+        builds = iter_builds_from_file(args.input_file)
+
+    if args.cache_file:
+        builds = iter_merged_builds(cached_builds, cache_builds(builds, args.cache_file, cached_builds),
+                                    newer_than_buildid)
+
+    try:
+        write_test_cases_file(logger_, builds)
+    except (OSError, ValueError, requests.RequestException) as e:
+        logger_.error(f"Error occurred trying to read test runs data: \n{e}")
+        sys.exit(1)
+
+
+def run_daemon(logger_: logging.Logger):
+    """Serves test cases info, which is updated with builds polled every 'poll_interval' seconds"""
+
+    windows = ReportWindows(last_runs=args.window_runs) if args.window_runs else None
+    state = TestCasesState(windows)
+
+    if args.cache_file:
+        cached_builds, incomplete_buildids = load_builds_cache(args.cache_file)
+        state.add_builds(cached_builds.values())
+        state.incomplete_buildids.update(incomplete_buildids)
+        logger_.info(f"{len(cached_builds)} cached builds were loaded from {args.cache_file}")
+
+    def fetch_builds(newer_than_buildid: BuildId) -> list[dict] | None:
+        if args.page_size > 0:
+            test_runs_data = fetch_test_runs_data_paginated(ip_address=args.ip_address,
+                                                            project_name=args.project_name, limit=args.limit,
+                                                            page_size=args.page_size, concurrency=args.concurrency,
+                                                            retries=args.retries,
+                                                            newer_than_buildid=newer_than_buildid)
+        else:
+            test_runs_data = fetch_test_runs_data(ip_address=args.ip_address, project_name=args.project_name,
+                                                  limit=args.limit, newer_than_buildid=newer_than_buildid)
+        return None if test_runs_data is None else test_runs_data.get("builds", [])
+
+    def collect() -> list[Path]:
+        return collect_test_cases(args.test_automation_directory, args.test_cases_source, args.index_file,
+                                  args.discovery_jobs)
+
+    server = TestCasesInfoServer((args.http_host, args.http_port), state)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger_.info(f" >>> Serving http://{args.http_host}:{server.server_address[1]}{TEST_CASES_INFO_PATH}")
+
+    try:
+        while True:
+            amount_of_added_builds = poll_test_runs(state, fetch_builds, collect, args.cache_file)
+            if amount_of_added_builds is not None:
+                logger_.info(f"{amount_of_added_builds} new builds were added, "
+                             f"{len(state.added_buildids)} builds in total")
+            time.sleep(args.poll_interval)
+    except KeyboardInterrupt:
+        logger_.info(" >>> Stopping the daemon")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
 def main(logger_: logging.Logger):
     logger_.info(" >>> Running the script\n")
 
-    # TODO: this for using requests
-    # test_runs_data = fetch_test_runs_data(ip_address=args.ip_address, project_name=args.project_name,
-    #                                       limit=args.limit)
+    if args.daemon:
+        run_daemon(logger_)
+        return
+
+    cached_builds: dict[BuildId, dict] = {}
+    newer_than_buildid = 0
+    if args.cache_file:
+        cached_builds, incomplete_buildids = load_builds_cache(args.cache_file)
+        newer_than_buildid = get_newest_cached_buildid(cached_builds, incomplete_buildids)
+        logger_.info(f"{len(cached_builds)} builds cached, requesting builds newer than {newer_than_buildid}")
 
-    # # TODO: Delete this for using requests, now data is used from local file
-    with open('data_input.json', 'r') as file:
-        test_runs_data = json.load(file)
+    if args.stream and not (args.fetch and args.page_size > 0):
+        stream_test_runs_data(logger_, cached_builds, newer_than_buildid)
+        return
+
+    if args.fetch and args.page_size > 0:
+        test_runs_data = fetch_test_runs_data_paginated(ip_address=args.ip_address, project_name=args.project_name,
+                                                        limit=args.limit, page_size=args.page_size,
+                                                        concurrency=args.concurrency, retries=args.retries,
+                                                        newer_than_buildid=newer_than_buildid)
+    elif args.fetch:
+        test_runs_data = fetch_test_runs_data(ip_address=args.ip_address, project_name=args.project_name,
+                                              limit=args.limit, newer_than_buildid=newer_than_buildid)
+    else:
+        with open(args.input_file, 'r') as file:
+            test_runs_data = json.load(file)
 
     if test_runs_data is None:
         sys.exit(1)
 
+    if args.cache_file:
+        new_builds = test_runs_data.get("builds", [])
+        try:
+            amount_of_new_builds = update_builds_cache(args.cache_file, new_builds, cached_builds)
+            logger_.info(f"{amount_of_new_builds} new builds were added to {args.cache_file}")
+        except OSError as e:
+            logger_.error(f"Error occurred trying write {args.cache_file}: \n{e}")
+        test_runs_data = merge_builds(cached_builds, new_builds, newer_than_buildid)
+
     if not test_runs_data:
         logger.info("Test runs data is empty.")
         return
 
-    test_cases_data = write_test_cases_data(args.test_automation_directory, test_runs_data)
+    if args.flaky_report:
+        flaky_tests = detect_flaky_tests(process_the_run_tests_data(test_runs_data))
+        try:
+            create_json_file(flaky_tests, args.flaky_report)
+            logger_.info(f"{len(flaky_tests)} flaky test cases were written to {args.flaky_report}")
+        except OSError as e:
+            logger_.error(f"Error occurred trying write {args.flaky_report}: \n{e}")
 
-    if not test_cases_data:
-        sys.exit(1)
-
-    try:
-        create_json_file(test_cases_data, args.json_file)
-    except Exception as e:
-        logger_.error(f"Error occurred trying write {args.json_file}: \n{e}")
-        sys.exit(1)
-
-    logger_.info(f" >>> Was generated {args.json_file} file in {os.getcwd()} directory")
+    write_test_cases_file(logger_, test_runs_data)
 
 
 if __name__ == "__main__":
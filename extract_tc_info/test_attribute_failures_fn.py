@@ -0,0 +1,106 @@
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+import attribute_failures as af
+
+
+@pytest.fixture()
+def temp_dir():
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+# NOTE: 'git log' order, the newest commit is the first.
+COMMITS_DATA = [
+    {"Commit: ": "c5", "Author: ": "A <a@b.c>", "Changed_files: ": ["test_cases/core/test_a.py"]},
+    {"Commit: ": "c4", "Author: ": "B <b@b.c>", "Changed_files: ": ["framework/lib.py"]},
+    {"Commit: ": "c3", "Author: ": "B <b@b.c>", "Changed_files: ": ["test_cases/core/helper.py"],
+     "Renamed_files: ": {"new_0_name": "test_cases/core/data.json", "old_0_name": "data.json"}},
+    {"Commit: ": "c2", "Author: ": "A <a@b.c>", "Changed_files: ": ["test_cases/core/test_a.py"]},
+    {"Commit: ": "c1", "Author: ": "A <a@b.c>", "Changed_files: ": ["test_cases/ui/test_b.py"]},
+]
+
+
+def create_build(revision: str, results: int, test_file: str = "test_a.py", test_dir: str = "core") -> dict:
+    return {"results": results, "properties": {"revision": revision, "test_scenario": {"tests": [
+        {"test_file": test_file, "test_path": f"test_cases/{test_dir}/{test_file}",
+         "submission_time": "2024_01_01_10h_00m"}
+    ]}}}
+
+
+def create_history_index() -> af.GitHistoryIndex:
+    history_index = af.GitHistoryIndex()
+    for commit_data in COMMITS_DATA:
+        history_index.add(commit_data)
+    return history_index
+
+
+def test_attribute_failures():
+    builds = [create_build("c1", 0), create_build("c2", 0), create_build("c4", 2), create_build("c5", 2),
+              create_build("c1", 0, "test_b.py", "ui"), create_build("c5", 0, "test_b.py", "ui")]
+
+    result = af.attribute_failures(builds, create_history_index())
+
+    assert list(result) == ["test_a.py"]
+    assert result["test_a.py"]["failing_revision"] == "c5"
+    assert result["test_a.py"]["green_revision"] == "c2"
+    assert [commit["commit"] for commit in result["test_a.py"]["commits"]] == ["c5", "c3"]
+    assert result["test_a.py"]["commits"][1]["related_files"] == ["test_cases/core/helper.py",
+                                                                  "test_cases/core/data.json"]
+
+
+def test_attribute_failure_without_green_revision():
+    result = af.attribute_failure("test_cases/core/test_a.py", {"c4": {"passed": 0, "failed": 1},
+                                                                "unknown": {"passed": 1, "failed": 0}},
+                                  create_history_index())
+
+    assert result["green_revision"] is None
+    assert [commit["commit"] for commit in result["commits"]] == ["c3", "c2"]
+
+
+def test_attribute_failure_unknown_revisions():
+    assert af.attribute_failure("test_cases/core/test_a.py", {"unknown": {"passed": 0, "failed": 1}},
+                                create_history_index()) is None
+
+
+@pytest.mark.parametrize("suffix", [".json", ".jsonl"])
+def test_load_git_info(temp_dir: str, suffix: str):
+    git_info_file = Path(temp_dir) / f"git_info{suffix}"
+    with open(git_info_file, "w", encoding="UTF-8") as file:
+        if suffix == ".jsonl":
+            file.writelines(json.dumps(commit_data) + "\n" for commit_data in COMMITS_DATA)
+        else:
+            json.dump({f"Commit - {commit_data['Commit: ']}": commit_data for commit_data in COMMITS_DATA}, file)
+
+    history_index = af.load_git_info(git_info_file)
+
+    assert history_index.commits == COMMITS_DATA
+    assert history_index.get_position("c3") == 2
+    assert history_index.get_position("missing") is None
+
+
+def test_attribute_failure_renamed_changed_files():
+    history_index = af.GitHistoryIndex()
+    for commit_data in [
+        {"Commit: ": "c3", "Changed_files: ": ["test_cases/core/test_a.py"]},
+        {"Commit: ": "c2", "Changed_files: ": ["lib/helper.py => test_cases/core/helper.py",
+                                               "test_cases/{ui => core}/data.json"]},
+        {"Commit: ": "c1", "Changed_files: ": ["README.md"],
+         "Renamed_paths: ": [["test_cases/core/conftest.py", "conftest.py"]]},
+        {"Commit: ": "c0", "Changed_files: ": []},
+    ]:
+        history_index.add(commit_data)
+
+    result = af.attribute_failure("test_cases/core/test_a.py", {"c3": {"passed": 0, "failed": 1},
+                                                                "c0": {"passed": 1, "failed": 0}}, history_index)
+
+    assert [commit["related_files"] for commit in result["commits"]] == [
+        ["test_cases/core/test_a.py"],
+        ["test_cases/core/helper.py", "test_cases/core/data.json"],
+        ["test_cases/core/conftest.py"],
+    ]
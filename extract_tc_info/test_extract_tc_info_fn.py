@@ -0,0 +1,523 @@
+import json
+import shutil
+import subprocess
+import tempfile
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+import extract_tc_info as et
+
+DATA_INPUT_FILE = Path(__file__).parent / "data_input.json"
+
+
+@pytest.fixture()
+def temp_dir():
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+@pytest.fixture(scope="module")
+def test_runs_data() -> dict:
+    with open(DATA_INPUT_FILE, "r", encoding="UTF-8") as file:
+        return json.load(file)
+
+
+class StubTestRunsServer(ThreadingHTTPServer):
+    """Local '/test_runs' endpoint serving builds by 'offset' and 'limit', failing first requests if asked.
+
+    Requests after failed ones can be answered with truncated JSON body ('truncated_responses').
+    """
+
+    def __init__(self, builds: list[dict], failures: int = 0):
+        super().__init__(("127.0.0.1", 0), StubTestRunsHandler)
+        self.builds = builds
+        self.failures = failures
+        self.truncated_responses = 0
+        self.requests = []
+        self.lock = threading.Lock()
+
+
+class StubTestRunsHandler(BaseHTTPRequestHandler):
+    server: StubTestRunsServer
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        offset = int(query.get("offset", ["0"])[0])
+        limit = int(query["limit"][0])
+
+        newer_than_buildid = int(query.get(et.NEWER_THAN_BUILDID_PARAMETER, ["0"])[0])
+        builds = [build for build in self.server.builds if build["buildid"] > newer_than_buildid]
+
+        with self.server.lock:
+            self.server.requests.append((offset, limit))
+            fail = self.server.failures > 0
+            self.server.failures -= 1
+            truncate = not fail and self.server.truncated_responses > 0
+            if truncate:
+                self.server.truncated_responses -= 1
+
+        if fail:
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        body = json.dumps({"builds": builds[offset:offset + limit]}).encode()
+        if truncate:
+            body = body[:len(body) // 2]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_):
+        pass
+
+
+@pytest.fixture()
+def stub_server(request, test_runs_data: dict):
+    failures = getattr(request, "param", 0)
+    server = StubTestRunsServer(test_runs_data["builds"], failures)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def get_address(server: StubTestRunsServer) -> str:
+    host, port = server.server_address
+    return f"{host}:{port}"
+
+
+def test_fetch_test_runs_data_paginated(stub_server: StubTestRunsServer, test_runs_data: dict):
+    result = et.fetch_test_runs_data_paginated(get_address(stub_server), "Test Automation", limit=1000,
+                                               page_size=10, concurrency=4)
+
+    assert result == test_runs_data
+    assert sorted(stub_server.requests)[:2] == [(0, 10), (10, 10)]
+    assert len(stub_server.requests) == 100
+
+
+def test_fetch_test_runs_data_paginated_last_page_limit(stub_server: StubTestRunsServer, test_runs_data: dict):
+    result = et.fetch_test_runs_data_paginated(get_address(stub_server), "Test Automation", limit=25,
+                                               page_size=10, concurrency=2)
+
+    assert result["builds"] == test_runs_data["builds"][:25]
+    assert sorted(stub_server.requests) == [(0, 10), (10, 10), (20, 5)]
+
+
+@pytest.mark.parametrize("stub_server", [2], indirect=True)
+def test_fetch_test_runs_data_paginated_retries(stub_server: StubTestRunsServer, test_runs_data: dict):
+    result = et.fetch_test_runs_data_paginated(get_address(stub_server), "Test Automation", limit=30,
+                                               page_size=10, concurrency=1, retries=2, backoff=0.01)
+
+    assert result["builds"] == test_runs_data["builds"][:30]
+    assert len(stub_server.requests) == 5
+
+
+def test_fetch_test_runs_data_paginated_truncated_page(stub_server: StubTestRunsServer, test_runs_data: dict):
+    stub_server.truncated_responses = 1
+    result = et.fetch_test_runs_data_paginated(get_address(stub_server), "Test Automation", limit=30,
+                                               page_size=10, concurrency=1, retries=1, backoff=0.01)
+
+    assert result["builds"] == test_runs_data["builds"][:30]
+    assert len(stub_server.requests) == 4
+
+
+def test_join_pages_builds_drops_builds_shifted_to_next_page():
+    pages = [
+        {"builds": [{"buildid": 9}, {"buildid": 8}]},
+        # NOTE: Build 10 arrived after the first page was fetched, so build 8 is returned again.
+        {"builds": [{"buildid": 8}, {"buildid": 7}]},
+        {"builds": [{"results": 0}, {"results": 2}]},
+    ]
+    assert et.join_pages_builds(pages) == [{"buildid": 9}, {"buildid": 8}, {"buildid": 7}, {"results": 0},
+                                           {"results": 2}]
+
+
+@pytest.mark.parametrize("stub_server", [100], indirect=True)
+def test_fetch_test_runs_data_paginated_failed(stub_server: StubTestRunsServer):
+    result = et.fetch_test_runs_data_paginated(get_address(stub_server), "Test Automation", limit=20,
+                                               page_size=10, concurrency=2, retries=1, backoff=0.01)
+    assert result is None
+
+
+def test_fetch_test_runs_data_newer_than_buildid(stub_server: StubTestRunsServer, test_runs_data: dict):
+    newest_buildids = sorted(build["buildid"] for build in test_runs_data["builds"])[-3:]
+    result = et.fetch_test_runs_data(get_address(stub_server), "Test Automation", limit=1000,
+                                     newer_than_buildid=newest_buildids[0])
+
+    assert sorted(build["buildid"] for build in result["builds"]) == newest_buildids[1:]
+
+
+def test_builds_cache_round_trip(temp_dir: str):
+    cache_file = Path(temp_dir) / "builds.jsonl"
+    builds = [{"buildid": 3, "complete": True}, {"buildid": 2, "complete": False}, {"buildid": 1, "complete": True}]
+
+    assert et.update_builds_cache(cache_file, builds, {}) == 2
+    with open(cache_file, "a", encoding="UTF-8") as file:
+        file.write('{"buildid": 4, "compl')
+
+    cached_builds, incomplete_buildids = et.load_builds_cache(cache_file)
+    assert cached_builds == {3: builds[0], 1: builds[2]}
+    assert incomplete_buildids == [2]
+
+
+def test_load_builds_cache_missing_file(temp_dir: str):
+    assert et.load_builds_cache(Path(temp_dir) / "missing.jsonl") == ({}, [])
+
+
+def test_get_newest_cached_buildid():
+    cached_builds = {1: {}, 3: {}, 5: {}}
+    assert et.get_newest_cached_buildid(cached_builds, []) == 5
+    assert et.get_newest_cached_buildid(cached_builds, [4, 2]) == 1
+    assert et.get_newest_cached_buildid(cached_builds, [3]) == 5
+    assert et.get_newest_cached_buildid({}, [4]) == 0
+
+
+def test_merge_builds():
+    cached_builds = {1: {"buildid": 1, "results": 0}, 3: {"buildid": 3, "results": 0}}
+    new_builds = [{"buildid": 2, "results": 2}, {"buildid": 3, "results": 2}, {"buildid": 4, "results": 0}]
+
+    result = et.merge_builds(cached_builds, new_builds, newer_than_buildid=1)
+    assert result == {"builds": [{"buildid": 4, "results": 0}, {"buildid": 3, "results": 2},
+                                 {"buildid": 2, "results": 2}, {"buildid": 1, "results": 0}]}
+
+
+def split_into_chunks(text: str, chunk_size: int) -> list[str]:
+    return [text[index:index + chunk_size] for index in range(0, len(text), chunk_size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_iter_json_array_items_chunked(test_runs_data: dict, chunk_size: int):
+    text = json.dumps({"meta": {"total": [1, 2]}, "builds": test_runs_data["builds"], "next": None}, indent=2)
+
+    result = list(et.iter_json_array_items(split_into_chunks(text, chunk_size), "builds"))
+
+    assert result == test_runs_data["builds"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"builds": [12345, 6.5e3, "a,]"]}', [12345, 6500.0, "a,]"]),
+    ('{"builds": []}', []),
+    ('{}', []),
+    ('{"other": [1]}', []),
+])
+def test_iter_json_array_items_values(text: str, expected: list):
+    assert list(et.iter_json_array_items(split_into_chunks(text, 2), "builds")) == expected
+
+
+def test_iter_json_array_items_damaged():
+    with pytest.raises(ValueError):
+        list(et.iter_json_array_items(['{"builds": [{"buildid": 1}, {"buildid"'], "builds"))
+
+
+def test_streamed_builds_give_same_test_cases_data(test_runs_data: dict, stub_server: StubTestRunsServer):
+    expected = et.process_the_run_tests_data(test_runs_data)
+
+    assert et.process_builds(et.iter_builds_from_file(DATA_INPUT_FILE)) == expected
+
+    builds = et.fetch_test_runs_builds_streamed(get_address(stub_server), "Test Automation", limit=1000)
+    assert et.process_builds(builds) == expected
+
+
+def test_iter_merged_builds_same_as_merge_builds():
+    cached_builds = {1: {"buildid": 1, "results": 0}, 3: {"buildid": 3, "results": 0}}
+    new_builds = [{"buildid": 2, "results": 2}, {"buildid": 3, "results": 2}, {"buildid": 4, "results": 0}]
+
+    result = list(et.iter_merged_builds(cached_builds, new_builds, newer_than_buildid=1))
+
+    expected = et.merge_builds(cached_builds, new_builds, newer_than_buildid=1)["builds"]
+    assert sorted(result, key=lambda build: build["buildid"], reverse=True) == expected
+
+
+def test_cache_builds_same_as_update_builds_cache(temp_dir: str):
+    builds = [{"buildid": 3, "complete": True}, {"buildid": 2, "complete": False}, {"buildid": 1, "complete": True}]
+    streamed_cache_file = Path(temp_dir) / "streamed.jsonl"
+    cache_file = Path(temp_dir) / "builds.jsonl"
+
+    assert list(et.cache_builds(iter(builds), streamed_cache_file, {1: builds[2]})) == builds
+    et.update_builds_cache(cache_file, builds, {1: builds[2]})
+
+    assert streamed_cache_file.read_text(encoding="UTF-8") == cache_file.read_text(encoding="UTF-8")
+
+
+def test_aggregate_builds_same_as_lists_of_runs(test_runs_data: dict):
+    extracted_data = et.process_the_run_tests_data(test_runs_data)
+
+    accumulators = et.aggregate_builds(et.iter_builds_from_file(DATA_INPUT_FILE))
+
+    assert accumulators.keys() == extracted_data.keys()
+    for test_file, test_case_info in extracted_data.items():
+        accumulator = accumulators[test_file]
+        assert (accumulator.failed, accumulator.passed) == et.count_amount_of_executions(test_case_info)
+        assert accumulator.get_latest_submission_time() == et.get_latest_submission_time(test_case_info)
+        assert sorted(accumulator.revisions) == sorted(et.collect_revisions(test_case_info))
+
+
+def test_test_case_accumulator_invalid_submission_time():
+    accumulator = et.TestCaseAccumulator()
+    accumulator.add(0, "2024_01_02_10h_05m", "r1")
+    accumulator.add(2, "broken", "r2")
+    accumulator.add(1, "2023_12_31_23h_59m", "r1")
+
+    assert (accumulator.passed, accumulator.failed) == (1, 1)
+    assert accumulator.revisions == {"r1", "r2"}
+    assert accumulator.get_latest_submission_time() == datetime(2024, 1, 2, 10, 5)
+
+
+def test_aggregate_builds_columnar_same_as_aggregate_builds(test_runs_data: dict):
+    pytest.importorskip("numpy")
+    builds = test_runs_data["builds"] + [
+        {"results": None, "properties": {"test_scenario": {"tests": [{"test_file": "test_new.py"}]}}},
+        {"results": 2, "properties": {"revision": "r1", "test_scenario": {"tests": [{"test_file": "test_new.py",
+                                                                                     "submission_time": "x"}]}}},
+    ]
+
+    assert et.aggregate_builds_columnar(builds) == et.aggregate_builds(builds)
+
+    windows = et.ReportWindows(last_runs=3, last_days=30, reference_time=datetime(2024, 3, 1))
+    result = et.aggregate_builds_columnar(builds, windows)
+    expected = et.aggregate_builds(builds, windows)
+    assert result == expected
+    for test_file, accumulator in expected.items():
+        assert sorted(result[test_file].latest_runs) == sorted(accumulator.latest_runs)
+
+
+@pytest.mark.parametrize("backend", et.BACKENDS)
+def test_write_test_cases_data_backends(test_runs_data: dict, temp_dir: str, backend: str):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    test_cases_directory = Path(temp_dir) / "test_cases"
+    test_cases_directory.mkdir()
+    for build in test_runs_data["builds"][:3]:
+        for test in build["properties"]["test_scenario"]["tests"]:
+            (test_cases_directory / test["test_file"]).touch()
+    (test_cases_directory / "test_never_run.py").touch()
+
+    result = et.write_test_cases_data(Path(temp_dir), test_runs_data, backend)
+    expected = et.write_test_cases_data(Path(temp_dir), test_runs_data)
+
+    assert result.keys() == expected.keys()
+    for test_file, test_case_data in expected.items():
+        assert {**result[test_file], "revisions": sorted(result[test_file]["revisions"])} == {
+            **test_case_data, "revisions": sorted(test_case_data["revisions"])}
+    assert result["test_never_run.py"]["amount_of_executions"] == 0
+
+
+def test_test_case_accumulator_windows_and_revisions():
+    windows = et.ReportWindows(last_runs=2, last_days=10, reference_time=datetime(2024, 1, 20))
+    accumulator = et.TestCaseAccumulator()
+    runs = [
+        (2, "2024_01_01_10h_00m", "r1"),
+        (0, "2024_01_15_10h_00m", "r2"),
+        (2, "2024_01_12_10h_00m", "r2"),
+        (0, "2024_01_18_10h_00m", "r2"),
+        (0, "2024_01_05_10h_00m", "r1"),
+    ]
+    for results, submission_time, revision in runs:
+        accumulator.add(results, submission_time, revision, windows)
+
+    assert accumulator.revision_results == {"r1": {"passed": 1, "failed": 1}, "r2": {"passed": 2, "failed": 1}}
+    assert accumulator.get_latest_runs_pass_ratio() == 1.0
+    assert accumulator.get_days_pass_ratio() == 2 / 3
+    assert et.calculate_pass_ratio(accumulator.passed, accumulator.failed) == 0.6
+
+
+def create_test_automation_directory(root: Path) -> Path:
+    for relative_path in ["test_a.py", "core/test_b.py", "core/helper.py", "core/deep/test_c.py", "ui/test_d.py"]:
+        path = root / "test_cases" / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("", encoding="UTF-8")
+    return root
+
+
+def test_collect_test_cases_indexed(temp_dir: str, monkeypatch):
+    test_automation_directory = create_test_automation_directory(Path(temp_dir) / "ta")
+    index_file = Path(temp_dir) / "index.json"
+
+    result = et.collect_test_cases_indexed(test_automation_directory, index_file, jobs=2)
+    assert sorted(result) == sorted(et.collect_test_cases_from_directory(test_automation_directory))
+
+    scanned_directories = []
+    scan_directory = et.scan_directory
+    monkeypatch.setattr(et, "scan_directory",
+                        lambda directory: scanned_directories.append(directory) or scan_directory(directory))
+
+    assert sorted(et.collect_test_cases_indexed(test_automation_directory, index_file)) == sorted(result)
+    assert scanned_directories == []
+
+    (test_automation_directory / "test_cases" / "core" / "deep" / "test_e.py").touch()
+    shutil.rmtree(test_automation_directory / "test_cases" / "ui")
+
+    result = et.collect_test_cases_indexed(test_automation_directory, index_file)
+    assert sorted(result) == sorted(et.collect_test_cases_from_directory(test_automation_directory))
+    assert sorted(scanned_directories) == sorted([test_automation_directory / "test_cases" / ".",
+                                                  test_automation_directory / "test_cases" / "core" / "deep"])
+
+
+def test_collect_test_cases_indexed_symlink_loop(temp_dir: str):
+    test_automation_directory = create_test_automation_directory(Path(temp_dir) / "ta")
+    (test_automation_directory / "test_cases" / "core" / "loop").symlink_to("..", target_is_directory=True)
+
+    result = et.collect_test_cases_indexed(test_automation_directory, Path(temp_dir) / "index.json")
+    assert sorted(result) == sorted(et.collect_test_cases_from_directory(test_automation_directory))
+
+
+def test_collect_test_cases_from_git(temp_dir: str):
+    test_automation_directory = create_test_automation_directory(Path(temp_dir))
+    subprocess.run(["git", "init", "-q", temp_dir], check=True)
+    subprocess.run(["git", "-C", temp_dir, "add", "test_cases/core"], check=True)
+
+    result = et.collect_test_cases_from_git(test_automation_directory)
+
+    assert sorted(path.resolve() for path in result) == sorted([
+        (test_automation_directory / "test_cases" / "core" / "deep" / "test_c.py").resolve(),
+        (test_automation_directory / "test_cases" / "core" / "test_b.py").resolve(),
+    ])
+
+
+@pytest.mark.parametrize("submission_time, expected", [
+    ("2024_03_18_16h_26m", datetime(2024, 3, 18, 16, 26)),
+    ("1999_12_31_23h_59m", datetime(1999, 12, 31, 23, 59)),
+    ("2024_02_30_16h_26m", None),
+    ("2024_03_18_16h_26", None),
+    ("2024-03-18_16h_26m", None),
+    ("2024_03_18_1 h_26m", None),
+    ("broken", None),
+    ("", None),
+    (None, None),
+])
+def test_parse_submission_time(submission_time, expected):
+    assert et.parse_submission_time(submission_time) == expected
+    if expected is not None:
+        assert et.parse_submission_time(submission_time) == datetime.strptime(submission_time,
+                                                                              et.SUBMISSION_TIME_FORMAT)
+
+
+def test_get_latest_submission_time_skips_damaged_runs():
+    test_case_info = [et.TestRun("2024_01_02_10h_05m", 0, "r1"), et.TestRun("zzz", 0, "r1"),
+                      et.TestRun("2023_12_31_23h_59m", 0, "r1")]
+
+    assert et.get_latest_submission_time(test_case_info) == datetime(2024, 1, 2, 10, 5)
+    assert et.get_latest_submission_time([et.TestRun("zzz", 0, "r1")]) is None
+
+
+def test_test_cases_state_adds_builds_incrementally(test_runs_data: dict):
+    builds = sorted(test_runs_data["builds"], key=lambda build: build["buildid"])
+    running_build = {**builds[10], "complete": False}
+    state = et.TestCasesState()
+
+    assert state.add_builds(builds[:10] + [running_build]) == 10
+    assert state.get_newer_than_buildid() == builds[10]["buildid"] - 1
+
+    assert state.add_builds(builds) == len(builds) - 10
+    assert state.add_builds(builds) == 0
+    assert state.get_newer_than_buildid() == builds[-1]["buildid"]
+    assert state.accumulators == et.aggregate_builds(builds)
+
+
+def test_test_cases_info_daemon(stub_server: StubTestRunsServer, test_runs_data: dict, temp_dir: str):
+    test_cases = [Path(temp_dir) / test["test_file"]
+                  for test in test_runs_data["builds"][0]["properties"]["test_scenario"]["tests"]]
+    state = et.TestCasesState()
+    newer_than_buildids = []
+
+    def fetch_builds(newer_than_buildid: int) -> list[dict] | None:
+        newer_than_buildids.append(newer_than_buildid)
+        test_runs = et.fetch_test_runs_data(get_address(stub_server), "Test Automation", 1000, newer_than_buildid)
+        return test_runs["builds"]
+
+    server = et.TestCasesInfoServer(("127.0.0.1", 0), state)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        assert et.poll_test_runs(state, fetch_builds, lambda: test_cases) == len(test_runs_data["builds"])
+        assert et.poll_test_runs(state, fetch_builds, lambda: test_cases) == 0
+        assert newer_than_buildids == [0, max(build["buildid"] for build in test_runs_data["builds"])]
+
+        response = requests.get(f"http://{get_address(server)}{et.TEST_CASES_INFO_PATH}", timeout=5)
+        assert response.status_code == 200
+        assert response.json() == json.loads(json.dumps(
+            et.create_test_cases_data(test_cases, et.aggregate_builds(test_runs_data["builds"]))))
+        assert requests.get(f"http://{get_address(server)}/other", timeout=5).status_code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_poll_test_runs_keeps_last_state_after_failed_poll(stub_server: StubTestRunsServer, test_runs_data: dict,
+                                                          temp_dir: str):
+    test_cases = [Path(temp_dir) / test["test_file"]
+                  for test in test_runs_data["builds"][0]["properties"]["test_scenario"]["tests"]]
+    state = et.TestCasesState()
+
+    def fetch_builds(newer_than_buildid: int) -> list[dict] | None:
+        test_runs = et.fetch_test_runs_data(get_address(stub_server), "Test Automation", 1000, newer_than_buildid)
+        return None if test_runs is None else test_runs["builds"]
+
+    def collect_failing() -> list[Path]:
+        raise OSError("test automation directory is not mounted")
+
+    stub_server.truncated_responses = 1
+    assert et.poll_test_runs(state, fetch_builds, lambda: test_cases) is None
+    assert state.output == b"{}"
+
+    assert et.poll_test_runs(state, fetch_builds, collect_failing) is None
+    assert state.output == b"{}"
+    assert state.render_pending
+
+    def fetch_builds_failing(_: int) -> list[dict] | None:
+        raise ValueError("Expecting value: line 1 column 1 (char 0)")
+
+    assert et.poll_test_runs(state, fetch_builds_failing, lambda: test_cases) is None
+    assert et.poll_test_runs(state, fetch_builds, lambda: test_cases) == 0
+    assert json.loads(state.output) == json.loads(json.dumps(
+        et.create_test_cases_data(test_cases, et.aggregate_builds(test_runs_data["builds"]))))
+    assert not state.render_pending
+
+
+def test_detect_flaky_tests():
+    extracted_info = {
+        "test_flaky.py": [
+            et.TestRun("2024_01_03_10h_00m", 0, "r1"),
+            et.TestRun("2024_01_01_10h_00m", 0, "r1"),
+            et.TestRun("2024_01_02_10h_00m", 2, "r1"),
+            et.TestRun("2024_01_04_10h_00m", 2, "r2"),
+            et.TestRun("2024_01_05_10h_00m", 4, "r2"),
+            et.TestRun("2024_01_06_10h_00m", 2, "r2"),
+        ],
+        "test_rarely_flaky.py": [
+            et.TestRun(f"2024_01_0{day}_10h_00m", 2 if day == 5 else 0, "r1")
+            for day in range(1, 10)
+        ],
+        "test_fixed.py": [
+            et.TestRun("2024_01_01_10h_00m", 2, "r1"),
+            et.TestRun("2024_01_02_10h_00m", 0, "r2"),
+        ],
+    }
+
+    result = et.detect_flaky_tests(extracted_info)
+
+    assert [flaky_test["test_file"] for flaky_test in result] == ["test_flaky.py", "test_rarely_flaky.py"]
+    assert result[0] == {"test_file": "test_flaky.py", "flakiness_score": 2 / 3, "flips": 2, "runs": 5,
+                         "flaky_revisions": {"r1": 2}}
+    assert result[1]["flakiness_score"] == 2 / 8
+
+
+def test_detect_flaky_tests_on_sample_data(test_runs_data: dict):
+    extracted_info = et.process_the_run_tests_data(test_runs_data)
+
+    result = et.detect_flaky_tests(extracted_info)
+
+    scores = [flaky_test["flakiness_score"] for flaky_test in result]
+    assert scores == sorted(scores, reverse=True)
+    assert all(0 < score <= 1 and flaky_test["flaky_revisions"] for score, flaky_test in zip(scores, result))
@@ -0,0 +1,90 @@
+import argparse
+import logging
+import timeit
+from pathlib import Path
+
+import collect_git_info as cg
+
+SAMPLE_COMMIT_LOG = """commit e78c1fe49557fb8c713790f750b710c740bfb626
+Author: arnas.zuklija <arnas.zuklija@qdevtechnologies.com>
+Date:   2021-08-30 13:13:04 +0300
+
+    Merge remote-tracking branch 'origin/develop' into implement_new_tc_24466
+
+    # Conflicts:
+    #       framework/lib/device/monitor.py
+
+ azure-pipelines.yml                                                                            |    7 +-
+ {services/test_cases/core/web => framework/lib/report_engine/validation}/__init__.py           |    0
+ services/{test_cases => project_service_tmt}/run.py                                            |   34 +-
+ framework/unittests/integration/polarion/test_db_20211019_121040_positive.sqlite               |   Bin 0 -> 90112 bytes
+ test_cases/EBM/BloodPump/test_bp_door_sensor_state_monitoring.py                               |   12 +-
+ 4 files changed, 163570 insertions(+), 86903 deletions(-)
+"""
+
+
+def parse_with_functions(commit_log: str):
+    """Parses commit log the way 'create_commit_data' did before 'CommitLogParser'"""
+
+    author, date = cg.get_author_and_date_from_git_log(commit_log)
+    first_line, modified_files, renamed_files = cg.get_changed_and_renamed_files_from_git_log(commit_log)
+    message = cg.get_message_from_git_log(commit_log, date, first_line)
+    insertions = cg.get_insertion_or_deletion_from_git_log(commit_log, "insertion")
+    deletions = cg.get_insertion_or_deletion_from_git_log(commit_log, "deletion")
+    return author, date, message, modified_files, renamed_files, insertions, deletions
+
+
+def parse_with_parser(commit_log: str):
+    parsed_log = cg.CommitLogParser(commit_log)
+    return (parsed_log.author, parsed_log.date, parsed_log.message, parsed_log.modified_files,
+            parsed_log.renamed_files, parsed_log.insertions, parsed_log.deletions)
+
+
+def collect_commit_logs(git_repo: Path | None, amount: int) -> list[str]:
+    """Takes 'git show' output of the latest commits from given repository or the bundled sample log"""
+
+    if git_repo is None:
+        return [SAMPLE_COMMIT_LOG]
+
+    commit_logs = []
+    for commit_hash in cg.get_commits(git_repo)[:amount]:
+        commit_log = cg.get_commit_show_output(git_repo, commit_hash)
+        if commit_log is not None:
+            commit_logs.append(commit_log)
+    return commit_logs
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-g", "--git-repository", type=Path,
+                        help="Specify the git repository to take commit logs from, bundled sample is used otherwise")
+    parser.add_argument("-c", "--commits", type=int, default=200,
+                        help="Specify the amount of the latest commits to take from git repository")
+    parser.add_argument("-n", "--number", type=int, default=2000,
+                        help="Specify how many times every commit log is parsed")
+    return parser.parse_args()
+
+
+def main():
+    # NOTE: Parsers log errors of damaged commits, logging would be measured together with parsing.
+    logging.disable(logging.CRITICAL)
+    commit_logs = collect_commit_logs(args.git_repository, args.commits)
+    if not commit_logs:
+        print("No commit logs to parse")
+        return
+
+    for commit_log in commit_logs:
+        assert parse_with_functions(commit_log) == parse_with_parser(commit_log)
+
+    results = {}
+    for name, parse in [("functions", parse_with_functions), ("CommitLogParser", parse_with_parser)]:
+        total_time = timeit.timeit(lambda: [parse(commit_log) for commit_log in commit_logs], number=args.number)
+        results[name] = total_time / (args.number * len(commit_logs)) * 1_000_000
+        print(f"{name:>16}: {results[name]:.2f} us per commit")
+
+    print(f"{'speedup':>16}: {results['functions'] / results['CommitLogParser']:.2f}x")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main()
@@ -1,16 +1,32 @@
 import logging
 import argparse
+import glob
 import os
 import subprocess
+import tempfile
 from pathlib import Path
 import sys
 import re
 import json
 import time
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator
+
+from commit_statistics import (RENAME_SEPARATOR, ChurnIndex, RenameTable, create_index_file, create_renames_file,
+                               get_renamed_paths, index_commits, process_renamed_string, track_renames)
+from git_object_reader import READER_ERRORS, UnsupportedObjectStore, format_message, open_native_repository
 
 logger = logging.getLogger(__name__)
 
+AUTHOR_AND_DATE_PATTERN = re.compile(r'Author: (?P<author>.*)\nDate: (?P<date>.*)')
+INSERTION_OR_DELETION_PATTERNS = {
+    "insertion": re.compile(r"(?P<insertion>\d+) insertion(s)?\(\W\)"),
+    "deletion": re.compile(r"(?P<deletion>\d+) deletion(s)?\(\W\)"),
+}
+
 
 def is_git_repo(git_repo: Path) -> bool:
     """Takes directory name and checks if it's Git repository"""
@@ -32,7 +48,28 @@ def is_git_repo(git_repo: Path) -> bool:
     return True
 
 
-def get_commits(git_repo: Path) -> list[str]:
+def create_git_log_filters(revision_range: str = "", since: str = "", until: str = "", author: str = "",
+                           paths: list[Path] | None = None) -> list[str]:
+    """Creates 'git log' arguments, which restrict walked commits, so git does the filtering"""
+
+    log_filters = []
+    if since:
+        log_filters.append(f"--since={since}")
+    if until:
+        log_filters.append(f"--until={until}")
+    if author:
+        log_filters.append(f"--author={author}")
+    if revision_range:
+        log_filters.append(revision_range)
+    if paths:
+        # NOTE: '--' separates paths from revisions, so path is never taken for branch name.
+        log_filters.append("--")
+        log_filters.extend(str(path) for path in paths)
+
+    return log_filters
+
+
+def get_commits(git_repo: Path, log_filters: list[str] | None = None) -> list[str]:
     """Collects all commit hashes from given Git repository and put them into list"""
 
     if not isinstance(git_repo, Path):
@@ -41,7 +78,11 @@ def get_commits(git_repo: Path) -> list[str]:
 
     commits = []
 
-    git_log_message = subprocess.run(["git", "log"], capture_output=True, text=True, cwd=git_repo,
+    command = ["git", "log"]
+    if log_filters:
+        command.extend(log_filters)
+
+    git_log_message = subprocess.run(command, capture_output=True, text=True, cwd=git_repo,
                                      encoding="UTF-8")
     if git_log_message.returncode != 0:
         logger.error(
@@ -68,7 +109,7 @@ def get_author_and_date_from_git_log(commit_log: str) -> tuple[str, str]:
 
     author_group = "author"
     date_group = "date"
-    match = re.search(fr'Author: (?P<{author_group}>.*)\nDate: (?P<{date_group}>.*)', commit_log)
+    match = AUTHOR_AND_DATE_PATTERN.search(commit_log)
 
     if match is None:
         logger.error(f"Could not find {author_group} or {date_group} in log message")
@@ -80,17 +121,6 @@ def get_author_and_date_from_git_log(commit_log: str) -> tuple[str, str]:
     return author.strip(), date.strip()
 
 
-def process_renamed_string(line: str):
-    """Process the renamed file line, returns full old and new file names"""
-
-    # NOTE: Pattern used for simplifying complex renamed or modified file path into two paths.
-    pattern = r'{(.*?)\s*=>\s*(.*?)}'
-    old_file, new_file = re.sub(pattern, r'\1', line), re.sub(pattern, r'\2', line)
-    old_file_name = os.path.basename(old_file.strip())
-    new_file_name = os.path.basename(new_file.strip())
-    return old_file, new_file, new_file_name, old_file_name
-
-
 def get_changed_and_renamed_files_from_git_log(commit_log: str) -> tuple[str, list, dict[str, str]]:
     """Gets the list of modified file names, old and new renamed file names and the first modified file name"""
 
@@ -107,22 +137,37 @@ def get_changed_and_renamed_files_from_git_log(commit_log: str) -> tuple[str, li
         if not first_changed_file:
             first_changed_file = line.strip()
 
-        cropped_line = line[:line.index("|")].strip()
+        process_changed_file_line(line, modified_files, renamed_files)
 
-        # NOTE: "{}", "=>" indicates, that file is renamed, "0" indicates, that it wasn't modified
-        if "{" in line and "=>" in line and " 0" in line:
-            old_file, new_file, new_file_name, old_file_name = process_renamed_string(cropped_line)
-            renamed_files[f"new_'{new_file_name}'_name"] = new_file
-            renamed_files[f"old_'{old_file_name}'_name"] = old_file
+    return first_changed_file, modified_files, renamed_files
 
-        # NOTE: "{}", "=>" indicates, that file is renamed, keeping the new file
-        elif "{" in line and "=>" in line:
-            _, new_file, *_ = process_renamed_string(cropped_line)
-            modified_files.append(new_file)
-        else:
-            modified_files.append(cropped_line)
 
-    return first_changed_file, modified_files, renamed_files
+def process_changed_file_line(line: str, modified_files: list[str], renamed_files: dict[str, str],
+                              renamed_paths: list[list[str]] | None = None):
+    """Adds file from single '--stat' line either to modified files or to old and new renamed file names.
+
+    Every renamed file, modified or not, is also added to 'renamed_paths' as [old path, new path].
+    """
+
+    cropped_line = line[:line.index("|")].strip()
+
+    # NOTE: 'renamed_files' keys are made of file names, renames of files with the same name overwrite each other.
+    if renamed_paths is not None and RENAME_SEPARATOR in cropped_line:
+        old_file, new_file, *_ = process_renamed_string(cropped_line)
+        renamed_paths.append([old_file, new_file])
+
+    # NOTE: "{}", "=>" indicates, that file is renamed, "0" indicates, that it wasn't modified
+    if "{" in line and "=>" in line and " 0" in line:
+        old_file, new_file, new_file_name, old_file_name = process_renamed_string(cropped_line)
+        renamed_files[f"new_'{new_file_name}'_name"] = new_file
+        renamed_files[f"old_'{old_file_name}'_name"] = old_file
+
+    # NOTE: "{}", "=>" indicates, that file is renamed, keeping the new file
+    elif "{" in line and "=>" in line:
+        _, new_file, *_ = process_renamed_string(cropped_line)
+        modified_files.append(new_file)
+    else:
+        modified_files.append(cropped_line)
 
 
 def get_message_from_git_log(commit_log: str, date: str, first_commit_file: str) -> str:
@@ -152,7 +197,7 @@ def get_insertion_or_deletion_from_git_log(commit_log: str, pattern: str) -> int
         logger.error(f"Function requires pattern to be {expected_patterns}")
         raise ValueError("Invalid pattern provided. Pattern must be 'insertions' or 'deletions'.")
 
-    match = re.search(rf"(?P<{pattern}>\d+) {pattern}(s)?\(\W\)", commit_log)
+    match = INSERTION_OR_DELETION_PATTERNS[pattern].search(commit_log)
 
     if match is None:
         return 0
@@ -163,65 +208,599 @@ def get_insertion_or_deletion_from_git_log(commit_log: str, pattern: str) -> int
     return int(match.group(pattern))
 
 
+class CommitLogParser:
+    """Parses 'git show' like commit log in one pass over its lines.
+
+    Gives the same results as 'get_author_and_date_from_git_log', 'get_changed_and_renamed_files_from_git_log',
+    'get_message_from_git_log' and 'get_insertion_or_deletion_from_git_log' used one after another.
+    """
+
+    def __init__(self, commit_log: str):
+        self.commit_log = commit_log
+        self.author = ""
+        self.date = ""
+        self.first_changed_file = ""
+        self.modified_files: list[str] = []
+        self.renamed_files: dict[str, str] = {}
+        self.renamed_paths: list[list[str]] = []
+        self.insertions = 0
+        self.deletions = 0
+        self.message = ""
+        self.parse()
+
+    def parse(self):
+        commit_log = self.commit_log
+        previous_line = ""
+        author_found = False
+        insertions_found = False
+        deletions_found = False
+        message_start = -1
+        message_end = -1
+        line_start = 0
+
+        for line in commit_log.split("\n"):
+            if not author_found and line.startswith("Date: ") and "Author: " in previous_line:
+                author_found = True
+                self.author = previous_line[previous_line.index("Author: ") + len("Author: "):].strip()
+                self.date = line[len("Date: "):].strip()
+                if self.date:
+                    message_start = line_start + line.index(self.date, len("Date: ")) + len(self.date)
+
+            if "|" in line:
+                if not self.first_changed_file:
+                    self.first_changed_file = line.strip()
+                    message_end = line_start + line.index(self.first_changed_file)
+                process_changed_file_line(line, self.modified_files, self.renamed_files, self.renamed_paths)
+
+            if not insertions_found and "insertion" in line:
+                match = INSERTION_OR_DELETION_PATTERNS["insertion"].search(line)
+                if match is not None:
+                    insertions_found = True
+                    self.insertions = int(match.group("insertion"))
+
+            if not deletions_found and "deletion" in line:
+                match = INSERTION_OR_DELETION_PATTERNS["deletion"].search(line)
+                if match is not None:
+                    deletions_found = True
+                    self.deletions = int(match.group("deletion"))
+
+            previous_line = line
+            line_start += len(line) + 1
+
+        if not author_found:
+            logger.error("Could not find author or date in log message")
+
+        if message_start == -1:
+            return
+
+        if message_end == -1:
+            self.message = commit_log[message_start:].strip()
+        else:
+            self.message = commit_log[message_start:message_end].strip()
+
+
 CommitHash = str
-CommitData = Dict[str, str | list[str] | int | dict[str, str]]
+CommitData = Dict[str, str | list[str] | list[list[str]] | int | dict[str, str]]
+
+# NOTE: ASCII record separator marks the start of every commit in single pass 'git log' output.
+GIT_LOG_COMMIT_DELIMITER = "\x1e"
+# NOTE: ASCII unit separator marks the start and the end of raw commit message.
+GIT_LOG_MESSAGE_DELIMITER = "\x1f"
+# NOTE: Format mimics 'git show' header, '%aN' and '%aE' apply '.mailmap' the same way 'git show' does.
+GIT_LOG_FORMAT = (f"{GIT_LOG_COMMIT_DELIMITER}commit %H%nAuthor: %aN <%aE>%nDate:   %ad%n%n"
+                  f"{GIT_LOG_MESSAGE_DELIMITER}%B{GIT_LOG_MESSAGE_DELIMITER}")
+
+
+class CommitRecord(Mapping):
+    """Compact commit record, it is read as CommitData mapping and converted to dict only when written.
+
+    Authors and paths repeat across commits, so they are interned and shared between records.
+    """
+
+    __slots__ = ("commit", "author", "date", "message", "renamed_files", "renamed_paths", "changed_files", "insertions",
+                 "deletions")
+    # NOTE: CommitData keys in the order they are written to JSON, mapped to attributes.
+    KEYS = {
+        "Commit: ": "commit",
+        "Author: ": "author",
+        "Date: ": "date",
+        "Message: ": "message",
+        "Renamed_files: ": "renamed_files",
+        "Renamed_paths: ": "renamed_paths",
+        "Changed_files: ": "changed_files",
+        "Insertions: ": "insertions",
+        "Deletions: ": "deletions",
+    }
+
+    def __init__(self, commit: CommitHash, author: str, date: str, message: str, renamed_files: dict[str, str],
+                 changed_files: list[str], insertions: int, deletions: int,
+                 renamed_paths: list[list[str]] | None = None):
+        self.commit = commit
+        self.author = sys.intern(author)
+        self.date = date
+        self.message = message
+        self.renamed_files = {key: sys.intern(path) for key, path in renamed_files.items()}
+        self.renamed_paths = [[sys.intern(old_path), sys.intern(new_path)]
+                              for old_path, new_path in renamed_paths or []]
+        self.changed_files = [sys.intern(path) for path in changed_files]
+        self.insertions = insertions
+        self.deletions = deletions
+
+    def __getitem__(self, key: str):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, self.KEYS[key])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def __repr__(self) -> str:
+        return f"CommitRecord({self.to_dict()!r})"
+
+    def to_dict(self) -> CommitData:
+        return {key: getattr(self, attribute) for key, attribute in self.KEYS.items()}
+
+    @classmethod
+    def from_dict(cls, commit_data: CommitData) -> "CommitRecord":
+        # NOTE: Commits cached before 'Renamed_paths: ' was added get pairs recovered from the other keys.
+        return cls(commit_data.get("Commit: ", ""), commit_data.get("Author: ", ""), commit_data.get("Date: ", ""),
+                   commit_data.get("Message: ", ""), commit_data.get("Renamed_files: ", {}),
+                   commit_data.get("Changed_files: ", []), commit_data.get("Insertions: ", 0),
+                   commit_data.get("Deletions: ", 0), get_renamed_paths(commit_data))
+
+
+def to_json_compatible(value) -> CommitData:
+    """'default' of json.dump, CommitRecord is converted to CommitData dict only at output time"""
+
+    if isinstance(value, CommitRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def create_commit_data(commit_hash: CommitHash, commit_log: str) -> CommitRecord:
+    """Parses single commit log message ('git show' like output) into CommitRecord"""
+
+    parsed_log = CommitLogParser(commit_log)
+    if not parsed_log.first_changed_file:
+        logger.warning(f"Commit {commit_hash} does not have modified files")
+
+    return CommitRecord(
+        commit=commit_hash,
+        author=parsed_log.author,
+        date=parsed_log.date,
+        message=parsed_log.message,
+        renamed_files=parsed_log.renamed_files,
+        changed_files=parsed_log.modified_files,
+        insertions=parsed_log.insertions,
+        deletions=parsed_log.deletions,
+        renamed_paths=parsed_log.renamed_paths
+    )
+
+
+def format_git_log_commit(commit_lines: list[str]) -> str:
+    """Joins lines of single commit, formatting raw message between delimiters the way 'git show' does"""
+
+    commit_log = "".join(commit_lines)
+    header, _, remaining_log = commit_log.partition(GIT_LOG_MESSAGE_DELIMITER)
+    message, _, stat = remaining_log.rpartition(GIT_LOG_MESSAGE_DELIMITER)
+    if not remaining_log:
+        return commit_log
+
+    return header + format_message(message) + stat
+
+
+def split_git_log_stream(lines: Iterable[str]) -> Iterator[tuple[CommitHash, str]]:
+    """Groups streamed single pass 'git log' lines into (commit hash, commit log) pairs"""
+
+    commit_hash = ""
+    commit_lines: list[str] = []
 
+    for line in lines:
+        if not line.startswith(GIT_LOG_COMMIT_DELIMITER):
+            commit_lines.append(line)
+            continue
+
+        if commit_hash:
+            yield commit_hash, format_git_log_commit(commit_lines)
+
+        header = line[len(GIT_LOG_COMMIT_DELIMITER):]
+        _, commit_hash, *_ = header.split()
+        commit_lines = [header]
+
+    if commit_hash:
+        yield commit_hash, format_git_log_commit(commit_lines)
+
+
+def iter_commit_info_from_git_log(git_repo: Path, log_filters: list[str] | None = None) -> Iterator[CommitData]:
+    """Runs single 'git log' subprocess and yields CommitData of every commit while output is streamed"""
+
+    if not isinstance(git_repo, Path):
+        logger.error(f"{git_repo} - invalid path")
+        return
+
+    # NOTE: '--diff-merges=first-parent' keeps merge commit statistics the same as 'git show' produces.
+    command = ["git", "log", "--stat=350", "--date=iso8601", "--diff-merges=first-parent",
+               f"--format={GIT_LOG_FORMAT}"]
+    if log_filters:
+        # NOTE: '--full-diff' keeps all files of commit in statistics, when commits are filtered by path.
+        if "--" in log_filters:
+            command.append("--full-diff")
+        command.extend(log_filters)
+
+    # NOTE: Stderr goes to a file, piped stderr read only after stdout would block git once its pipe is full.
+    with tempfile.TemporaryFile("w+", encoding="UTF-8") as stderr_file:
+        with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr_file, encoding="UTF-8",
+                              cwd=git_repo) as git_log_process:
+            for commit_hash, commit_log in split_git_log_stream(git_log_process.stdout):
+                if len(commit_hash) != 40:
+                    logger.error(f"Expected commit hash to be 40 symbols, got {len(commit_hash)}")
+                    continue
+                yield create_commit_data(commit_hash, commit_log)
+
+        stderr_file.seek(0)
+        stderr = stderr_file.read()
+
+    if git_log_process.returncode != 0:
+        logger.error(f"Error occurred running subprocess:\n{' '.join(command)}\n{stderr}\n")
+
+
+def get_commit_info_single_pass(git_repo: Path, log_filters: list[str] | None = None) -> Dict[CommitHash, CommitData]:
+    """Collects CommitData of all commits using one streamed 'git log' subprocess"""
 
-def get_commit_info(git_repo: Path) -> Dict[CommitHash, CommitData]:
     all_commits_data: Dict[CommitHash, CommitData] = {}
-    commits = get_commits(git_repo)
+
+    for commit_data in iter_commit_info_from_git_log(git_repo, log_filters):
+        all_commits_data[f"Commit - {commit_data['Commit: ']}"] = commit_data
+
+    return all_commits_data
+
+
+def get_commit_show_output(git_repo: Path, commit_hash: CommitHash) -> str | None:
+    """Runs 'git show' for single commit and returns its output, None if subprocess failed"""
+
+    # NOTE: '--stat=350' parameter is used to extract whole path, in case it's very long.
+    # NOTE: '--date=iso8601' parameter is used to set date formatting, instead using default format.
+    info_of_commit = subprocess.run(["git", "show", commit_hash, "--stat=350", "--date=iso8601"],
+                                    capture_output=True, encoding="UTF-8", cwd=git_repo)
+    if info_of_commit.returncode != 0:
+        logger.error(
+            f"Error occurred running subprocess:\n{' '.join(info_of_commit.args)}\n{info_of_commit.stderr}\n"
+        )
+        return None
+
+    return info_of_commit.stdout
+
+
+def iter_commit_info(git_repo: Path, cached_commits: Dict[CommitHash, CommitData] | None = None,
+                     log_filters: list[str] | None = None, jobs: int = 1) -> Iterator[CommitData]:
+    """Yields CommitData of every commit in 'git log' order, running 'git show' only for not cached commits"""
+
+    commits = get_commits(git_repo, log_filters)
 
     if not commits:
-        return {}
+        return
+
+    if cached_commits is None:
+        cached_commits = {}
+
+    # NOTE: 'git show' outputs are kept only for one chunk, so memory does not grow with history size.
+    chunk_size = max(jobs, 1) * 16
+    failed_commits = []
+
+    # NOTE: 'git show' calls are I/O bound, threads are enough to run them concurrently.
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+        for chunk_start in range(0, len(commits), chunk_size):
+            chunk = commits[chunk_start:chunk_start + chunk_size]
+
+            # NOTE: Commits are immutable, cached data is reused without running 'git show'.
+            not_cached_commits = [commit_hash for commit_hash in chunk if commit_hash not in cached_commits]
+            # NOTE: 'map' returns results in the same order as commits were given.
+            show_outputs = dict(zip(not_cached_commits,
+                                    executor.map(partial(get_commit_show_output, git_repo), not_cached_commits)))
+
+            for commit_hash in chunk:
+                if commit_hash in cached_commits:
+                    yield cached_commits[commit_hash]
+                    continue
+
+                commit_log = show_outputs[commit_hash]
+                if commit_log is None:
+                    failed_commits.append(commit_hash)
+                    continue
+
+                yield create_commit_data(commit_hash, commit_log)
+
+    if failed_commits:
+        logger.error(f"Failed to collect {len(failed_commits)} of {len(commits)} commits: {', '.join(failed_commits)}")
 
+
+def iter_commit_info_native(git_repo: Path, cached_commits: Dict[CommitHash, CommitData] | None = None,
+                            log_filters: list[str] | None = None, jobs: int = 1) -> Iterator[CommitData]:
+    """Yields CommitData read directly from git object store, using 'git show' for not supported commits"""
+
+    if log_filters:
+        logger.warning("Native backend does not support commit filters, falling back to subprocess backend")
+        yield from iter_commit_info(git_repo, cached_commits, log_filters, jobs)
+        return
+
+    try:
+        reader, commit_log_builder = open_native_repository(git_repo)
+        commits = list(reader.iter_commit_hashes(reader.resolve_reference()))
+    except (UnsupportedObjectStore, *READER_ERRORS) as e:
+        logger.warning(f"Native backend can not read {git_repo}, falling back to subprocess backend: {e}")
+        yield from iter_commit_info(git_repo, cached_commits, log_filters, jobs)
+        return
+
+    if cached_commits is None:
+        cached_commits = {}
+
+    amount_of_fallbacks = 0
     for commit_hash in commits:
-        # NOTE: '--stat=350' parameter is used to extract whole path, in case it's very long.
-        # NOTE: '--date=iso8601' parameter is used to set date formatting, instead using default format.
-        info_of_commit = subprocess.run(["git", "show", commit_hash, "--stat=350", "--date=iso8601"],
-                                        capture_output=True, encoding="UTF-8", cwd=git_repo)
-        if info_of_commit.returncode != 0:
-            logger.error(
-                f"Error occurred running subprocess:\n{' '.join(info_of_commit.args)}\n{info_of_commit.stderr}\n"
-            )
-            return {}
-
-        info_of_commit_output = info_of_commit.stdout
-
-        author, date = get_author_and_date_from_git_log(info_of_commit_output)
-        first_line, modified_files, renamed_files = get_changed_and_renamed_files_from_git_log(info_of_commit_output)
-        if not first_line:
-            logger.warning(f"Commit {commit_hash} does not have modified files")
-
-        commit_data: CommitData = {
-            "Commit: ": commit_hash,
-            "Author: ": author,
-            "Date: ": date,
-            "Message: ": get_message_from_git_log(info_of_commit_output, date, first_line),
-            'Renamed_files: ': renamed_files,
-            "Changed_files: ": modified_files,
-            "Insertions: ": get_insertion_or_deletion_from_git_log(info_of_commit_output, "insertion"),
-            "Deletions: ": get_insertion_or_deletion_from_git_log(info_of_commit_output, "deletion")
-        }
-
-        all_commits_data[f"Commit - {commit_hash}"] = commit_data
+        if commit_hash in cached_commits:
+            yield cached_commits[commit_hash]
+            continue
+
+        try:
+            commit_log = commit_log_builder.build(commit_hash)
+        except (UnsupportedObjectStore, *READER_ERRORS) as e:
+            logger.debug(f"Commit {commit_hash} is collected with 'git show': {e!r}")
+            amount_of_fallbacks += 1
+            commit_log = get_commit_show_output(git_repo, commit_hash)
+            if commit_log is None:
+                continue
+
+        yield create_commit_data(commit_hash, commit_log)
+
+    if amount_of_fallbacks:
+        logger.info(f"{amount_of_fallbacks} of {len(commits)} commits were collected with 'git show'")
+
+
+def get_commit_info(git_repo: Path, cached_commits: Dict[CommitHash, CommitData] | None = None,
+                    log_filters: list[str] | None = None, jobs: int = 1) -> Dict[CommitHash, CommitData]:
+    all_commits_data: Dict[CommitHash, CommitData] = {}
+
+    for commit_data in iter_commit_info(git_repo, cached_commits, log_filters, jobs):
+        all_commits_data[f"Commit - {commit_data['Commit: ']}"] = commit_data
 
     return all_commits_data
 
 
+def get_head_commit(git_repo: Path) -> CommitHash:
+    """Returns the commit hash HEAD points to"""
+
+    result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, encoding="UTF-8", cwd=git_repo)
+    if result.returncode != 0:
+        logger.error(f"Error occurred running subprocess:\n{' '.join(result.args)}\n{result.stderr}\n")
+        return ""
+
+    return result.stdout.strip()
+
+
+def is_commit(git_repo: Path, revision: str) -> bool:
+    """Checks if revision resolves to a commit, e.g. cached HEAD could be removed by rebase and 'git gc'"""
+
+    result = subprocess.run(["git", "rev-parse", "--verify", "--quiet", f"{revision}^{{commit}}"],
+                            capture_output=True, encoding="UTF-8", cwd=git_repo)
+    return result.returncode == 0
+
+
+def count_commits(git_repo: Path, revision_range: str) -> int | None:
+    """Returns amount of commits 'git log' walks for revision range, None if subprocess failed"""
+
+    result = subprocess.run(["git", "rev-list", "--count", revision_range], capture_output=True, encoding="UTF-8",
+                            cwd=git_repo)
+    if result.returncode != 0:
+        logger.error(f"Error occurred running subprocess:\n{' '.join(result.args)}\n{result.stderr}\n")
+        return None
+
+    return int(result.stdout)
+
+
+class IncompleteCommitWalk(Exception):
+    pass
+
+
+# NOTE: Cache line with this key stores HEAD of the run which appended to cache, instead of CommitData.
+CACHE_HEAD_KEY = "HEAD: "
+
+
+def load_commit_cache(cache_file: Path) -> tuple[Dict[CommitHash, CommitData], CommitHash]:
+    """Reads JSONL commit cache, returns cached CommitData by commit hash and the last cached HEAD"""
+
+    cached_commits: Dict[CommitHash, CommitData] = {}
+    cached_head = ""
+
+    if not cache_file.is_file():
+        return {}, ""
+
+    with open(cache_file, "r", encoding="UTF-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # NOTE: Interrupted run can leave partially written last line, it is skipped.
+                logger.warning(f"Skipping damaged line {line_number} in {cache_file}")
+                continue
+
+            if CACHE_HEAD_KEY in record:
+                cached_head = record[CACHE_HEAD_KEY]
+                continue
+
+            cached_commits[record["Commit: "]] = CommitRecord.from_dict(record)
+
+    return cached_commits, cached_head
+
+
+def cache_commits(commits_data: Iterable[CommitData], cache_file: Path, cached_commits: Dict[CommitHash, CommitData],
+                  head: CommitHash, amount_of_head_commits: int | None = None) -> Iterator[CommitData]:
+    """Passes CommitData through, appending not yet cached commits to JSONL commit cache as they come.
+    HEAD is recorded only when all 'amount_of_head_commits' commits were passed, raises IncompleteCommitWalk otherwise"""
+
+    amount_of_commits = 0
+    amount_of_new_commits = 0
+    with open(cache_file, "a", encoding="UTF-8") as file:
+        for commit_data in commits_data:
+            if commit_data["Commit: "] not in cached_commits:
+                file.write(json.dumps(commit_data, ensure_ascii=False, default=to_json_compatible) + "\n")
+                amount_of_new_commits += 1
+            amount_of_commits += 1
+            yield commit_data
+
+        # NOTE: HEAD is written only when all commits were processed, interrupted run does not move it.
+        # NOTE: Failed 'git log' or 'git show' leaves commits out, HEAD is not moved past them either.
+        walk_is_complete = amount_of_commits == amount_of_head_commits
+        if head and walk_is_complete:
+            file.write(json.dumps({CACHE_HEAD_KEY: head}) + "\n")
+
+    logger.info(f"{amount_of_new_commits} new commits were added to {cache_file}")
+    if head and not walk_is_complete:
+        raise IncompleteCommitWalk(f"Collected {amount_of_commits} of {amount_of_head_commits} commits up to {head}, "
+                                   f"HEAD was not recorded in {cache_file}")
+
+
+# NOTE: Lists only hashes of HEAD history, in the same order full 'git log' does.
+HISTORY_ORDER_FILTERS = ["--format=commit %H"]
+
+
+def merge_with_cached_commits(commits_data: Iterable[CommitData], cached_commits: Dict[CommitHash, CommitData],
+                              git_repo: Path) -> Iterator[CommitData]:
+    """Yields walked and cached commits in 'git log' order of HEAD, the same as a run without cache.
+
+    Cached commits, which are not reachable from HEAD anymore, are not yielded.
+    """
+
+    # NOTE: Only commits after cached HEAD are walked, so keeping them in memory is cheap.
+    walked_commits = {commit_data["Commit: "]: commit_data for commit_data in commits_data}
+
+    for commit_hash in get_commits(git_repo, HISTORY_ORDER_FILTERS):
+        commit_data = walked_commits.get(commit_hash, cached_commits.get(commit_hash))
+        if commit_data is None:
+            logger.warning(f"Commit {commit_hash} is neither cached nor walked, it is skipped")
+            continue
+        yield commit_data
+
+
 def create_json_file(data, json_file_name):
     with open(json_file_name, "w", encoding="UTF-8") as file:
-        json.dump(data, file, indent=4, ensure_ascii=False)
+        json.dump(data, file, indent=4, ensure_ascii=False, default=to_json_compatible)
+
+
+def create_json_lines_file(commits_data: Iterable[CommitData], json_file_name) -> int:
+    """Writes every CommitData into separate line as soon as it's received, returns amount of written commits"""
+
+    amount_of_commits = 0
+    with open(json_file_name, "w", encoding="UTF-8") as file:
+        for commit_data in commits_data:
+            file.write(json.dumps(commit_data, ensure_ascii=False, default=to_json_compatible) + "\n")
+            amount_of_commits += 1
+
+    return amount_of_commits
+
+
+def create_json_file_streamed(commits_data: Iterable[CommitData], json_file_name) -> int:
+    """Writes the same JSON object as 'create_json_file', but one commit at a time, returns amount of commits"""
+
+    amount_of_commits = 0
+    with open(json_file_name, "w", encoding="UTF-8") as file:
+        file.write("{")
+        for commit_data in commits_data:
+            key = json.dumps(f"Commit - {commit_data['Commit: ']}", ensure_ascii=False)
+            # NOTE: Nested object is indented one more level, the same way 'json.dump' does it for whole dict.
+            value = json.dumps(commit_data, indent=4, ensure_ascii=False,
+                               default=to_json_compatible).replace("\n", "\n    ")
+            separator = "," if amount_of_commits else ""
+            file.write(f"{separator}\n    {key}: {value}")
+            amount_of_commits += 1
+        file.write("\n}" if amount_of_commits else "}")
+
+    return amount_of_commits
+
+
+OUTPUT_FORMATS = ["json", "json-stream", "jsonl"]
+BACKENDS = ["subprocess", "native"]
+
+
+def write_commits_data(commits_data: Iterable[CommitData], json_file_name, output_format: str) -> int:
+    """Writes commits in chosen output format, returns amount of written commits"""
+
+    if output_format == "jsonl":
+        return create_json_lines_file(commits_data, json_file_name)
+
+    if output_format == "json-stream":
+        return create_json_file_streamed(commits_data, json_file_name)
+
+    all_commits_data = {f"Commit - {commit_data['Commit: ']}": commit_data for commit_data in commits_data}
+    if all_commits_data:
+        create_json_file(all_commits_data, json_file_name)
+    return len(all_commits_data)
 
 
 def parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("-g", "--git-repository", type=Path, required=True,
-                        help="Specify the path to the git repository directory")
+    # NOTE: '@file' arguments are read from file, one argument per line, e.g. '-r @repositories.txt'.
+    parser = argparse.ArgumentParser(fromfile_prefix_chars="@")
+    repository = parser.add_mutually_exclusive_group(required=True)
+    repository.add_argument("-g", "--git-repository", type=Path,
+                            help="Specify the path to the git repository directory")
+    repository.add_argument("-r", "--repositories", nargs="+",
+                            help="Specify paths or glob patterns of git repositories to collect in one batch")
     parser.add_argument("-j", "--json_file", type=Path, default="git_info.json",
                         help="Specify the json file name, where json output will be kept")
+    parser.add_argument("-o", "--output-format", choices=OUTPUT_FORMATS, default="json",
+                        help="'json' - whole object at the end, 'json-stream' - the same object written commit by "
+                             "commit, 'jsonl' - one commit per line written as soon as it's parsed")
     parser.add_argument("-l", "--log-file", default='git_info.log',
                         help="Specify the file name, where logs should be kept")
-    return parser.parse_args()
+    parser.add_argument("-s", "--single-pass", action="store_true",
+                        help="Collect all commits with one streamed 'git log' instead of 'git show' per commit")
+    parser.add_argument("-b", "--backend", choices=BACKENDS, default="subprocess",
+                        help="'subprocess' - run git commands, 'native' - read git objects directly, "
+                             "using 'git show' only for commits it does not support")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Specify the number of 'git show' subprocesses running concurrently")
+    parser.add_argument("-c", "--cache-file", type=Path,
+                        help="Specify the JSONL file, where already extracted commits are cached between runs")
+    parser.add_argument("--since-cached-head", action="store_true",
+                        help="Walk only commits added after HEAD of the previous cached run (requires --cache-file)")
+    parser.add_argument("--rev-range", default="",
+                        help="Specify the revision range to walk, e.g. 'v1.0..HEAD' or branch name")
+    parser.add_argument("--since", default="",
+                        help="Collect only commits newer than given date, e.g. '2024-01-01' or '2 weeks ago'")
+    parser.add_argument("--until", default="",
+                        help="Collect only commits older than given date")
+    parser.add_argument("--author", default="",
+                        help="Collect only commits which author matches given pattern")
+    parser.add_argument("--path", type=Path, action="append", dest="paths",
+                        help="Collect only commits touching given path, relative to git repository (can be repeated)")
+    parser.add_argument("-i", "--index-file", type=Path,
+                        help="Specify the json file, where per-file churn and per-author statistics will be kept "
+                             "(insertions and deletions are counted only per author, not per file)")
+    parser.add_argument("--renames-file", type=Path,
+                        help="Specify the json file, where every renamed path is mapped to its current path")
+    parser.add_argument("--batch-jobs", type=int, default=4,
+                        help="Specify the number of repositories collected concurrently in batch")
+    parser.add_argument("--output-folder", type=Path,
+                        help="Write one file per repository in batch, instead of combined file, where 'jsonl' "
+                             "lines have 'Repository: ' of the commit and 'json' keeps commits by repository")
+    parsed_args = parser.parse_args()
+
+    if parsed_args.since_cached_head and any([parsed_args.rev_range, parsed_args.since, parsed_args.until,
+                                              parsed_args.author, parsed_args.paths]):
+        parser.error("--since-cached-head can not be combined with commit filters")
+
+    if parsed_args.repositories and parsed_args.cache_file:
+        parser.error("--cache-file can not be used with --repositories, cache keeps commits of single repository")
+
+    if parsed_args.repositories and (parsed_args.index_file or parsed_args.renames_file):
+        parser.error("--index-file and --renames-file can not be used with --repositories, "
+                     "they keep files of single repository")
+
+    return parsed_args
 
 
 def configure_logger(filename: str) -> logging.Logger:
@@ -239,23 +818,214 @@ def configure_logger(filename: str) -> logging.Logger:
     return logger
 
 
+def iter_repository_commits(git_repo: Path, options: argparse.Namespace) -> Iterator[CommitData]:
+    """Chooses the backend, filters and cache by given options and yields CommitData of the repository"""
+
+    log_filters = create_git_log_filters(options.rev_range, options.since, options.until, options.author,
+                                         options.paths)
+
+    cached_commits: Dict[CommitHash, CommitData] = {}
+    since_cached_head = False
+    head = ""
+    if options.cache_file:
+        cached_commits, cached_head = load_commit_cache(options.cache_file)
+        head = get_head_commit(git_repo)
+        if options.since_cached_head and cached_head:
+            if is_commit(git_repo, cached_head):
+                since_cached_head = True
+                log_filters = create_git_log_filters(f"{cached_head}..{head or 'HEAD'}")
+            else:
+                logger.warning(f"Cached HEAD {cached_head} does not exist in {git_repo} anymore, walking all commits")
+
+    if options.backend == "native":
+        commits_data = iter_commit_info_native(git_repo, cached_commits, log_filters, options.jobs)
+    elif options.single_pass:
+        commits_data = iter_commit_info_from_git_log(git_repo, log_filters)
+    else:
+        commits_data = iter_commit_info(git_repo, cached_commits, log_filters, options.jobs)
+
+    if options.cache_file:
+        # NOTE: Filtered run does not walk whole HEAD history, so its HEAD is not recorded.
+        cached_run_head = "" if log_filters and not since_cached_head else head
+        amount_of_head_commits = None
+        if cached_run_head:
+            walked_range = log_filters[0] if since_cached_head else cached_run_head
+            amount_of_head_commits = count_commits(git_repo, walked_range)
+        commits_data = cache_commits(commits_data, options.cache_file, cached_commits, cached_run_head,
+                                     amount_of_head_commits)
+
+    if since_cached_head:
+        commits_data = merge_with_cached_commits(commits_data, cached_commits, git_repo)
+
+    return commits_data
+
+
+@dataclass
+class RepositoryResult:
+    git_repo: Path
+    amount_of_commits: int = 0
+    seconds: float = 0.0
+    error: str = ""
+    commits_data: Dict[CommitHash, CommitData] | None = None
+
+
+def expand_repositories(patterns: list[str]) -> list[Path]:
+    """Expands glob patterns of repositories, keeping the given order and dropping duplicates"""
+
+    repositories = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(os.path.expanduser(pattern))) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            logger.warning(f"Pattern {pattern!r} does not match any directory")
+
+        for match in matches:
+            resolved_path = Path(match).resolve()
+            if resolved_path not in seen:
+                seen.add(resolved_path)
+                repositories.append(Path(match))
+
+    return repositories
+
+
+def get_output_file_name(git_repo: Path, output_format: str) -> str:
+    extension = ".jsonl" if output_format == "jsonl" else ".json"
+    return f"{git_repo.resolve().name}{extension}"
+
+
+def collect_repository(git_repo: Path, options: argparse.Namespace, output_folder: Path | None) -> RepositoryResult:
+    """Collects commits of single repository in batch, never raises, errors are kept in result"""
+
+    start_time = time.time()
+    result = RepositoryResult(git_repo)
+
+    try:
+        if not is_git_repo(git_repo):
+            result.error = "not a git repository"
+        elif output_folder is not None:
+            output_file = output_folder / get_output_file_name(git_repo, options.output_format)
+            result.amount_of_commits = write_commits_data(iter_repository_commits(git_repo, options), output_file,
+                                                          options.output_format)
+        else:
+            result.commits_data = {f"Commit - {commit_data['Commit: ']}": commit_data
+                                   for commit_data in iter_repository_commits(git_repo, options)}
+            result.amount_of_commits = len(result.commits_data)
+    except Exception as e:
+        result.error = str(e)
+
+    if not result.error and not result.amount_of_commits:
+        result.error = "no commits were collected"
+
+    result.seconds = time.time() - start_time
+    return result
+
+
+# NOTE: Combined JSONL line has the commit together with the repository it was collected from.
+REPOSITORY_KEY = "Repository: "
+
+
+def write_combined_commits_data(results: list[RepositoryResult], json_file_name, output_format: str) -> int:
+    """Writes commits of all collected repositories into one file in chosen output format, returns amount of commits"""
+
+    collected_results = [result for result in results if not result.error]
+    if output_format == "jsonl":
+        return create_json_lines_file(({REPOSITORY_KEY: str(result.git_repo), **commit_data}
+                                       for result in collected_results
+                                       for commit_data in result.commits_data.values()), json_file_name)
+
+    # NOTE: Commits of every repository are already in memory, 'json-stream' writes the same object as 'json'.
+    combined_data = {str(result.git_repo): result.commits_data for result in collected_results}
+    if combined_data:
+        create_json_file(combined_data, json_file_name)
+    return sum(len(commits_data) for commits_data in combined_data.values())
+
+
+def run_batch(options: argparse.Namespace) -> list[RepositoryResult]:
+    """Collects commits of many repositories concurrently, writing one file per repository or combined file"""
+
+    repositories = expand_repositories(options.repositories)
+    if not repositories:
+        logger.error("No repositories were given")
+        return []
+
+    output_folder = options.output_folder
+    if output_folder is not None:
+        output_file_names = [get_output_file_name(git_repo, options.output_format) for git_repo in repositories]
+        if len(output_file_names) != len(set(output_file_names)):
+            logger.error("Several repositories have the same directory name, their output files would overlap")
+            return []
+        os.makedirs(output_folder, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=max(options.batch_jobs, 1)) as executor:
+        results = list(executor.map(partial(collect_repository, options=options, output_folder=output_folder),
+                                    repositories))
+
+    if output_folder is None:
+        write_combined_commits_data(results, options.json_file, options.output_format)
+
+    for result in results:
+        status = f"ERROR: {result.error}" if result.error else "OK"
+        logger.info(f"{result.git_repo} - {result.amount_of_commits} commits in {result.seconds:.2f}s - {status}")
+
+    failed = [result for result in results if result.error]
+    logger.info(f"Collected {len(results) - len(failed)} of {len(results)} repositories, {len(failed)} failed")
+    return results
+
+
 def main(logger_: logging.Logger):
     logger_.info(" >>> Running the script\n")
 
+    if args.repositories:
+        results = run_batch(args)
+        if not results or all(result.error for result in results):
+            sys.exit(1)
+
+        output = args.output_folder if args.output_folder is not None else args.json_file
+        logger_.info(f" >>> Was generated {output} in {os.getcwd()} directory")
+        return
+
     git_repository = is_git_repo(args.git_repository)
     if not git_repository:
         sys.exit(1)
 
-    commits_data = get_commit_info(args.git_repository)
-    if not commits_data:
-        sys.exit(1)
+    commits_data = iter_repository_commits(args.git_repository, args)
+
+    churn_index = ChurnIndex()
+    if args.index_file:
+        commits_data = index_commits(commits_data, churn_index)
+
+    rename_table = RenameTable()
+    if args.renames_file:
+        commits_data = track_renames(commits_data, rename_table)
 
     try:
-        create_json_file(commits_data, args.json_file)
+        amount_of_commits = write_commits_data(commits_data, args.json_file, args.output_format)
+    except IncompleteCommitWalk as e:
+        logger_.error(f"Not all commits were collected: \n{e}")
+        sys.exit(1)
     except Exception as e:
         logger_.error(f"Error occurred trying write {args.json_file}: \n{e}")
         sys.exit(1)
 
+    if not amount_of_commits:
+        sys.exit(1)
+
+    if args.index_file:
+        try:
+            create_index_file(churn_index, args.index_file)
+        except Exception as e:
+            logger_.error(f"Error occurred trying write {args.index_file}: \n{e}")
+            sys.exit(1)
+        logger_.info(f" >>> Was generated {args.index_file} index file")
+
+    if args.renames_file:
+        try:
+            create_renames_file(rename_table, args.renames_file)
+        except Exception as e:
+            logger_.error(f"Error occurred trying write {args.renames_file}: \n{e}")
+            sys.exit(1)
+        logger_.info(f" >>> Was generated {args.renames_file} renames file")
+
     logger_.info(f" >>> Was generated {args.json_file} file in {os.getcwd()} directory")
 
 
@@ -0,0 +1,254 @@
+import json
+import logging
+import os
+import re
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+CommitData = dict
+GIT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S %z"
+# NOTE: Pattern used for simplifying complex renamed or modified file path into two paths.
+RENAMED_PATH_PATTERN = re.compile(r'{(.*?)\s*=>\s*(.*?)}')
+RENAME_SEPARATOR = " => "
+
+
+def parse_git_date(date: str) -> datetime | None:
+    """Parses '--date=iso8601' date, returns None for empty or damaged date"""
+
+    try:
+        return datetime.strptime(date, GIT_DATE_FORMAT)
+    except ValueError:
+        return None
+
+
+def process_renamed_string(line: str):
+    """Process the renamed file line, returns full old and new file names"""
+
+    # NOTE: Paths without common directory are shown as 'old => new', without "{}".
+    if "{" not in line and RENAME_SEPARATOR in line:
+        old_file, new_file = line.split(RENAME_SEPARATOR, 1)
+    else:
+        old_file, new_file = RENAMED_PATH_PATTERN.sub(r'\1', line), RENAMED_PATH_PATTERN.sub(r'\2', line)
+    old_file_name = os.path.basename(old_file.strip())
+    new_file_name = os.path.basename(new_file.strip())
+    return old_file, new_file, new_file_name, old_file_name
+
+
+def get_renamed_file_pairs(renamed_files: dict[str, str]) -> list[tuple[str, str]]:
+    """Pairs 'Renamed_files: ' entries into (old path, new path) tuples.
+
+    Every rename is stored as "new_'x'_name" key followed by "old_'x'_name" key.
+    """
+
+    renamed_file_pairs = []
+    new_path = ""
+    for key, path in renamed_files.items():
+        if key.startswith("new_"):
+            new_path = path
+        elif key.startswith("old_") and new_path:
+            renamed_file_pairs.append((path, new_path))
+            new_path = ""
+
+    return renamed_file_pairs
+
+
+def split_changed_files(changed_files: list[str]) -> tuple[list[str], list[tuple[str, str]]]:
+    """Splits 'Changed_files: ' into current paths and (old path, new path) tuples of renamed files.
+
+    Renamed files without common directory are kept as 'old => new' text, even if they were modified.
+    """
+
+    paths = []
+    renamed_file_pairs = []
+    for changed_file in changed_files:
+        if RENAME_SEPARATOR in changed_file:
+            old_path, new_path, *_ = process_renamed_string(changed_file)
+            renamed_file_pairs.append((old_path, new_path))
+            paths.append(new_path)
+        else:
+            paths.append(changed_file)
+
+    return paths, renamed_file_pairs
+
+
+def get_renamed_paths(commit_data: CommitData) -> list[tuple[str, str]]:
+    """Returns (old path, new path) of every file renamed by the commit.
+
+    Commits collected before 'Renamed_paths: ' was added have pairs recovered from 'Renamed_files: ' and from
+    'old => new' of 'Changed_files: '. Such pairs miss renames of files with the same name and modified renames
+    within common directory.
+    """
+
+    if "Renamed_paths: " in commit_data:
+        return [(old_path, new_path) for old_path, new_path in commit_data["Renamed_paths: "]]
+
+    _, renamed_file_pairs = split_changed_files(commit_data.get("Changed_files: ", []))
+    return get_renamed_file_pairs(commit_data.get("Renamed_files: ", {})) + renamed_file_pairs
+
+
+class ChurnIndex:
+    """Aggregates per-file and per-author statistics while commits are streamed.
+
+    Files are counted under the path they had in the commit, current files get their whole rename chain. Commit
+    statistics don't split insertions and deletions by file, so they are counted only per author.
+    """
+
+    def __init__(self):
+        self.files: dict[str, dict] = defaultdict(lambda: {"changes": 0, "last_changed": "", "authors": {}})
+        self.authors: dict[str, dict] = defaultdict(
+            lambda: {"commits": 0, "insertions": 0, "deletions": 0, "changed_files": 0}
+        )
+        self.rename_table = RenameTable()
+        self.latest_dates: dict[str, datetime] = {}
+        self.amount_of_commits = 0
+
+    def add(self, commit_data: CommitData):
+        author = commit_data.get("Author: ", "")
+        date = commit_data.get("Date: ", "")
+        parsed_date = parse_git_date(date)
+        renamed_paths = get_renamed_paths(commit_data)
+        self.rename_table.add_renames(renamed_paths, parsed_date)
+
+        # NOTE: Renamed files without modifications are not in 'Changed_files: ', but they are touched too.
+        changed_files, _ = split_changed_files(commit_data.get("Changed_files: ", []))
+        touched_files = list(dict.fromkeys(changed_files + [new_path for _, new_path in renamed_paths]))
+
+        for path in touched_files:
+            file_statistics = self.files[path]
+            file_statistics["changes"] += 1
+            file_statistics["authors"][author] = file_statistics["authors"].get(author, 0) + 1
+
+            if parsed_date is not None and (path not in self.latest_dates or parsed_date > self.latest_dates[path]):
+                self.latest_dates[path] = parsed_date
+                file_statistics["last_changed"] = date
+
+        author_statistics = self.authors[author]
+        author_statistics["commits"] += 1
+        author_statistics["insertions"] += commit_data.get("Insertions: ", 0)
+        author_statistics["deletions"] += commit_data.get("Deletions: ", 0)
+        author_statistics["changed_files"] += len(touched_files)
+        self.amount_of_commits += 1
+
+    def to_dict(self) -> dict:
+        files = {}
+        for path, file_statistics in self.files.items():
+            files[path] = dict(file_statistics)
+            previous_paths = self.rename_table.get_previous_paths(path)
+            if previous_paths:
+                files[path]["renamed_from"] = previous_paths
+
+        return {
+            "commits": self.amount_of_commits,
+            "files": files,
+            "authors": dict(self.authors),
+        }
+
+    def most_changed_files(self, amount: int = 10) -> list[tuple[str, int]]:
+        changes = [(path, file_statistics["changes"]) for path, file_statistics in self.files.items()]
+        return sorted(changes, key=lambda change: change[1], reverse=True)[:amount]
+
+
+class RenameTable:
+    """Table of renamed paths, every path a file ever had resolves to its current path.
+
+    Commits can be added in any order, renames are replayed in commit date order when the table is read. A path can
+    be reused by another file after a rename, such path resolves to the file, which had it the last.
+    """
+
+    def __init__(self):
+        # NOTE: Renames of every commit are kept together, files of one commit are renamed at the same time.
+        self.commits_renames: list[tuple[datetime | None, int, list[tuple[str, str]]]] = []
+        self.previous_paths: dict[str, list[str]] | None = None
+        self.canonical_paths: dict[str, str] | None = None
+
+    def add_renames(self, renamed_paths: list[tuple[str, str]], date: datetime | None):
+        if renamed_paths:
+            self.commits_renames.append((date, len(self.commits_renames), renamed_paths))
+            self.previous_paths = None
+            self.canonical_paths = None
+
+    def add(self, commit_data: CommitData):
+        self.add_renames(get_renamed_paths(commit_data), parse_git_date(commit_data.get("Date: ", "")))
+
+    def replay(self):
+        """Follows every file through renames, from the oldest commit to the newest one"""
+
+        # NOTE: Commits without date are treated as the oldest ones. Commits are added newest first ('git log'
+        # order), so commits with the same date are replayed in reverse order of adding.
+        commits_renames = sorted(self.commits_renames, key=lambda commit_renames: (
+            commit_renames[0] is not None, commit_renames[0] or datetime.min, -commit_renames[1]))
+
+        # NOTE: Paths the file at current path had before, oldest first, with the number of rename which ended them.
+        previous_paths: dict[str, list[tuple[str, int]]] = {}
+        rename_number = 0
+        for _, _, renamed_paths in commits_renames:
+            moved_files = []
+            for old_path, new_path in renamed_paths:
+                moved_files.append((new_path, previous_paths.pop(old_path, []) + [(old_path, rename_number)]))
+                rename_number += 1
+            for new_path, paths in moved_files:
+                previous_paths[new_path] = paths
+
+        # NOTE: Path used by several files in turn resolves to the one, which used it the last.
+        canonical_paths: dict[str, tuple[str, int]] = {}
+        for current_path, paths in previous_paths.items():
+            for path, number in paths:
+                if path != current_path and (path not in canonical_paths or canonical_paths[path][1] < number):
+                    canonical_paths[path] = (current_path, number)
+
+        self.previous_paths = {current_path: [path for path, _ in paths if path != current_path]
+                               for current_path, paths in previous_paths.items()}
+        self.canonical_paths = {path: current_path for path, (current_path, _) in canonical_paths.items()}
+
+    def resolve(self, path: str) -> str:
+        """Returns the current path of the file, the same path if it was never renamed"""
+
+        if self.canonical_paths is None:
+            self.replay()
+        return self.canonical_paths.get(path, path)
+
+    def get_previous_paths(self, path: str) -> list[str]:
+        """Returns the rename chain of the file at current path, oldest path first"""
+
+        if self.previous_paths is None:
+            self.replay()
+        return self.previous_paths.get(path, [])
+
+    def to_dict(self) -> dict[str, str]:
+        """Flattened table of every renamed path to its current path, lookup without any walking"""
+
+        if self.canonical_paths is None:
+            self.replay()
+        return dict(self.canonical_paths)
+
+
+def index_commits(commits_data: Iterable[CommitData], churn_index: ChurnIndex) -> Iterator[CommitData]:
+    """Passes CommitData through, adding every commit to the index"""
+
+    for commit_data in commits_data:
+        churn_index.add(commit_data)
+        yield commit_data
+
+
+def track_renames(commits_data: Iterable[CommitData], rename_table: RenameTable) -> Iterator[CommitData]:
+    """Passes CommitData through, adding renamed files of every commit to the rename table"""
+
+    for commit_data in commits_data:
+        rename_table.add(commit_data)
+        yield commit_data
+
+
+def create_renames_file(rename_table: RenameTable, renames_file_name: Path):
+    with open(renames_file_name, "w", encoding="UTF-8") as file:
+        json.dump(rename_table.to_dict(), file, indent=4, ensure_ascii=False)
+
+
+def create_index_file(churn_index: ChurnIndex, index_file_name: Path):
+    """Writes index as compact JSON, so it's quick to load for queries"""
+
+    with open(index_file_name, "w", encoding="UTF-8") as file:
+        json.dump(churn_index.to_dict(), file, ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,880 @@
+import heapq
+import logging
+import mmap
+import sys
+import zlib
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+OBJECT_TYPES = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+DECOMPRESS_CHUNK_SIZE = 64 * 1024
+OFS_DELTA = 6
+REF_DELTA = 7
+
+TREE_MODE = "40000"
+SUBMODULE_MODE = "160000"
+
+# NOTE: Git treats file as binary, if there is NUL byte in its first 8000 bytes.
+BINARY_CHECK_LENGTH = 8000
+# NOTE: Constants of git's xdiff, counts of changed lines depend on them.
+MAX_EQUAL_LIMIT = 1024
+SIMILAR_SCAN_WINDOW = 100
+KEEP_DISCARDED_RUN = 4
+SNAKE_COUNT = 20
+HEURISTIC_MIN_COST = 256
+HEURISTIC_FACTOR = 4
+MIN_MAX_COST = 256
+LINE_MAX = sys.maxsize
+# NOTE: Longer names could be shortened with '...' in '--stat=350' output.
+MAX_STAT_NAME_LENGTH = 200
+EMPTY_TREE = ""
+
+
+class UnsupportedObjectStore(Exception):
+    """Raised when repository or commit uses git feature, which is not implemented by the native reader"""
+
+
+# NOTE: Damaged or unexpected object store makes the reader fail with these, instead of UnsupportedObjectStore.
+READER_ERRORS = (OSError, ValueError, KeyError, IndexError, zlib.error)
+
+
+def find_git_directory(git_repo: Path) -> Path:
+    """Returns '.git' directory of working tree or the repository itself, if it's bare"""
+
+    git_directory = git_repo / ".git"
+    if git_directory.is_file():
+        raise UnsupportedObjectStore(f"{git_directory} is a 'gitdir' link (worktree or submodule)")
+
+    if git_directory.is_dir():
+        return git_directory
+
+    if (git_repo / "HEAD").is_file() and (git_repo / "objects").is_dir():
+        return git_repo
+
+    raise UnsupportedObjectStore(f"Could not find git directory in {git_repo}")
+
+
+def check_repository_is_supported(git_directory: Path):
+    """Raises UnsupportedObjectStore for repositories, which history can not be read only from own objects"""
+
+    unsupported_files = ["shallow", "info/grafts", "info/attributes", "objects/info/alternates", "refs/replace"]
+    for unsupported_file in unsupported_files:
+        if (git_directory / unsupported_file).exists():
+            raise UnsupportedObjectStore(f"Repository uses '{unsupported_file}'")
+
+    config_file = git_directory / "config"
+    config = config_file.read_text(encoding="UTF-8", errors="replace").lower() if config_file.is_file() else ""
+    for unsupported_option in ["objectformat", "mailmap", "quotepath", "replace"]:
+        if unsupported_option in config:
+            raise UnsupportedObjectStore(f"Repository config uses '{unsupported_option}'")
+
+
+def read_variable_length_size(data, position: int) -> tuple[int, int]:
+    """Reads delta header size (7 bits per byte, little-endian), returns size and position after it"""
+
+    size = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        size |= (byte & 0x7f) << shift
+        shift += 7
+        if not byte & 0x80:
+            return size, position
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """Rebuilds object from its base and pack delta instructions"""
+
+    base_size, position = read_variable_length_size(delta, 0)
+    result_size, position = read_variable_length_size(delta, position)
+    if base_size != len(base):
+        raise UnsupportedObjectStore("Delta base size does not match")
+
+    result = bytearray()
+    while position < len(delta):
+        instruction = delta[position]
+        position += 1
+
+        if instruction & 0x80:
+            offset = 0
+            size = 0
+            for bit in range(4):
+                if instruction & (1 << bit):
+                    offset |= delta[position] << (bit * 8)
+                    position += 1
+            for bit in range(3):
+                if instruction & (1 << (bit + 4)):
+                    size |= delta[position] << (bit * 8)
+                    position += 1
+            if size == 0:
+                size = 0x10000
+            result += base[offset:offset + size]
+        elif instruction:
+            result += delta[position:position + instruction]
+            position += instruction
+        else:
+            raise UnsupportedObjectStore("Invalid delta instruction")
+
+    if len(result) != result_size:
+        raise UnsupportedObjectStore("Delta result size does not match")
+    return bytes(result)
+
+
+class PackFile:
+    """Version 2 pack index and its pack file, both memory mapped"""
+
+    def __init__(self, index_file: Path):
+        with open(index_file, "rb") as file:
+            self.index = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(index_file.with_suffix(".pack"), "rb") as file:
+            self.pack = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.index[:8] != b"\xfftOc\x00\x00\x00\x02":
+            raise UnsupportedObjectStore(f"{index_file} is not version 2 pack index")
+
+        self.amount_of_objects = int.from_bytes(self.index[8 + 255 * 4:8 + 256 * 4], "big")
+        self.hashes_start = 8 + 256 * 4
+        self.offsets_start = self.hashes_start + self.amount_of_objects * 24
+        self.large_offsets_start = self.offsets_start + self.amount_of_objects * 4
+
+    def find_offset(self, object_hash: bytes) -> int | None:
+        """Binary search of object hash in pack index, returns object offset in pack file"""
+
+        first_byte = object_hash[0]
+        low = int.from_bytes(self.index[8 + (first_byte - 1) * 4:8 + first_byte * 4], "big") if first_byte else 0
+        high = int.from_bytes(self.index[8 + first_byte * 4:8 + (first_byte + 1) * 4], "big")
+
+        while low < high:
+            middle = (low + high) // 2
+            middle_start = self.hashes_start + middle * 20
+            middle_hash = self.index[middle_start:middle_start + 20]
+            if middle_hash < object_hash:
+                low = middle + 1
+            elif middle_hash > object_hash:
+                high = middle
+            else:
+                offset_start = self.offsets_start + middle * 4
+                offset = int.from_bytes(self.index[offset_start:offset_start + 4], "big")
+                if offset & 0x80000000:
+                    large_offset_start = self.large_offsets_start + (offset & 0x7fffffff) * 8
+                    offset = int.from_bytes(self.index[large_offset_start:large_offset_start + 8], "big")
+                return offset
+        return None
+
+    def decompress(self, position: int, size: int) -> bytes:
+        """Decompresses zlib stream starting at position, reading only as much of the pack as needed"""
+
+        decompressor = zlib.decompressobj()
+        # NOTE: Compressed data is usually smaller than decompressed, first chunk is enough in most cases.
+        chunk_size = size + 64
+        data = b""
+        while not decompressor.eof:
+            chunk = self.pack[position:position + chunk_size]
+            if not chunk:
+                raise UnsupportedObjectStore("Pack file ends in the middle of object")
+            data += decompressor.decompress(chunk)
+            position += chunk_size
+            chunk_size = DECOMPRESS_CHUNK_SIZE
+        return data
+
+    def read_entry(self, offset: int) -> tuple[int, bytes, int | bytes | None]:
+        """Reads pack entry, returns its type, data and delta base (pack offset or object hash) if it's a delta"""
+
+        byte = self.pack[offset]
+        position = offset + 1
+        object_type = (byte >> 4) & 0x7
+        size = byte & 0x0f
+        shift = 4
+        while byte & 0x80:
+            byte = self.pack[position]
+            position += 1
+            size |= (byte & 0x7f) << shift
+            shift += 7
+
+        base = None
+        if object_type == OFS_DELTA:
+            byte = self.pack[position]
+            position += 1
+            base_distance = byte & 0x7f
+            while byte & 0x80:
+                byte = self.pack[position]
+                position += 1
+                base_distance = ((base_distance + 1) << 7) | (byte & 0x7f)
+            base = offset - base_distance
+        elif object_type == REF_DELTA:
+            base = bytes(self.pack[position:position + 20])
+            position += 20
+
+        return object_type, self.decompress(position, size), base
+
+
+class GitObjectReader:
+    """Reads commits, trees and blobs directly from loose objects and pack files of git repository"""
+
+    def __init__(self, git_repo: Path, cache_size: int = 4096):
+        self.git_directory = find_git_directory(git_repo)
+        check_repository_is_supported(self.git_directory)
+        self.objects_directory = self.git_directory / "objects"
+        self.packs = [PackFile(index_file) for index_file in sorted((self.objects_directory / "pack").glob("*.idx"))]
+        # NOTE: Keys are object hashes or (pack number, offset) of resolved delta bases.
+        self.cache: OrderedDict[str | tuple[int, int], tuple[str, bytes]] = OrderedDict()
+        self.cache_size = cache_size
+
+    def resolve_reference(self, reference: str = "HEAD") -> str:
+        """Follows symbolic references to the commit hash, using loose refs and 'packed-refs'"""
+
+        for _ in range(10):
+            reference_file = self.git_directory / reference
+            if reference_file.is_file():
+                value = reference_file.read_text(encoding="UTF-8").strip()
+            else:
+                value = self.find_packed_reference(reference)
+
+            if not value.startswith("ref: "):
+                if len(value) != 40:
+                    raise UnsupportedObjectStore(f"Could not resolve {reference}")
+                return value
+            reference = value[len("ref: "):]
+
+        raise UnsupportedObjectStore(f"Too deep symbolic reference {reference}")
+
+    def find_packed_reference(self, reference: str) -> str:
+        packed_references = self.git_directory / "packed-refs"
+        if not packed_references.is_file():
+            return ""
+
+        for line in packed_references.read_text(encoding="UTF-8").splitlines():
+            if line.startswith(("#", "^")):
+                continue
+            object_hash, _, name = line.partition(" ")
+            if name == reference:
+                return object_hash
+        return ""
+
+    def read_object(self, object_hash: str) -> tuple[str, bytes]:
+        """Returns type and content of the object"""
+
+        git_object = self.get_cached(object_hash)
+        if git_object is not None:
+            return git_object
+
+        git_object = self.read_loose_object(object_hash) or self.read_packed_object(object_hash)
+        if git_object is None:
+            raise UnsupportedObjectStore(f"Object {object_hash} was not found")
+
+        # NOTE: Commits and trees are read again and again while walking history, blobs mostly once.
+        if git_object[0] != "blob":
+            self.add_to_cache(object_hash, git_object)
+        return git_object
+
+    def get_cached(self, key: str | tuple[int, int]) -> tuple[str, bytes] | None:
+        git_object = self.cache.get(key)
+        if git_object is not None:
+            self.cache.move_to_end(key)
+        return git_object
+
+    def add_to_cache(self, key: str | tuple[int, int], git_object: tuple[str, bytes]):
+        self.cache[key] = git_object
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def read_loose_object(self, object_hash: str) -> tuple[str, bytes] | None:
+        object_file = self.objects_directory / object_hash[:2] / object_hash[2:]
+        if not object_file.is_file():
+            return None
+
+        data = zlib.decompress(object_file.read_bytes())
+        header, _, content = data.partition(b"\0")
+        object_type, _ = header.decode().split(" ")
+        return object_type, content
+
+    def read_packed_object(self, object_hash: str) -> tuple[str, bytes] | None:
+        binary_hash = bytes.fromhex(object_hash)
+        for pack_number, pack in enumerate(self.packs):
+            offset = pack.find_offset(binary_hash)
+            if offset is not None:
+                return self.read_pack_entry(pack_number, offset)
+        return None
+
+    def read_pack_entry(self, pack_number: int, offset: int) -> tuple[str, bytes]:
+        """Reads pack entry, resolving its delta chain"""
+
+        git_object = self.get_cached((pack_number, offset))
+        if git_object is not None:
+            return git_object
+
+        object_type, data, base = self.packs[pack_number].read_entry(offset)
+        if object_type == OFS_DELTA:
+            base_type, base_data = self.read_pack_entry(pack_number, base)
+            git_object = base_type, apply_delta(base_data, data)
+        elif object_type == REF_DELTA:
+            base_type, base_data = self.read_object(base.hex())
+            git_object = base_type, apply_delta(base_data, data)
+        else:
+            git_object = OBJECT_TYPES[object_type], data
+
+        # NOTE: Delta bases are shared by many objects, resolved ones are kept to not rebuild whole chain again.
+        self.add_to_cache((pack_number, offset), git_object)
+        return git_object
+
+    def read_commit(self, commit_hash: str) -> dict:
+        """Parses commit object into its headers, list of parents and message"""
+
+        object_type, data = self.read_object(commit_hash)
+        if object_type != "commit":
+            raise UnsupportedObjectStore(f"{commit_hash} is {object_type}, not a commit")
+
+        header, _, message = data.partition(b"\n\n")
+        commit = {"parents": [], "message": message}
+        for line in header.split(b"\n"):
+            if line.startswith(b" "):
+                continue
+            key, _, value = line.partition(b" ")
+            if key == b"parent":
+                commit["parents"].append(value.decode())
+            else:
+                commit.setdefault(key.decode(), value)
+        return commit
+
+    def read_tree(self, tree_hash: str) -> list[tuple[str, bytes, str]]:
+        """Returns tree entries (mode, name, object hash) in the order git stores them"""
+
+        if tree_hash == EMPTY_TREE:
+            return []
+
+        object_type, data = self.read_object(tree_hash)
+        if object_type != "tree":
+            raise UnsupportedObjectStore(f"{tree_hash} is {object_type}, not a tree")
+
+        entries = []
+        position = 0
+        while position < len(data):
+            space = data.index(b" ", position)
+            nul = data.index(b"\0", space)
+            mode = data[position:space].decode()
+            entries.append((mode, data[space + 1:nul], data[nul + 1:nul + 21].hex()))
+            position = nul + 21
+        return entries
+
+    def iter_commit_hashes(self, head: str) -> Iterator[str]:
+        """Walks history from given commit newest first, the same order plain 'git log' uses"""
+
+        counter = 0
+        seen = {head}
+        queue = [(-self.get_commit_time(head), counter, head)]
+
+        while queue:
+            _, _, commit_hash = heapq.heappop(queue)
+            yield commit_hash
+
+            for parent in self.read_commit(commit_hash)["parents"]:
+                if parent in seen:
+                    continue
+                seen.add(parent)
+                counter += 1
+                heapq.heappush(queue, (-self.get_commit_time(parent), counter, parent))
+
+    def get_commit_time(self, commit_hash: str) -> int:
+        *_, timestamp, _ = self.read_commit(commit_hash)["committer"].split(b" ")
+        return int(timestamp)
+
+    def diff_trees(self, old_tree: str, new_tree: str, prefix: bytes = b"") -> list[tuple[str, str, str, str, str]]:
+        """Compares two trees recursively, skipping equal subtrees.
+
+        Returns changes (status, path, old hash, new hash, new mode) in git path order.
+        """
+
+        old_entries = {self.get_sort_name(mode, name): (mode, name, object_hash)
+                       for mode, name, object_hash in self.read_tree(old_tree)}
+        new_entries = {self.get_sort_name(mode, name): (mode, name, object_hash)
+                       for mode, name, object_hash in self.read_tree(new_tree)}
+
+        changes = []
+        for sort_name in sorted(old_entries.keys() | new_entries.keys()):
+            old_mode, name, old_hash = old_entries.get(sort_name, ("", b"", ""))
+            new_mode, new_name, new_hash = new_entries.get(sort_name, ("", b"", ""))
+            name = name or new_name
+            path = prefix + name
+
+            if old_hash == new_hash and old_mode == new_mode:
+                continue
+
+            if SUBMODULE_MODE in (old_mode, new_mode):
+                raise UnsupportedObjectStore(f"Submodule {path!r} is changed")
+
+            if TREE_MODE in (old_mode, new_mode):
+                changes.extend(self.diff_trees(old_hash if old_mode == TREE_MODE else EMPTY_TREE,
+                                               new_hash if new_mode == TREE_MODE else EMPTY_TREE, path + b"/"))
+                continue
+
+            if old_mode and new_mode and old_mode[:2] != new_mode[:2]:
+                raise UnsupportedObjectStore(f"File type of {path!r} is changed")
+
+            status = "M" if old_mode and new_mode else ("D" if old_mode else "A")
+            changes.append((status, decode_path(path), old_hash, new_hash, new_mode or old_mode))
+
+        return changes
+
+    @staticmethod
+    def get_sort_name(mode: str, name: bytes) -> bytes:
+        # NOTE: Git sorts directories as if their name ends with '/'.
+        return name + b"/" if mode == TREE_MODE else name
+
+
+def decode_path(path: bytes) -> str:
+    """Decodes path, raising UnsupportedObjectStore if git would quote it in '--stat' output"""
+
+    if any(byte < 0x20 or byte >= 0x7f or byte in b'"\\' for byte in path):
+        raise UnsupportedObjectStore(f"Path {path!r} would be quoted by git")
+    if len(path) > MAX_STAT_NAME_LENGTH:
+        raise UnsupportedObjectStore(f"Path {path!r} could be shortened by git")
+    return path.decode()
+
+
+def split_lines(data: bytes) -> list[bytes]:
+    """Splits data into lines the same way git does, only by '\\n', keeping it at the end of the line"""
+
+    lines = [line + b"\n" for line in data.split(b"\n")]
+    lines[-1] = lines[-1][:-1]
+    if not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def count_changed_lines(old_data: bytes, new_data: bytes) -> tuple[int, int]:
+    """Counts inserted and deleted lines the same way git's xdiff does for '--stat'.
+
+    Git's diff is not always minimal: before Myers algorithm it discards lines without a pair in the other file and
+    some lines with many pairs, and for expensive diffs it splits at good enough snakes instead of the best ones.
+    """
+
+    old_lines = split_lines(old_data)
+    new_lines = split_lines(new_data)
+
+    # NOTE: The same as xdiff classes, equal lines get the same number, which is counted in both files.
+    classes: dict[bytes, int] = {}
+    old_hashes = [classes.setdefault(line, len(classes)) for line in old_lines]
+    new_hashes = [classes.setdefault(line, len(classes)) for line in new_lines]
+    old_counts = Counter(old_hashes)
+    new_counts = Counter(new_hashes)
+
+    start = 0
+    limit = min(len(old_hashes), len(new_hashes))
+    while start < limit and old_hashes[start] == new_hashes[start]:
+        start += 1
+    trimmed_end = 0
+    while trimmed_end < limit - start and old_hashes[-1 - trimmed_end] == new_hashes[-1 - trimmed_end]:
+        trimmed_end += 1
+
+    old_changed = [False] * len(old_hashes)
+    new_changed = [False] * len(new_hashes)
+    old_records = discard_records(old_hashes, start, len(old_hashes) - trimmed_end, new_counts, old_changed)
+    new_records = discard_records(new_hashes, start, len(new_hashes) - trimmed_end, old_counts, new_changed)
+
+    mark_changed_records(old_records, new_records, old_changed, new_changed)
+    return sum(new_changed), sum(old_changed)
+
+
+def bogus_square_root(number: int) -> int:
+    """Approximation of square root used by xdiff, the power of two above it"""
+
+    result = 1
+    while number > 0:
+        number >>= 2
+        result <<= 1
+    return result
+
+
+def discard_records(hashes: list[int], start: int, end: int, other_counts: Counter,
+                    changed: list[bool]) -> list[tuple[int, int]]:
+    """Marks lines, which are surely changed, and returns (index, hash) of lines left for Myers algorithm.
+
+    Lines without a pair in the other file are changed. Lines with many pairs are also discarded, when they are
+    mostly surrounded by discarded lines (the same as 'xdl_cleanup_records').
+    """
+
+    many_matches_limit = min(bogus_square_root(len(hashes)), MAX_EQUAL_LIMIT)
+    discards = {}
+    for index in range(start, end):
+        matches = other_counts[hashes[index]]
+        discards[index] = 0 if not matches else (2 if matches >= many_matches_limit else 1)
+
+    records = []
+    for index in range(start, end):
+        if discards[index] == 1 or (discards[index] == 2 and not is_mostly_discarded(discards, index, start, end - 1)):
+            records.append((index, hashes[index]))
+        else:
+            changed[index] = True
+    return records
+
+
+def is_mostly_discarded(discards: dict[int, int], index: int, start: int, end: int) -> bool:
+    """Checks whether line with many pairs is inside of run of discarded lines (the same as 'xdl_clean_mmatch')"""
+
+    start = max(start, index - SIMILAR_SCAN_WINDOW)
+    end = min(end, index + SIMILAR_SCAN_WINDOW)
+
+    discarded_before = 0
+    many_matches_before = 1
+    position = index - 1
+    while position >= start and discards[position] != 1:
+        if discards[position]:
+            many_matches_before += 1
+        else:
+            discarded_before += 1
+        position -= 1
+    if not discarded_before:
+        return False
+
+    discarded_after = 0
+    many_matches_after = 1
+    position = index + 1
+    while position <= end and discards[position] != 1:
+        if discards[position]:
+            many_matches_after += 1
+        else:
+            discarded_after += 1
+        position += 1
+    if not discarded_after:
+        return False
+
+    discarded = discarded_before + discarded_after
+    many_matches = many_matches_before + many_matches_after
+    return many_matches * KEEP_DISCARDED_RUN < many_matches + discarded
+
+
+def mark_changed_records(old_records: list[tuple[int, int]], new_records: list[tuple[int, int]],
+                         old_changed: list[bool], new_changed: list[bool]):
+    """Divides records by middle snakes until one side of the box is empty (the same as 'xdl_recs_cmp')"""
+
+    old_hashes = [record_hash for _, record_hash in old_records]
+    new_hashes = [record_hash for _, record_hash in new_records]
+    max_cost = max(bogus_square_root(len(old_records) + len(new_records) + 3), MIN_MAX_COST)
+
+    # NOTE: Boxes are processed in the same order as recursion would, the order does not change the result.
+    boxes = [(0, len(old_hashes), 0, len(new_hashes), False)]
+    while boxes:
+        old_start, old_end, new_start, new_end, need_minimal = boxes.pop()
+        while old_start < old_end and new_start < new_end and old_hashes[old_start] == new_hashes[new_start]:
+            old_start += 1
+            new_start += 1
+        while old_start < old_end and new_start < new_end and old_hashes[old_end - 1] == new_hashes[new_end - 1]:
+            old_end -= 1
+            new_end -= 1
+
+        if old_start == old_end:
+            for position in range(new_start, new_end):
+                new_changed[new_records[position][0]] = True
+        elif new_start == new_end:
+            for position in range(old_start, old_end):
+                old_changed[old_records[position][0]] = True
+        else:
+            old_split, new_split, minimal_low, minimal_high = split_records(
+                old_hashes, old_start, old_end, new_hashes, new_start, new_end, need_minimal, max_cost)
+            boxes.append((old_split, old_end, new_split, new_end, minimal_high))
+            boxes.append((old_start, old_split, new_start, new_split, minimal_low))
+
+
+def split_records(old_hashes: list[int], old_start: int, old_end: int, new_hashes: list[int], new_start: int,
+                  new_end: int, need_minimal: bool, max_cost: int) -> tuple[int, int, bool, bool]:
+    """Finds where to split the box, returns split point and whether both parts need minimal diff.
+
+    Port of 'xdl_split': searches middle snake from both ends, but gives up on expensive diffs, taking a long
+    enough snake or the furthest reaching path instead.
+    """
+
+    diagonal_min = old_start - new_end
+    diagonal_max = old_end - new_start
+    forward_middle = old_start - new_start
+    backward_middle = old_end - new_end
+    odd = (forward_middle - backward_middle) & 1
+    forward_min = forward_max = forward_middle
+    backward_min = backward_max = backward_middle
+    forward = {forward_middle: old_start}
+    backward = {backward_middle: old_end}
+
+    cost = 0
+    while True:
+        cost += 1
+        got_snake = False
+
+        if forward_min > diagonal_min:
+            forward_min -= 1
+            forward[forward_min - 1] = -1
+        else:
+            forward_min += 1
+        if forward_max < diagonal_max:
+            forward_max += 1
+            forward[forward_max + 1] = -1
+        else:
+            forward_max -= 1
+
+        for diagonal in range(forward_max, forward_min - 1, -2):
+            if forward[diagonal - 1] >= forward[diagonal + 1]:
+                old_index = forward[diagonal - 1] + 1
+            else:
+                old_index = forward[diagonal + 1]
+            snake_start = old_index
+            new_index = old_index - diagonal
+            while old_index < old_end and new_index < new_end and old_hashes[old_index] == new_hashes[new_index]:
+                old_index += 1
+                new_index += 1
+            if old_index - snake_start > SNAKE_COUNT:
+                got_snake = True
+            forward[diagonal] = old_index
+            if odd and backward_min <= diagonal <= backward_max and backward[diagonal] <= old_index:
+                return old_index, new_index, True, True
+
+        if backward_min > diagonal_min:
+            backward_min -= 1
+            backward[backward_min - 1] = LINE_MAX
+        else:
+            backward_min += 1
+        if backward_max < diagonal_max:
+            backward_max += 1
+            backward[backward_max + 1] = LINE_MAX
+        else:
+            backward_max -= 1
+
+        for diagonal in range(backward_max, backward_min - 1, -2):
+            if backward[diagonal - 1] < backward[diagonal + 1]:
+                old_index = backward[diagonal - 1]
+            else:
+                old_index = backward[diagonal + 1] - 1
+            snake_start = old_index
+            new_index = old_index - diagonal
+            while (old_index > old_start and new_index > new_start
+                   and old_hashes[old_index - 1] == new_hashes[new_index - 1]):
+                old_index -= 1
+                new_index -= 1
+            if snake_start - old_index > SNAKE_COUNT:
+                got_snake = True
+            backward[diagonal] = old_index
+            if not odd and forward_min <= diagonal <= forward_max and old_index <= forward[diagonal]:
+                return old_index, new_index, True, True
+
+        if need_minimal:
+            continue
+
+        if got_snake and cost > HEURISTIC_MIN_COST:
+            best = 0
+            for diagonal in range(forward_max, forward_min - 1, -2):
+                old_index = forward[diagonal]
+                new_index = old_index - diagonal
+                value = (old_index - old_start) + (new_index - new_start) - abs(diagonal - forward_middle)
+                if (value > HEURISTIC_FACTOR * cost and value > best
+                        and old_start + SNAKE_COUNT <= old_index < old_end
+                        and new_start + SNAKE_COUNT <= new_index < new_end
+                        and all(old_hashes[old_index - k] == new_hashes[new_index - k]
+                                for k in range(1, SNAKE_COUNT + 1))):
+                    best = value
+                    split = old_index, new_index
+            if best > 0:
+                return *split, True, False
+
+            for diagonal in range(backward_max, backward_min - 1, -2):
+                old_index = backward[diagonal]
+                new_index = old_index - diagonal
+                value = (old_end - old_index) + (new_end - new_index) - abs(diagonal - backward_middle)
+                if (value > HEURISTIC_FACTOR * cost and value > best
+                        and old_start < old_index <= old_end - SNAKE_COUNT
+                        and new_start < new_index <= new_end - SNAKE_COUNT
+                        and all(old_hashes[old_index + k] == new_hashes[new_index + k]
+                                for k in range(SNAKE_COUNT))):
+                    best = value
+                    split = old_index, new_index
+            if best > 0:
+                return *split, False, True
+
+        if cost >= max_cost:
+            forward_best = forward_best_old = -1
+            for diagonal in range(forward_max, forward_min - 1, -2):
+                old_index = min(forward[diagonal], old_end)
+                new_index = old_index - diagonal
+                if new_end < new_index:
+                    old_index = new_end + diagonal
+                    new_index = new_end
+                if forward_best < old_index + new_index:
+                    forward_best = old_index + new_index
+                    forward_best_old = old_index
+
+            backward_best = backward_best_old = LINE_MAX
+            for diagonal in range(backward_max, backward_min - 1, -2):
+                old_index = max(old_start, backward[diagonal])
+                new_index = old_index - diagonal
+                if new_index < new_start:
+                    old_index = new_start + diagonal
+                    new_index = new_start
+                if old_index + new_index < backward_best:
+                    backward_best = old_index + new_index
+                    backward_best_old = old_index
+
+            if (old_end + new_end) - backward_best < forward_best - (old_start + new_start):
+                return forward_best_old, forward_best - forward_best_old, True, False
+            return backward_best_old, backward_best - backward_best_old, False, True
+
+
+def format_renamed_path(old_path: str, new_path: str) -> str:
+    """Formats renamed path the way git '--stat' does, e.g. 'dir/{old => new}/file.py'"""
+
+    prefix_length = 0
+    for index, (old_symbol, new_symbol) in enumerate(zip(old_path, new_path)):
+        if old_symbol != new_symbol:
+            break
+        if old_symbol == "/":
+            prefix_length = index + 1
+
+    suffix_length = 0
+    adjust_for_slash = 1 if prefix_length else 0
+    old_index = len(old_path)
+    new_index = len(new_path)
+    # NOTE: Indexes start one past the end, the same as git compares terminating NUL symbols first.
+    while (prefix_length - adjust_for_slash <= old_index and prefix_length - adjust_for_slash <= new_index
+           and (old_path[old_index] if old_index < len(old_path) else "")
+           == (new_path[new_index] if new_index < len(new_path) else "")):
+        if old_index < len(old_path) and old_path[old_index] == "/":
+            suffix_length = len(old_path) - old_index
+        old_index -= 1
+        new_index -= 1
+
+    old_middle_length = max(len(old_path) - prefix_length - suffix_length, 0)
+    new_middle_length = max(len(new_path) - prefix_length - suffix_length, 0)
+    old_middle = old_path[prefix_length:prefix_length + old_middle_length]
+    new_middle = new_path[prefix_length:prefix_length + new_middle_length]
+
+    if not prefix_length + suffix_length:
+        return f"{old_middle} => {new_middle}"
+    return f"{old_path[:prefix_length]}{{{old_middle} => {new_middle}}}{old_path[len(old_path) - suffix_length:]}"
+
+
+def format_date(identity: bytes) -> str:
+    """Formats 'Name <email> timestamp +zone' identity date the same way '--date=iso8601' does"""
+
+    *_, timestamp, zone = identity.decode().split(" ")
+    zone_minutes = int(zone[1:3]) * 60 + int(zone[3:5])
+    zone_offset = timedelta(minutes=-zone_minutes if zone.startswith("-") else zone_minutes)
+    date = datetime.fromtimestamp(int(timestamp), timezone(zone_offset))
+    return f"{date:%Y-%m-%d %H:%M:%S} {zone}"
+
+
+def format_message(message: str) -> str:
+    """Indents commit message the same way 'git show' does"""
+
+    lines = [line.rstrip() for line in message.split("\n")]
+    while lines and not lines[0]:
+        lines.pop(0)
+    while lines and not lines[-1]:
+        lines.pop()
+    return "".join(f"    {line.expandtabs(8)}\n" for line in lines)
+
+
+class CommitLogBuilder:
+    """Builds 'git show <commit> --stat=350 --date=iso8601' like text from objects read by GitObjectReader"""
+
+    def __init__(self, reader: GitObjectReader):
+        self.reader = reader
+        head_tree = reader.read_commit(reader.resolve_reference())["tree"].decode()
+        # NOTE: '.mailmap' would change author names and '.gitattributes' could change diff of files.
+        for _, name, _ in reader.read_tree(head_tree):
+            if name in (b".mailmap", b".gitattributes"):
+                raise UnsupportedObjectStore(f"Repository has {name.decode()}")
+
+    def build(self, commit_hash: str) -> str:
+        commit = self.reader.read_commit(commit_hash)
+        if commit.get("encoding", b"utf-8").lower() not in (b"utf-8", b"utf8"):
+            raise UnsupportedObjectStore(f"Commit {commit_hash} message is not UTF-8")
+
+        author = commit["author"]
+        author_name = author[:author.rindex(b">") + 1].decode("UTF-8")
+        try:
+            message = format_message(commit["message"].decode("UTF-8"))
+        except UnicodeDecodeError:
+            raise UnsupportedObjectStore(f"Commit {commit_hash} message is not UTF-8")
+
+        # NOTE: Merge commits are compared with the first parent, the same as 'git show --stat' does.
+        parents = commit["parents"]
+        parent_tree = self.reader.read_commit(parents[0])["tree"].decode() if parents else EMPTY_TREE
+        changes = self.reader.diff_trees(parent_tree, commit["tree"].decode())
+
+        log = f"commit {commit_hash}\nAuthor: {author_name}\nDate:   {format_date(author)}\n\n{message}"
+        if changes:
+            log += "\n" + self.build_stat(changes)
+        return log
+
+    def build_stat(self, changes: list[tuple[str, str, str, str, str]]) -> str:
+        changes = self.detect_exact_renames(changes)
+
+        stat_lines = []
+        total_insertions = 0
+        total_deletions = 0
+        for status, path, old_hash, new_hash, _ in changes:
+            old_data = self.reader.read_object(old_hash)[1] if status in ("M", "D", "R") else b""
+            new_data = self.reader.read_object(new_hash)[1] if status in ("M", "A", "R") else b""
+
+            if b"\0" in old_data[:BINARY_CHECK_LENGTH] or b"\0" in new_data[:BINARY_CHECK_LENGTH]:
+                # NOTE: Git does not show sizes of binary file, which content was not changed.
+                if old_hash == new_hash:
+                    stat_lines.append(f" {path} | Bin")
+                    continue
+                stat_lines.append(f" {path} | Bin {len(old_data)} -> {len(new_data)} bytes")
+                continue
+
+            insertions, deletions = count_changed_lines(old_data, new_data) if old_hash != new_hash else (0, 0)
+            total_insertions += insertions
+            total_deletions += deletions
+            stat_lines.append(f" {path} | {insertions + deletions} {'+' * insertions}{'-' * deletions}".rstrip())
+
+        files = len(changes)
+        summary = f" {files} file{'s' if files != 1 else ''} changed"
+        if total_insertions or not total_deletions:
+            summary += f", {total_insertions} insertion{'s' if total_insertions != 1 else ''}(+)"
+        if total_deletions or not total_insertions:
+            summary += f", {total_deletions} deletion{'s' if total_deletions != 1 else ''}(-)"
+        return "\n".join(stat_lines + [summary]) + "\n"
+
+    @staticmethod
+    def detect_exact_renames(changes: list[tuple[str, str, str, str, str]]) -> list[tuple[str, str, str, str, str]]:
+        """Pairs deleted and added files with the same content into renames, placed where the added file is.
+
+        Git also detects renames of similar files, such commits are not supported.
+        """
+
+        deleted = {}
+        for status, path, old_hash, _, _ in changes:
+            if status == "D":
+                if old_hash in deleted:
+                    raise UnsupportedObjectStore(f"Several deleted files have the same content as {path}")
+                deleted[old_hash] = path
+
+        added_hashes = [new_hash for status, _, _, new_hash, _ in changes if status == "A"]
+        if len(added_hashes) != len(set(added_hashes)):
+            raise UnsupportedObjectStore("Several added files have the same content")
+
+        renamed_hashes = deleted.keys() & set(added_hashes)
+        if len(deleted) - len(renamed_hashes) and len(added_hashes) - len(renamed_hashes):
+            raise UnsupportedObjectStore("Added and deleted files could be detected as renamed by git")
+
+        result = []
+        for status, path, old_hash, new_hash, mode in changes:
+            if status == "D" and old_hash in renamed_hashes:
+                continue
+            if status == "A" and new_hash in renamed_hashes:
+                result.append(("R", format_renamed_path(deleted[new_hash], path), new_hash, new_hash, mode))
+                continue
+            result.append((status, path, old_hash, new_hash, mode))
+        return result
+
+
+def open_native_repository(git_repo: Path) -> tuple[GitObjectReader, CommitLogBuilder]:
+    """Opens repository for native reading, raises UnsupportedObjectStore if it can not be read natively"""
+
+    try:
+        reader = GitObjectReader(git_repo)
+        return reader, CommitLogBuilder(reader)
+    except READER_ERRORS as e:
+        raise UnsupportedObjectStore(f"Could not read {git_repo}: {e}")
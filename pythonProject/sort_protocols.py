@@ -1,9 +1,14 @@
+import json
 import re
 from pathlib import Path
 import xml.etree.ElementTree as Et
 from copy import deepcopy
 import os
+import shutil
+import tempfile
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 import argparse
 import sys
 import logging
@@ -103,34 +108,127 @@ def select_name_of_test_type(file_text: str) -> str:  # Need UnitTest
     return ""
 
 
-def categorise_protocols_by_setup(test_automation_dir: Path, root: Et.Element, ext: str) -> dict:
-    """Collects protocols from XML file, categorise by setup name and keeps it in dictionary"""
+DEFAULT_TEST_TYPE = "unknown"
 
-    protocols_by_setup_name = defaultdict(list)
-    default_test_type = "unknown"
-    for element in root.findall(".//protocol"):
-        test_type = default_test_type
 
-        test_script_reference_text = get_sub_element_text_from_protocol(element)
-        file_address = get_test_script_reference(test_script_reference_text, ext)
-        if not file_address:
-            protocols_by_setup_name[test_type].append(element)
-            continue
+class TestTypeCache:
+    """Test types of test files by resolved path, entry is valid while mtime and size of the file are the same.
+
+    Within one run every path is checked only once, between runs entries are kept in JSON file.
+    """
+
+    def __init__(self, entries: dict[str, dict] | None = None):
+        self.entries: dict[str, dict] = entries or {}
+        self.checked_paths: dict[Path, str] = {}
+
+    @classmethod
+    def load(cls, cache_file: Path) -> "TestTypeCache":
+        if not cache_file.is_file():
+            return cls()
+
+        try:
+            with open(cache_file, "r", encoding="UTF-8") as file:
+                return cls(json.load(file))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring damaged cache {cache_file}: {e}")
+            return cls()
+
+    def save(self, cache_file: Path):
+        with open(cache_file, "w", encoding="UTF-8") as file:
+            json.dump(self.entries, file, ensure_ascii=False, separators=(",", ":"))
+
+    def get_test_type(self, path: Path) -> str:
+        if path in self.checked_paths:
+            return self.checked_paths[path]
+
+        test_type = self.read_test_type(path)
+        self.checked_paths[path] = test_type
+        return test_type
 
-        file_name = find_test_case_name(file_address)
-        path = test_automation_dir / file_name
-        if not path.exists():
+    def check_paths(self, paths, jobs: int):
+        """Reads test types of all not yet checked paths concurrently, following lookups are served from memory"""
+
+        unchecked_paths = {path for path in paths if path not in self.checked_paths}
+        # NOTE: Every worker writes entry of a different path, so 'entries' needs no lock.
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            for path, test_type in zip(unchecked_paths, executor.map(self.read_test_type, unchecked_paths)):
+                self.checked_paths[path] = test_type
+
+    def read_test_type(self, path: Path) -> str:
+        try:
+            stat = path.stat()
+        except OSError:
             logger.warning(f"File does not exists --> {path}")
-            protocols_by_setup_name[test_type].append(element)
-            continue
+            return DEFAULT_TEST_TYPE
+
+        resolved_path = str(path.resolve())
+        entry = self.entries.get(resolved_path)
+        if entry is not None and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry["test_type"]
+
+        test_type = select_name_of_test_type(path.read_text(encoding="UTF-8"))
+        self.entries[resolved_path] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "test_type": test_type}
+        return test_type
+
+
+def get_test_file_path_of_protocol(test_automation_dir: Path, element: Et.Element, ext: str) -> Path | None:
+    """Returns path of test file referenced by protocol, None if protocol has no reference"""
+
+    test_script_reference_text = get_sub_element_text_from_protocol(element)
+    file_address = get_test_script_reference(test_script_reference_text, ext)
+    if not file_address:
+        return None
+
+    return test_automation_dir / find_test_case_name(file_address)
 
-        file_text = path.read_text(encoding="UTF-8")
-        test_type = select_name_of_test_type(file_text)
-        protocols_by_setup_name[test_type].append(element)
 
-    if len(protocols_by_setup_name) == 1 and protocols_by_setup_name["unknown"]:
+def get_test_type_of_protocol(test_automation_dir: Path, element: Et.Element, ext: str,
+                              cache: TestTypeCache | None = None) -> str:
+    """Reads test file referenced by protocol and returns its test type, file is read only once if cache is given"""
+
+    path = get_test_file_path_of_protocol(test_automation_dir, element, ext)
+    if path is None:
+        return DEFAULT_TEST_TYPE
+
+    if cache is not None:
+        return cache.get_test_type(path)
+
+    if not path.exists():
+        logger.warning(f"File does not exists --> {path}")
+        return DEFAULT_TEST_TYPE
+
+    file_text = path.read_text(encoding="UTF-8")
+    return select_name_of_test_type(file_text)
+
+
+def check_only_unknown_test_type(test_types) -> None:
+    if len(test_types) == 1 and DEFAULT_TEST_TYPE in test_types:
         logger.error("Files consists only of 'unknown' test type, cancelling !!!")
         sys.exit(1)
+
+
+def categorise_protocols_by_setup(test_automation_dir: Path, root: Et.Element, ext: str,
+                                  cache: TestTypeCache | None = None, jobs: int = 1) -> dict:
+    """Collects protocols from XML file, categorise by setup name and keeps it in dictionary.
+
+    With more than one job, test files of all protocols are read concurrently before protocols are categorised.
+    """
+
+    protocols_by_setup_name = defaultdict(list)
+    if jobs > 1:
+        cache = cache if cache is not None else TestTypeCache()
+        elements = root.findall(".//protocol")
+        paths = [get_test_file_path_of_protocol(test_automation_dir, element, ext) for element in elements]
+        cache.check_paths((path for path in paths if path is not None), jobs)
+        for element, path in zip(elements, paths):
+            test_type = DEFAULT_TEST_TYPE if path is None else cache.get_test_type(path)
+            protocols_by_setup_name[test_type].append(element)
+    else:
+        for element in root.findall(".//protocol"):
+            test_type = get_test_type_of_protocol(test_automation_dir, element, ext, cache)
+            protocols_by_setup_name[test_type].append(element)
+
+    check_only_unknown_test_type(protocols_by_setup_name)
     return protocols_by_setup_name
 
 
@@ -153,6 +251,88 @@ def distribute_protocols_through_files(setup_name_and_protocol: dict, output_fol
         new_tree.write(setup_filename, encoding='utf-8', xml_declaration=True)
 
 
+XML_DECLARATION = "<?xml version='1.0' encoding='utf-8'?>\n"
+
+
+def write_protocol(protocol: Et.Element, parent: Et.Element | None, protocols_file):
+    protocols_file.write(Et.tostring(protocol, encoding="unicode"))
+
+    # NOTE: Written protocol is dropped from the tree, only the rest of the document stays in memory.
+    if parent is not None:
+        parent.remove(protocol)
+
+
+def stream_protocols_through_files(export_file_name: Path, test_automation_dir: Path, ext: str,
+                                   output_folder: Path, cache: TestTypeCache | None = None):
+    """Same output as 'categorise_protocols_by_setup' with 'distribute_protocols_through_files', but protocols are
+    parsed, categorised and written one at a time, so memory is bounded by a single protocol.
+
+    Every protocol is appended to temporary file of its setup and removed from the tree. At the end, the rest of
+    the tree is written around protocols of every setup.
+    """
+
+    root = None
+    parents = []
+    protocols_files = {}
+    pending_protocol = None
+    with tempfile.TemporaryDirectory() as protocols_folder:
+        try:
+            for event, element in Et.iterparse(export_file_name, events=("start", "end")):
+                # NOTE: Protocol tail can still be unparsed at its end event, at the next event it's complete.
+                if pending_protocol is not None:
+                    write_protocol(*pending_protocol)
+                    pending_protocol = None
+
+                if event == "start":
+                    if root is None:
+                        root = element
+                    parents.append(element)
+                    continue
+
+                parents.pop()
+                if element.tag != "protocol":
+                    continue
+
+                test_type = get_test_type_of_protocol(test_automation_dir, element, ext, cache)
+                if test_type not in protocols_files:
+                    protocols_files[test_type] = open(Path(protocols_folder) / f"{len(protocols_files)}.xml", "w",
+                                                      encoding="UTF-8")
+                pending_protocol = element, parents[-1] if parents else None, protocols_files[test_type]
+
+            if pending_protocol is not None:
+                write_protocol(*pending_protocol)
+        except Et.ParseError as e:
+            logger.error(f"Can not parse this XML file, error message: !!!\n{e}")
+            remove_empty_folder()
+            sys.exit(1)
+        finally:
+            for protocols_file in protocols_files.values():
+                protocols_file.close()
+
+        check_only_unknown_test_type(protocols_files)
+
+        pattern = './/protocols'
+        protocols = root.find(pattern)
+        if protocols is None:
+            logger.error(f"!!! ERROR: '{pattern}' does not exists in XML root")
+            remove_empty_folder()
+            sys.exit(1)
+
+        # NOTE: Cleared the same way as in 'distribute_protocols_through_files', placeholder marks where they go.
+        placeholder = uuid.uuid4().hex
+        protocols.clear()
+        protocols.text = placeholder
+        document_start, document_end = Et.tostring(root, encoding="unicode").split(placeholder)
+
+        for test_type, protocols_file in protocols_files.items():
+            setup_filename = os.path.join(output_folder, f"{test_type}.xml")
+            with open(setup_filename, "w", encoding="UTF-8") as setup_file, \
+                    open(protocols_file.name, "r", encoding="UTF-8") as written_protocols:
+                setup_file.write(XML_DECLARATION + document_start)
+                shutil.copyfileobj(written_protocols, setup_file)
+                setup_file.write(document_end)
+
+
 def create_an_output_folder(output_folder: Path):
     try:
         os.makedirs(output_folder)
@@ -161,12 +341,24 @@ def create_an_output_folder(output_folder: Path):
         sys.exit(1)
 
 
-def main(export_file_name: Path, test_automation_dir: Path, extension: str, output_folder: Path, logger: logging.Logger):
+def main(export_file_name: Path, test_automation_dir: Path, extension: str, output_folder: Path, logger: logging.Logger,
+         stream: bool = False, cache_file: Path | None = None, jobs: int = 1):
     logger.info("Running the script\n")
-    root = parse_xml_file(export_file_name)
-    create_an_output_folder(output_folder)
-    protocols_by_setup = categorise_protocols_by_setup(test_automation_dir, root, extension)
-    distribute_protocols_through_files(protocols_by_setup, output_folder, root)
+    cache = TestTypeCache.load(cache_file) if cache_file else TestTypeCache()
+    if stream:
+        create_an_output_folder(output_folder)
+        stream_protocols_through_files(export_file_name, test_automation_dir, extension, output_folder, cache)
+    else:
+        root = parse_xml_file(export_file_name)
+        create_an_output_folder(output_folder)
+        protocols_by_setup = categorise_protocols_by_setup(test_automation_dir, root, extension, cache, jobs)
+        distribute_protocols_through_files(protocols_by_setup, output_folder, root)
+
+    if cache_file:
+        try:
+            cache.save(cache_file)
+        except OSError as e:
+            logger.error(f"Error occurred trying write {cache_file}: \n{e}")
     amount_of_files_in_directory = len(os.listdir(output_folder))
     logger.info(f"Was generated {amount_of_files_in_directory} new files from {export_file_name}")
 
@@ -196,11 +388,22 @@ if __name__ == "__main__":
                         help="Log path")
     parser.add_argument("-x", "--file_extension", default=".py",
                         help="Specify the file extension to search for. (default: .py)")
+    parser.add_argument("-s", "--stream", action="store_true",
+                        help="Parse, categorise and write protocols one at a time, instead of loading whole XML file")
+    parser.add_argument("-c", "--cache_file", type=Path,
+                        help="Specify the JSON file, where test types of test files are kept between runs")
+    parser.add_argument("-j", "--jobs", default=1, type=int,
+                        help="Specify how many test files are read concurrently. (default: 1)")
 
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.stream and args.jobs > 1:
+        parser.error("--jobs can't be used with --stream, protocols are categorised one at a time")
     logger = configure_logger(args.log_file)
     start = time.time()
     main(export_file_name=args.xml_file, test_automation_dir=args.test_automation_dir,
-         extension=args.file_extension, output_folder=args.output_folder, logger=logger)
+         extension=args.file_extension, output_folder=args.output_folder, logger=logger, stream=args.stream,
+         cache_file=args.cache_file, jobs=args.jobs)
     end_time = time.time()
     print(end_time - start)
@@ -1,4 +1,7 @@
+import json
 import shutil
+import subprocess
+import sys
 import tempfile
 from pathlib import Path
 from unittest import mock
@@ -359,3 +362,405 @@ def test_get_message_from_git_log_no_message():
     message = cg.get_message_from_git_log(string, date, first_file)
     expected_result = ""
     assert message == expected_result
+
+
+def test_split_git_log_stream():
+    lines = [
+        "\x1ecommit 9b9494e8ac87f4ed63a6791304625f13a8c1d92a\n",
+        "Author: arnas.zuklija <arnas.zuklija@qdevtechnologies.com>\n",
+        "Date:   2024-03-26 23:21:18 +0200\n",
+        "\n",
+        "\x1fFirst message\n",
+        "\tsecond line  \n",
+        "\x1f\n",
+        " azure-pipelines.yml | 7 +-\n",
+        " 1 file changed, 4 insertions(+), 3 deletions(-)\n",
+        "\x1ecommit e1f5b4ae1f6255df702da1c803e8ceeadd0795e7\n",
+        "Author: arnas.zuklija <arnas.zuklija@qdevtechnologies.com>\n",
+        "Date:   2024-03-25 23:21:18 +0200\n",
+    ]
+    result = list(cg.split_git_log_stream(lines))
+    assert [commit_hash for commit_hash, _ in result] == ["9b9494e8ac87f4ed63a6791304625f13a8c1d92a",
+                                                          "e1f5b4ae1f6255df702da1c803e8ceeadd0795e7"]
+    assert result[0][1].startswith("commit 9b9494e8ac87f4ed63a6791304625f13a8c1d92a\n")
+    assert "\n\n    First message\n            second line\n\n azure-pipelines.yml" in result[0][1]
+    assert result[0][1].endswith(" 1 file changed, 4 insertions(+), 3 deletions(-)\n")
+
+
+def test_iter_commit_info_from_git_log_big_stderr(temp_dir: str, caplog):
+    # NOTE: Stderr is written before stdout and is much bigger than pipe buffer, piped stderr would block it.
+    script = (
+        "import sys\n"
+        "sys.stderr.write('warning: slow\\n' * 100000)\n"
+        "sys.stdout.write('\\x1ecommit ' + '1' * 40 + '\\nAuthor: author <a@a>\\n"
+        "Date:   2024-03-26 23:21:18 +0200\\n\\n\\x1fMessage\\n\\x1f\\n')\n"
+        "sys.exit(1)\n"
+    )
+    popen = subprocess.Popen
+    with mock.patch("subprocess.Popen", side_effect=lambda _, **kwargs: popen([sys.executable, "-c", script],
+                                                                               **kwargs)):
+        result = list(cg.iter_commit_info_from_git_log(Path(temp_dir)))
+
+    assert [commit_data["Commit: "] for commit_data in result] == ["1" * 40]
+    assert "warning: slow" in caplog.text
+
+
+def test_split_git_log_stream_empty():
+    assert list(cg.split_git_log_stream([])) == []
+
+
+@mock.patch("subprocess.Popen")
+def test_get_commit_info_single_pass(mock_subprocess_popen: mock.MagicMock, temp_dir: str):
+    git_log_process = mock_subprocess_popen.return_value.__enter__.return_value
+    git_log_process.returncode = 0
+    git_log_process.stdout = iter([
+        "\x1ecommit 9b9494e8ac87f4ed63a6791304625f13a8c1d92a\n",
+        "Author: arnas.zuklija <arnas.zuklija@qdevtechnologies.com>\n",
+        "Date:   2024-03-26 23:21:18 +0200\n",
+        "\n",
+        "\x1fFirst message\n",
+        "\x1f\n",
+        " services/{test_cases => project_service_tmt}/run.py | 34 +-\n",
+        " 1 file changed, 4 insertions(+), 3 deletions(-)\n",
+    ])
+    result = cg.get_commit_info_single_pass(Path(temp_dir))
+
+    mock_subprocess_popen.assert_called_once()
+    assert result == {
+        "Commit - 9b9494e8ac87f4ed63a6791304625f13a8c1d92a": {
+            "Commit: ": "9b9494e8ac87f4ed63a6791304625f13a8c1d92a",
+            "Author: ": "arnas.zuklija <arnas.zuklija@qdevtechnologies.com>",
+            "Date: ": "2024-03-26 23:21:18 +0200",
+            "Message: ": "First message",
+            "Renamed_files: ": {},
+            "Renamed_paths: ": [["services/test_cases/run.py", "services/project_service_tmt/run.py"]],
+            "Changed_files: ": ["services/project_service_tmt/run.py"],
+            "Insertions: ": 4,
+            "Deletions: ": 3
+        }
+    }
+
+
+def test_get_commit_info_single_pass_not_git_repo():
+    assert cg.get_commit_info_single_pass("not_a_path") == {}
+
+
+@mock.patch("subprocess.run")
+def test_get_commit_info_uses_cached_commits(mock_subprocess_run: mock.MagicMock, temp_dir: str):
+    mock_subprocess_run.return_value.returncode = 0
+    mock_subprocess_run.return_value.stdout = """
+commit 9b9494e8ac87f4ed63a6791304625f13a8c1d92a
+Author: arnas.zuklija <arnas.zuklija@qdevtechnologies.com>
+Date:   Tue Apr 9 09:30:20 2024 +0300
+"""
+    cached_commit = {"Commit: ": "9b9494e8ac87f4ed63a6791304625f13a8c1d92a", "Author: ": "cached"}
+    result = cg.get_commit_info(Path(temp_dir), {"9b9494e8ac87f4ed63a6791304625f13a8c1d92a": cached_commit})
+
+    # NOTE: Only 'git log' is called, 'git show' is skipped for cached commit.
+    mock_subprocess_run.assert_called_once()
+    assert result == {"Commit - 9b9494e8ac87f4ed63a6791304625f13a8c1d92a": cached_commit}
+
+
+def test_commit_cache_round_trip(temp_dir: str):
+    cache_file = Path(temp_dir) / "cache.jsonl"
+    first_commit = cg.CommitRecord("9b9494e8ac87f4ed63a6791304625f13a8c1d92a", "Author <a@b.c>",
+                                   "2024-01-01 10:00:00 +0200", "First", {}, ["a.py"], 1, 0)
+    second_commit = cg.CommitRecord("e1f5b4ae1f6255df702da1c803e8ceeadd0795e7", "Author <a@b.c>",
+                                    "2024-01-02 10:00:00 +0200", "Second", {}, [], 0, 0)
+
+    list(cg.cache_commits([first_commit], cache_file, {}, "9b9494e8ac87f4ed63a6791304625f13a8c1d92a", 1))
+    passed_commits = list(cg.cache_commits([first_commit, second_commit], cache_file,
+                                           {"9b9494e8ac87f4ed63a6791304625f13a8c1d92a": first_commit},
+                                           "e1f5b4ae1f6255df702da1c803e8ceeadd0795e7", 2))
+    assert passed_commits == [first_commit, second_commit]
+    assert len(cache_file.read_text(encoding="UTF-8").splitlines()) == 4
+    with open(cache_file, "a", encoding="UTF-8") as file:
+        file.write('{"Commit: ": "damaged')
+
+    cached_commits, cached_head = cg.load_commit_cache(cache_file)
+    assert cached_commits == {"9b9494e8ac87f4ed63a6791304625f13a8c1d92a": first_commit,
+                              "e1f5b4ae1f6255df702da1c803e8ceeadd0795e7": second_commit}
+    assert cached_head == "e1f5b4ae1f6255df702da1c803e8ceeadd0795e7"
+
+
+def test_cache_commits_incomplete_walk_does_not_record_head(temp_dir: str):
+    cache_file = Path(temp_dir) / "cache.jsonl"
+    first_commit = cg.CommitRecord("9b9494e8ac87f4ed63a6791304625f13a8c1d92a", "Author <a@b.c>",
+                                   "2024-01-01 10:00:00 +0200", "First", {}, ["a.py"], 1, 0)
+
+    passed_commits = []
+    with pytest.raises(cg.IncompleteCommitWalk):
+        for commit_data in cg.cache_commits([first_commit], cache_file, {}, "e1f5b4ae1f6255df702da1c803e8ceeadd0795e7",
+                                            2):
+            passed_commits.append(commit_data)
+
+    assert passed_commits == [first_commit]
+    assert cg.load_commit_cache(cache_file) == ({"9b9494e8ac87f4ed63a6791304625f13a8c1d92a": first_commit}, "")
+
+
+def test_load_commit_cache_missing_file(temp_dir: str):
+    assert cg.load_commit_cache(Path(temp_dir) / "missing.jsonl") == ({}, "")
+
+
+@mock.patch("collect_git_info.get_commits")
+def test_merge_with_cached_commits(mock_get_commits: mock.MagicMock, temp_dir: str):
+    new_commit = {"Commit: ": "e1f5b4ae1f6255df702da1c803e8ceeadd0795e7"}
+    cached_commits = {commit_hash: {"Commit: ": commit_hash} for commit_hash in ["1" * 40, "2" * 40, "3" * 40]}
+    # NOTE: New commit is older than the second cached commit, commit '3...' is not reachable from HEAD anymore.
+    mock_get_commits.return_value = ["2" * 40, new_commit["Commit: "], "1" * 40]
+
+    result = cg.merge_with_cached_commits([new_commit], cached_commits, Path(temp_dir))
+
+    assert list(result) == [cached_commits["2" * 40], new_commit, cached_commits["1" * 40]]
+    mock_get_commits.assert_called_once_with(Path(temp_dir), cg.HISTORY_ORDER_FILTERS)
+
+
+@mock.patch("collect_git_info.get_commit_show_output")
+@mock.patch("collect_git_info.get_commits")
+def test_get_commit_info_parallel_keeps_order_and_skips_failed(mock_get_commits: mock.MagicMock,
+                                                               mock_get_commit_show_output: mock.MagicMock,
+                                                               temp_dir: str):
+    commits = [f"{index:040d}" for index in range(20)]
+    mock_get_commits.return_value = commits
+
+    def show_output(_, commit_hash):
+        if commit_hash == commits[5]:
+            return None
+        return f"commit {commit_hash}\nAuthor: author\nDate:   2024-03-26 23:21:18 +0200\n"
+
+    mock_get_commit_show_output.side_effect = show_output
+    result = cg.get_commit_info(Path(temp_dir), jobs=4)
+
+    assert mock_get_commit_show_output.call_count == 20
+    assert [data["Commit: "] for data in result.values()] == commits[:5] + commits[6:]
+
+
+COMMITS_DATA = [
+    {"Commit: ": "9b9494e8ac87f4ed63a6791304625f13a8c1d92a", "Message: ": "Žinutė\nsecond line",
+     "Renamed_files: ": {}, "Changed_files: ": ["a.py", "b.py"], "Insertions: ": 1},
+    {"Commit: ": "e1f5b4ae1f6255df702da1c803e8ceeadd0795e7", "Message: ": "", "Renamed_files: ": {"a": "b"},
+     "Changed_files: ": [], "Insertions: ": 0},
+]
+
+
+def test_create_json_file_streamed_same_as_create_json_file(temp_dir: str):
+    json_file = Path(temp_dir) / "git_info.json"
+    streamed_json_file = Path(temp_dir) / "git_info_streamed.json"
+    cg.create_json_file({f"Commit - {data['Commit: ']}": data for data in COMMITS_DATA}, json_file)
+    amount_of_commits = cg.create_json_file_streamed(iter(COMMITS_DATA), streamed_json_file)
+
+    assert amount_of_commits == 2
+    assert streamed_json_file.read_text(encoding="UTF-8") == json_file.read_text(encoding="UTF-8")
+
+
+def test_create_json_file_streamed_empty(temp_dir: str):
+    json_file = Path(temp_dir) / "git_info.json"
+    assert cg.create_json_file_streamed([], json_file) == 0
+    assert json.loads(json_file.read_text(encoding="UTF-8")) == {}
+
+
+def test_create_json_lines_file(temp_dir: str):
+    json_file = Path(temp_dir) / "git_info.jsonl"
+    amount_of_commits = cg.create_json_lines_file(iter(COMMITS_DATA), json_file)
+
+    lines = json_file.read_text(encoding="UTF-8").splitlines()
+    assert amount_of_commits == 2
+    assert [json.loads(line) for line in lines] == COMMITS_DATA
+
+
+COMMIT_LOGS = [
+    """commit e78c1fe49557fb8c713790f750b710c740bfb626
+Author: arnas.zuklija <arnas.zuklija@qdevtechnologies.com>
+Date:   2021-08-30 13:13:04 +0300
+
+    Merge remote-tracking branch 'origin/develop' into implement_new_tc_24466
+
+    # Conflicts:
+    #       framework/lib/device/monitor.py
+
+ azure-pipelines.yml                                                                            |    7 +-
+ {services/test_cases/core/web => framework/lib/report_engine/validation}/__init__.py           |    0
+ services/{test_cases => project_service_tmt}/run.py                                            |   34 +-
+ 968 files changed, 163570 insertions(+), 86903 deletions(-)
+""",
+    """commit e78c1fe49557fb8c713790f750b710c740bfb626
+Author: arnas.zuklija <arnas.zuklija@qdevtechnologies.com>
+Date:   2024-02-19 15:03:24 +0200
+
+    Commiting not completely done advent of code part 2
+""",
+    """commit e78c1fe49557fb8c713790f750b710c740bfb626
+Author: arnas.zuklija <arnas.zuklija@qdevtechnologies.com>
+
+ pythonProject/advent_of_code_2.py | 2 +-
+ 1 file changed, 1 insertion(+), 1 deletion(-)
+""",
+    "",
+]
+
+
+@pytest.mark.parametrize("commit_log", COMMIT_LOGS)
+def test_commit_log_parser_same_as_functions(commit_log: str):
+    author, date = cg.get_author_and_date_from_git_log(commit_log)
+    first_line, modified_files, renamed_files = cg.get_changed_and_renamed_files_from_git_log(commit_log)
+
+    parsed_log = cg.CommitLogParser(commit_log)
+    assert parsed_log.author == author
+    assert parsed_log.date == date
+    assert parsed_log.first_changed_file == first_line
+    assert parsed_log.modified_files == modified_files
+    assert parsed_log.renamed_files == renamed_files
+    assert parsed_log.message == cg.get_message_from_git_log(commit_log, date, first_line)
+    assert parsed_log.insertions == cg.get_insertion_or_deletion_from_git_log(commit_log, "insertion")
+    assert parsed_log.deletions == cg.get_insertion_or_deletion_from_git_log(commit_log, "deletion")
+
+
+def test_commit_log_parser():
+    parsed_log = cg.CommitLogParser(COMMIT_LOGS[0])
+    assert parsed_log.author == "arnas.zuklija <arnas.zuklija@qdevtechnologies.com>"
+    assert parsed_log.date == "2021-08-30 13:13:04 +0300"
+    assert parsed_log.message == """Merge remote-tracking branch 'origin/develop' into implement_new_tc_24466
+
+    # Conflicts:
+    #       framework/lib/device/monitor.py"""
+    assert parsed_log.modified_files == ["azure-pipelines.yml", "services/project_service_tmt/run.py"]
+    assert parsed_log.renamed_files == {"new_'__init__.py'_name": "framework/lib/report_engine/validation/__init__.py",
+                                        "old_'__init__.py'_name": "services/test_cases/core/web/__init__.py"}
+    assert parsed_log.insertions == 163570
+    assert parsed_log.deletions == 86903
+
+
+def test_create_git_log_filters():
+    result = cg.create_git_log_filters("v1.0..HEAD", since="2024-01-01", until="2024-02-01", author="arnas",
+                                       paths=[Path("test_cases"), Path("framework/lib")])
+    assert result == ["--since=2024-01-01", "--until=2024-02-01", "--author=arnas", "v1.0..HEAD",
+                      "--", "test_cases", "framework/lib"]
+
+
+def test_create_git_log_filters_empty():
+    assert cg.create_git_log_filters() == []
+
+
+@mock.patch("subprocess.run")
+def test_get_commits_with_filters(mock_subprocess_run: mock.MagicMock, temp_dir: str):
+    mock_subprocess_run.return_value.returncode = 0
+    mock_subprocess_run.return_value.stdout = ""
+    cg.get_commits(Path(temp_dir), ["--author=arnas", "--", "test_cases"])
+
+    command = mock_subprocess_run.call_args.args[0]
+    assert command == ["git", "log", "--author=arnas", "--", "test_cases"]
+
+
+def test_expand_repositories(temp_dir: str):
+    for name in ["repo_b", "repo_a", "other"]:
+        (Path(temp_dir) / name).mkdir()
+
+    result = cg.expand_repositories([f"{temp_dir}/repo_*", f"{temp_dir}/other", f"{temp_dir}/repo_a"])
+    assert result == [Path(temp_dir) / "repo_a", Path(temp_dir) / "repo_b", Path(temp_dir) / "other"]
+
+
+def test_expand_repositories_no_match(temp_dir: str):
+    assert cg.expand_repositories([f"{temp_dir}/missing_*"]) == []
+
+
+@mock.patch("collect_git_info.iter_repository_commits")
+@mock.patch("collect_git_info.is_git_repo")
+def test_collect_repository(mock_is_git_repo: mock.MagicMock, mock_iter_repository_commits: mock.MagicMock,
+                            temp_dir: str):
+    mock_is_git_repo.return_value = True
+    mock_iter_repository_commits.return_value = iter(COMMITS_DATA)
+    result = cg.collect_repository(Path(temp_dir), mock.MagicMock(), None)
+
+    assert result.error == ""
+    assert result.amount_of_commits == 2
+    assert list(result.commits_data.values()) == COMMITS_DATA
+
+
+@mock.patch("collect_git_info.iter_repository_commits")
+@mock.patch("collect_git_info.is_git_repo")
+def test_collect_repository_error(mock_is_git_repo: mock.MagicMock, mock_iter_repository_commits: mock.MagicMock,
+                                  temp_dir: str):
+    mock_is_git_repo.return_value = True
+    mock_iter_repository_commits.side_effect = OSError("disk is full")
+    result = cg.collect_repository(Path(temp_dir), mock.MagicMock(), None)
+
+    assert result.error == "disk is full"
+    assert result.amount_of_commits == 0
+
+
+def test_collect_repository_not_git_repo(temp_file: str):
+    result = cg.collect_repository(Path(temp_file), mock.MagicMock(), None)
+    assert result.error == "not a git repository"
+
+
+def test_write_combined_commits_data_jsonl(temp_dir: str):
+    results = [cg.RepositoryResult(Path("repo_a"), 2, commits_data={f"Commit - {commit_data['Commit: ']}": commit_data
+                                                                    for commit_data in COMMITS_DATA}),
+               cg.RepositoryResult(Path("repo_b"), error="not a git repository")]
+    json_lines_file = Path(temp_dir) / "combined.jsonl"
+
+    assert cg.write_combined_commits_data(results, json_lines_file, "jsonl") == 2
+    lines = json_lines_file.read_text(encoding="UTF-8").splitlines()
+    assert [json.loads(line) for line in lines] == [{"Repository: ": "repo_a", **commit_data}
+                                                    for commit_data in COMMITS_DATA]
+
+
+@pytest.mark.parametrize("output_format", ["json", "json-stream"])
+def test_write_combined_commits_data_json(temp_dir: str, output_format: str):
+    commits_data = {f"Commit - {commit_data['Commit: ']}": commit_data for commit_data in COMMITS_DATA}
+    results = [cg.RepositoryResult(Path("repo_a"), 2, commits_data=commits_data)]
+    json_file = Path(temp_dir) / "combined.json"
+
+    assert cg.write_combined_commits_data(results, json_file, output_format) == 2
+    assert json.loads(json_file.read_text(encoding="UTF-8")) == {"repo_a": commits_data}
+
+
+def test_commit_record_reads_as_commit_data():
+    commit_data = {"Commit: ": "9b9494e8ac87f4ed63a6791304625f13a8c1d92a", "Author: ": "Author <a@b.c>",
+                   "Date: ": "2024-01-01 10:00:00 +0200", "Message: ": "Žinutė", "Renamed_files: ": {"new_a": "b"},
+                   "Renamed_paths: ": [["a", "b"]], "Changed_files: ": ["a.py"], "Insertions: ": 1, "Deletions: ": 2}
+    record = cg.CommitRecord.from_dict(commit_data)
+
+    assert record == commit_data
+    assert record.to_dict() == commit_data
+    assert list(record) == list(commit_data)
+    assert record.get("Author: ") == commit_data["Author: "]
+    assert record.get("Missing: ") is None
+    assert json.loads(json.dumps(record, default=cg.to_json_compatible)) == commit_data
+    assert not hasattr(record, "__dict__")
+
+
+def test_commit_record_from_dict_without_renamed_paths():
+    commit_data = {"Commit: ": "9b9494e8ac87f4ed63a6791304625f13a8c1d92a",
+                   "Renamed_files: ": {"new_'b.py'_name": "b.py", "old_'a.py'_name": "a.py"},
+                   "Changed_files: ": ["d/z.py => e.py"]}
+    record = cg.CommitRecord.from_dict(commit_data)
+    assert record["Renamed_paths: "] == [["a.py", "b.py"], ["d/z.py", "e.py"]]
+
+
+def test_renamed_paths_of_files_with_the_same_name():
+    commit_log = """commit 9b9494e8ac87f4ed63a6791304625f13a8c1d92a
+Author: arnas.zuklija <arnas.zuklija@qdevtechnologies.com>
+Date:   2024-03-26 23:21:18 +0200
+
+    Move packages
+
+ {old => new}/a/__init__.py | 0
+ {old => new}/b/__init__.py | 0
+ old/c.py => c.py           | 2 +-
+ 2 files changed, 1 insertion(+), 1 deletion(-)
+"""
+    commit_data = cg.create_commit_data("9b9494e8ac87f4ed63a6791304625f13a8c1d92a", commit_log)
+
+    assert commit_data["Renamed_paths: "] == [["old/a/__init__.py", "new/a/__init__.py"],
+                                              ["old/b/__init__.py", "new/b/__init__.py"],
+                                              ["old/c.py", "c.py"]]
+    assert len(commit_data["Renamed_files: "]) == 2
+
+
+def test_commit_record_interns_authors_and_paths():
+    first = cg.CommitRecord("a", "".join(["Au", "thor"]), "", "", {}, ["".join(["a", ".py"])], 0, 0)
+    second = cg.CommitRecord("b", "".join(["Aut", "hor"]), "", "", {}, ["".join(["a.", "py"])], 0, 0)
+
+    assert first.author is second.author
+    assert first.changed_files[0] is second.changed_files[0]
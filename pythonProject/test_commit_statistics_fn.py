@@ -0,0 +1,196 @@
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+import commit_statistics as cs
+
+
+@pytest.fixture()
+def temp_dir():
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+COMMITS_DATA = [
+    {
+        "Commit: ": "9b9494e8ac87f4ed63a6791304625f13a8c1d92a",
+        "Author: ": "arnas.zuklija <arnas.zuklija@qdevtechnologies.com>",
+        "Date: ": "2024-04-09 09:30:20 +0300",
+        "Renamed_files: ": {"new_'run.py'_name": "project_service_tmt/run.py",
+                            "old_'command.py'_name": "services/test_cases/command.py"},
+        "Changed_files: ": ["azure-pipelines.yml"],
+        "Insertions: ": 7,
+        "Deletions: ": 3
+    },
+    {
+        "Commit: ": "e1f5b4ae1f6255df702da1c803e8ceeadd0795e7",
+        "Author: ": "mantas <mantas@qdevtechnologies.com>",
+        "Date: ": "2024-04-09 09:28:56 +0300",
+        "Renamed_files: ": {},
+        "Changed_files: ": ["azure-pipelines.yml", "services/test_cases/command.py"],
+        "Insertions: ": 1,
+        "Deletions: ": 0
+    },
+]
+
+
+def test_get_renamed_file_pairs():
+    renamed_files = {
+        "new_'run.py'_name": "project_service_tmt/run.py",
+        "old_'command.py'_name": "services/test_cases/command.py",
+        "new_'execute.py'_name": "services/project_service_tmt/execute.py",
+        "old_'execute.py'_name": "services/test_cases/execute.py"
+    }
+    assert cs.get_renamed_file_pairs(renamed_files) == [
+        ("services/test_cases/command.py", "project_service_tmt/run.py"),
+        ("services/test_cases/execute.py", "services/project_service_tmt/execute.py")
+    ]
+
+
+def test_churn_index():
+    churn_index = cs.ChurnIndex()
+    indexed_commits = list(cs.index_commits(COMMITS_DATA, churn_index))
+    result = churn_index.to_dict()
+
+    assert indexed_commits == COMMITS_DATA
+    assert result["commits"] == 2
+    assert result["files"]["azure-pipelines.yml"] == {
+        "changes": 2,
+        "last_changed": "2024-04-09 09:30:20 +0300",
+        "authors": {"arnas.zuklija <arnas.zuklija@qdevtechnologies.com>": 1,
+                    "mantas <mantas@qdevtechnologies.com>": 1}
+    }
+    assert result["files"]["project_service_tmt/run.py"]["renamed_from"] == ["services/test_cases/command.py"]
+    assert result["authors"]["arnas.zuklija <arnas.zuklija@qdevtechnologies.com>"] == {
+        "commits": 1, "insertions": 7, "deletions": 3, "changed_files": 2
+    }
+    assert churn_index.most_changed_files(1) == [("azure-pipelines.yml", 2)]
+
+
+def test_churn_index_damaged_date():
+    churn_index = cs.ChurnIndex()
+    churn_index.add({"Author: ": "", "Date: ": "", "Changed_files: ": ["a.py"]})
+    assert churn_index.to_dict()["files"]["a.py"]["last_changed"] == ""
+
+
+def test_create_index_file(temp_dir: str):
+    churn_index = cs.ChurnIndex()
+    for commit_data in COMMITS_DATA:
+        churn_index.add(commit_data)
+
+    index_file = Path(temp_dir) / "index.json"
+    cs.create_index_file(churn_index, index_file)
+    assert json.loads(index_file.read_text(encoding="UTF-8")) == churn_index.to_dict()
+
+
+def create_rename_commit(old_path: str, new_path: str, date: str) -> dict:
+    return {
+        "Date: ": date,
+        "Renamed_files: ": {f"new_'{Path(new_path).name}'_name": new_path,
+                            f"old_'{Path(old_path).name}'_name": old_path}
+    }
+
+
+@pytest.mark.parametrize("order", [[0, 1, 2], [2, 1, 0], [1, 2, 0]])
+def test_rename_table(order: list[int]):
+    commits = [
+        create_rename_commit("test_cases/test_E0401_door.py", "test_cases/test_door.py", "2023-01-01 10:00:00 +0200"),
+        create_rename_commit("test_cases/test_door.py", "test_cases/EBM/test_door.py", "2023-06-01 10:00:00 +0200"),
+        create_rename_commit("services/command.py", "services/run.py", "2023-03-01 10:00:00 +0200"),
+    ]
+    rename_table = cs.RenameTable()
+    list(cs.track_renames([commits[index] for index in order], rename_table))
+
+    assert rename_table.resolve("test_cases/test_E0401_door.py") == "test_cases/EBM/test_door.py"
+    assert rename_table.resolve("test_cases/test_door.py") == "test_cases/EBM/test_door.py"
+    assert rename_table.resolve("test_cases/EBM/test_door.py") == "test_cases/EBM/test_door.py"
+    assert rename_table.resolve("services/command.py") == "services/run.py"
+    assert rename_table.resolve("never_renamed.py") == "never_renamed.py"
+    assert rename_table.to_dict() == {
+        "test_cases/test_E0401_door.py": "test_cases/EBM/test_door.py",
+        "test_cases/test_door.py": "test_cases/EBM/test_door.py",
+        "services/command.py": "services/run.py"
+    }
+
+
+def test_create_renames_file(temp_dir: str):
+    rename_table = cs.RenameTable()
+    rename_table.add(create_rename_commit("a/old.py", "b/new.py", "2023-01-01 10:00:00 +0200"))
+
+    renames_file = Path(temp_dir) / "renames.json"
+    cs.create_renames_file(rename_table, renames_file)
+    assert json.loads(renames_file.read_text(encoding="UTF-8")) == {"a/old.py": "b/new.py"}
+
+
+def test_split_changed_files():
+    changed_files = ["azure-pipelines.yml", "d/z.py => e.py", "services/project_service_tmt/run.py"]
+    assert cs.split_changed_files(changed_files) == (
+        ["azure-pipelines.yml", "e.py", "services/project_service_tmt/run.py"],
+        [("d/z.py", "e.py")]
+    )
+
+
+def test_renames_from_changed_files():
+    commits = [
+        create_rename_commit("d/y.py", "d/z.py", "2023-01-01 10:00:00 +0200"),
+        {"Author: ": "", "Date: ": "2023-02-01 10:00:00 +0200", "Renamed_files: ": {},
+         "Changed_files: ": ["d/z.py => e.py"]},
+    ]
+    rename_table = cs.RenameTable()
+    churn_index = cs.ChurnIndex()
+    list(cs.index_commits(cs.track_renames(commits, rename_table), churn_index))
+
+    assert rename_table.to_dict() == {"d/y.py": "e.py", "d/z.py": "e.py"}
+    assert churn_index.to_dict()["files"]["e.py"]["renamed_from"] == ["d/y.py", "d/z.py"]
+    assert "d/z.py => e.py" not in churn_index.to_dict()["files"]
+
+
+def test_rename_table_files_with_the_same_name():
+    rename_table = cs.RenameTable()
+    rename_table.add({"Date: ": "2024-01-01 10:00:00 +0200",
+                      "Renamed_files: ": {"new_'__init__.py'_name": "new/b/__init__.py",
+                                          "old_'__init__.py'_name": "old/b/__init__.py"},
+                      "Renamed_paths: ": [["old/a/__init__.py", "new/a/__init__.py"],
+                                          ["old/b/__init__.py", "new/b/__init__.py"]]})
+
+    assert rename_table.to_dict() == {"old/a/__init__.py": "new/a/__init__.py",
+                                      "old/b/__init__.py": "new/b/__init__.py"}
+
+
+@pytest.mark.parametrize("order", [[0, 1], [1, 0]])
+def test_rename_table_reused_path(order: list[int]):
+    commits = [
+        create_rename_commit("a.py", "b.py", "2024-01-01 10:00:00 +0200"),
+        create_rename_commit("a.py", "c.py", "2024-02-01 10:00:00 +0200"),
+    ]
+    rename_table = cs.RenameTable()
+    list(cs.track_renames([commits[index] for index in order], rename_table))
+
+    assert rename_table.to_dict() == {"a.py": "c.py"}
+    assert rename_table.resolve("b.py") == "b.py"
+    assert rename_table.get_previous_paths("b.py") == ["a.py"]
+
+
+def test_rename_table_files_swapped_in_one_commit():
+    rename_table = cs.RenameTable()
+    rename_table.add({"Date: ": "2024-01-01 10:00:00 +0200", "Renamed_paths: ": [["a.py", "b.py"], ["b.py", "a.py"]]})
+
+    assert rename_table.to_dict() == {"a.py": "b.py", "b.py": "a.py"}
+
+
+def test_churn_index_files_with_the_same_name():
+    churn_index = cs.ChurnIndex()
+    churn_index.add({"Author: ": "author", "Date: ": "2024-01-01 10:00:00 +0200",
+                     "Renamed_paths: ": [["old/a/__init__.py", "new/a/__init__.py"],
+                                         ["old/b/__init__.py", "new/b/__init__.py"]],
+                     "Changed_files: ": ["new/b/__init__.py"]})
+    files = churn_index.to_dict()["files"]
+
+    assert files["new/a/__init__.py"]["renamed_from"] == ["old/a/__init__.py"]
+    assert files["new/b/__init__.py"]["renamed_from"] == ["old/b/__init__.py"]
+    assert files["new/b/__init__.py"]["changes"] == 1
+    assert churn_index.to_dict()["authors"]["author"]["changed_files"] == 2
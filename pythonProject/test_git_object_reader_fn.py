@@ -0,0 +1,217 @@
+import argparse
+import shutil
+import subprocess
+import tempfile
+import zlib
+from pathlib import Path
+
+import pytest
+
+import collect_git_info as cg
+import git_object_reader as gor
+
+
+@pytest.fixture()
+def temp_dir():
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def run_git(git_repo: Path, *arguments: str):
+    subprocess.run(["git", "-C", str(git_repo), *arguments], check=True, capture_output=True)
+
+
+def commit_all(git_repo: Path, message: str):
+    run_git(git_repo, "add", "-A")
+    run_git(git_repo, "-c", "user.name=arnas.zuklija", "-c", "user.email=arnas.zuklija@qdevtechnologies.com",
+            "commit", "-q", "--allow-empty", "-m", message)
+
+
+@pytest.fixture()
+def git_repo(temp_dir: str):
+    git_repo = Path(temp_dir)
+    run_git(git_repo, "init", "-q")
+
+    (git_repo / "test_cases").mkdir()
+    (git_repo / "test_cases" / "test_blood_pump.py").write_text("a\nb\nc\n")
+    (git_repo / "README.md").write_text("readme\n")
+    commit_all(git_repo, "Initial commit")
+
+    (git_repo / "test_cases" / "test_blood_pump.py").write_text("a\nchanged\nc\nd\n")
+    (git_repo / "image.bin").write_bytes(b"\0binary")
+    commit_all(git_repo, "Modify test\n\n\tBody with tab  \n")
+
+    (git_repo / "services").mkdir()
+    run_git(git_repo, "mv", "README.md", "services/README.md")
+    commit_all(git_repo, "Rename readme | with pipe")
+
+    run_git(git_repo, "rm", "-q", "image.bin")
+    commit_all(git_repo, "Remove image")
+    commit_all(git_repo, "Empty commit")
+    return git_repo
+
+
+def test_native_backend_same_as_git_show(git_repo: Path):
+    expected = list(cg.iter_commit_info(git_repo))
+    result = list(cg.iter_commit_info_native(git_repo))
+    assert len(result) == 5
+    assert result == expected
+
+
+def test_native_backend_same_as_git_show_packed(git_repo: Path):
+    run_git(git_repo, "repack", "-a", "-d", "-q")
+    expected = list(cg.iter_commit_info(git_repo))
+    result = list(cg.iter_commit_info_native(git_repo))
+    assert result == expected
+
+
+def test_native_backend_falls_back_for_not_supported_repository(git_repo: Path):
+    (git_repo / ".git" / "shallow").write_text("")
+    result = list(cg.iter_commit_info_native(git_repo))
+    assert len(result) == 5
+
+
+@pytest.mark.parametrize("error", [KeyError("object"), ValueError("header"), zlib.error("data")])
+def test_native_backend_falls_back_for_commit_reader_error(git_repo: Path, monkeypatch, error: Exception):
+    failing_commit = cg.get_commits(git_repo)[2]
+    build = gor.CommitLogBuilder.build
+
+    def build_or_fail(commit_log_builder, commit_hash):
+        if commit_hash == failing_commit:
+            raise error
+        return build(commit_log_builder, commit_hash)
+
+    monkeypatch.setattr(gor.CommitLogBuilder, "build", build_or_fail)
+    result = list(cg.iter_commit_info_native(git_repo))
+    assert result == list(cg.iter_commit_info(git_repo))
+
+
+def test_native_backend_not_git_repository(temp_dir: str):
+    with pytest.raises(gor.UnsupportedObjectStore):
+        gor.open_native_repository(Path(temp_dir))
+
+
+@pytest.mark.parametrize("old_path, new_path, expected", [
+    ("services/test_cases/requirements.txt", "services/project_service_tmt/requirements.txt",
+     "services/{test_cases => project_service_tmt}/requirements.txt"),
+    ("services/test_cases/core/web/__init__.py", "framework/lib/report_engine/validation/__init__.py",
+     "{services/test_cases/core/web => framework/lib/report_engine/validation}/__init__.py"),
+    ("services/test_cases/command.py", "project_service_tmt/run.py",
+     "services/test_cases/command.py => project_service_tmt/run.py"),
+    ("test_cases/EBM/test_E0401_door.py", "test_cases/EBM/test_door.py",
+     "test_cases/EBM/{test_E0401_door.py => test_door.py}"),
+    ("a", "dir/sub/a", "a => dir/sub/a"),
+])
+def test_format_renamed_path(old_path: str, new_path: str, expected: str):
+    assert gor.format_renamed_path(old_path, new_path) == expected
+
+
+@pytest.mark.parametrize("old_data, new_data, expected", [
+    (b"a\nb\nc\n", b"a\nb\nc\n", (0, 0)),
+    (b"", b"a\nb\n", (2, 0)),
+    (b"a\nb\n", b"", (0, 2)),
+    (b"a\nb\nc\n", b"a\nchanged\nc\nd\n", (2, 1)),
+    (b"a\nb", b"a\nb\n", (1, 1)),
+    (b"a\nb\nc\nd\n", b"d\nc\nb\na\n", (3, 3)),
+    (b"a\rb\n", b"a\rc\n", (1, 1)),
+])
+def test_count_changed_lines(old_data: bytes, new_data: bytes, expected: tuple[int, int]):
+    assert gor.count_changed_lines(old_data, new_data) == expected
+
+
+def test_count_changed_lines_expensive_diff():
+    old_data = b"".join(f"old {index}\n".encode() for index in range(200))
+    new_data = b"".join(f"new {index}\n".encode() for index in range(200))
+    assert gor.count_changed_lines(old_data, new_data) == (200, 200)
+
+
+def test_count_changed_lines_not_minimal_same_as_git():
+    # NOTE: Minimal diff keeps one empty line (7 insertions, 7 deletions), git's xdiff discards all of them.
+    old_data = b"m\nh\n\ni\nf\nb\ne\na\n"
+    new_data = b"\n\n\n\n\n\n\np\n"
+    assert gor.count_changed_lines(old_data, new_data) == (8, 8)
+
+
+def test_native_backend_same_as_git_show_not_minimal_diff(git_repo: Path):
+    (git_repo / "test_cases" / "test_blood_pump.py").write_bytes(b"m\nh\n\ni\nf\nb\ne\na\n")
+    commit_all(git_repo, "Rewrite test")
+    (git_repo / "test_cases" / "test_blood_pump.py").write_bytes(b"\n\n\n\n\n\n\np\n")
+    commit_all(git_repo, "Rewrite test again")
+
+    expected = list(cg.iter_commit_info(git_repo))
+    result = list(cg.iter_commit_info_native(git_repo))
+    assert result == expected
+    assert (expected[0]["Insertions: "], expected[0]["Deletions: "]) == (8, 8)
+
+
+def test_apply_delta():
+    base = b"0123456789"
+    # NOTE: Sizes 10 and 7, copy 4 bytes from offset 2, then insert 3 bytes "abc".
+    delta = bytes([10, 7, 0x80 | 0x01 | 0x10, 2, 4, 3]) + b"abc"
+    assert gor.apply_delta(base, delta) == b"2345abc"
+
+
+def test_apply_delta_wrong_base_size():
+    with pytest.raises(gor.UnsupportedObjectStore):
+        gor.apply_delta(b"0123", bytes([10, 0]))
+
+
+def test_format_date():
+    identity = b"arnas.zuklija <arnas.zuklija@qdevtechnologies.com> 1711488078 +0200"
+    assert gor.format_date(identity) == "2024-03-26 23:21:18 +0200"
+
+
+def test_format_message():
+    message = "\nTitle  \n\n\tBody\n\n\n"
+    assert gor.format_message(message) == "    Title\n    \n            Body\n"
+
+
+def test_read_loose_object(git_repo: Path):
+    reader = gor.GitObjectReader(git_repo)
+    head = reader.resolve_reference()
+    object_file = git_repo / ".git" / "objects" / head[:2] / head[2:]
+
+    object_type, content = reader.read_object(head)
+    assert object_type == "commit"
+    assert zlib.decompress(object_file.read_bytes()).endswith(content)
+    assert reader.read_commit(head)["message"] == b"Empty commit\n"
+
+
+def create_cache_options(cache_file: Path, **options) -> argparse.Namespace:
+    default_options = {"rev_range": "", "since": "", "until": "", "author": "", "paths": None,
+                       "cache_file": cache_file, "since_cached_head": True, "backend": "subprocess",
+                       "single_pass": False, "jobs": 1}
+    return argparse.Namespace(**{**default_options, **options})
+
+
+def test_since_cached_head_walks_all_commits_when_cached_head_is_gone(git_repo: Path, temp_dir: str):
+    cache_file = Path(tempfile.mkdtemp(dir=temp_dir)) / "cache.jsonl"
+    options = create_cache_options(cache_file)
+    list(cg.iter_repository_commits(git_repo, options))
+
+    run_git(git_repo, "reset", "-q", "--hard", "HEAD~2")
+    commit_all(git_repo, "Rewritten commit")
+    run_git(git_repo, "reflog", "expire", "--expire=now", "--all")
+    run_git(git_repo, "gc", "-q", "--prune=now")
+
+    result = list(cg.iter_repository_commits(git_repo, options))
+
+    assert result == list(cg.iter_commit_info(git_repo))
+    assert cg.load_commit_cache(cache_file)[1] == cg.get_head_commit(git_repo)
+
+
+def test_failed_commit_does_not_move_cached_head(git_repo: Path, temp_dir: str, monkeypatch):
+    cache_file = Path(tempfile.mkdtemp(dir=temp_dir)) / "cache.jsonl"
+    failing_commit = cg.get_commits(git_repo)[1]
+    get_commit_show_output = cg.get_commit_show_output
+    monkeypatch.setattr(cg, "get_commit_show_output", lambda repo, commit_hash: (
+        None if commit_hash == failing_commit else get_commit_show_output(repo, commit_hash)))
+
+    with pytest.raises(cg.IncompleteCommitWalk):
+        list(cg.iter_repository_commits(git_repo, create_cache_options(cache_file)))
+
+    cached_commits, cached_head = cg.load_commit_cache(cache_file)
+    assert len(cached_commits) == 4
+    assert failing_commit not in cached_commits
+    assert cached_head == ""
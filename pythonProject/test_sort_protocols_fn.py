@@ -0,0 +1,117 @@
+import logging
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+import sort_protocols as sp
+
+EXPORT_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<export version="1">
+  <header><title>Export – Žinutė</title></header>
+  <protocols count="{amount}">
+{protocols}
+  </protocols>
+  <footer>end</footer>
+</export>
+"""
+
+PROTOCOL_TEMPLATE = """    <protocol id="{index}">
+      <title>Protocol {index} &amp; more</title>
+      <test-script-reference>See https://git.example.com/ta/blob/main/{path} for details</test-script-reference>
+    </protocol>"""
+
+TEST_FILES = {
+    "test_cases/core/test_pump.py": "# Setup: Cleaning\n",
+    "test_cases/core/test_valve.py": "# Setup: Treatment\n",
+    "test_cases/ui/test_manual.py": "# Title: Semi-automated: check screen\n",
+}
+
+
+@pytest.fixture(autouse=True)
+def logger(monkeypatch):
+    monkeypatch.setattr(sp, "logger", logging.getLogger("sort_protocols"), raising=False)
+
+
+@pytest.fixture()
+def temp_dir():
+    temp_dir = tempfile.mkdtemp()
+    yield Path(temp_dir)
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def create_export(temp_dir: Path, amount: int = 12) -> tuple[Path, Path]:
+    test_automation_dir = temp_dir / "ta"
+    for path, text in TEST_FILES.items():
+        (test_automation_dir / path).parent.mkdir(parents=True, exist_ok=True)
+        (test_automation_dir / path).write_text(text, encoding="UTF-8")
+
+    paths = list(TEST_FILES) + ["test_cases/core/test_missing.py"]
+    protocols = "\n".join(PROTOCOL_TEMPLATE.format(index=index, path=paths[index % len(paths)])
+                          for index in range(amount))
+    export_file_name = temp_dir / "export.xml"
+    export_file_name.write_text(EXPORT_TEMPLATE.format(amount=amount, protocols=protocols), encoding="UTF-8")
+    return export_file_name, test_automation_dir
+
+
+def read_output_folder(output_folder: Path) -> dict[str, bytes]:
+    return {path.name: path.read_bytes() for path in sorted(output_folder.iterdir())}
+
+
+# NOTE: 5000 protocols span many parser chunks, protocol tails are split between them.
+@pytest.mark.parametrize("amount", [12, 5000])
+def test_stream_protocols_through_files_same_as_distribute(temp_dir: Path, amount: int):
+    export_file_name, test_automation_dir = create_export(temp_dir, amount)
+    (temp_dir / "in_memory").mkdir()
+    (temp_dir / "streamed").mkdir()
+
+    root = sp.parse_xml_file(export_file_name)
+    protocols_by_setup = sp.categorise_protocols_by_setup(test_automation_dir, root, ".py")
+    sp.distribute_protocols_through_files(protocols_by_setup, temp_dir / "in_memory", root)
+    sp.stream_protocols_through_files(export_file_name, test_automation_dir, ".py", temp_dir / "streamed")
+
+    expected = read_output_folder(temp_dir / "in_memory")
+    assert list(expected) == ["cleaning.xml", "semi-automated.xml", "treatment.xml", "unknown.xml"]
+    assert read_output_folder(temp_dir / "streamed") == expected
+
+
+def test_test_type_cache_reads_every_file_once(temp_dir: Path, monkeypatch):
+    export_file_name, test_automation_dir = create_export(temp_dir)
+    cache_file = temp_dir / "cache.json"
+    root = sp.parse_xml_file(export_file_name)
+    expected = sp.categorise_protocols_by_setup(test_automation_dir, root, ".py")
+
+    read_paths = []
+    read_text = Path.read_text
+    monkeypatch.setattr(Path, "read_text", lambda path, *args, **kwargs: read_paths.append(path.name) or
+                        read_text(path, *args, **kwargs))
+
+    cache = sp.TestTypeCache.load(cache_file)
+    assert sp.categorise_protocols_by_setup(test_automation_dir, root, ".py", cache) == expected
+    assert sorted(read_paths) == ["test_manual.py", "test_pump.py", "test_valve.py"]
+    cache.save(cache_file)
+
+    read_paths.clear()
+    cache = sp.TestTypeCache.load(cache_file)
+    assert sp.categorise_protocols_by_setup(test_automation_dir, root, ".py", cache) == expected
+    assert read_paths == []
+
+    (test_automation_dir / "test_cases" / "core" / "test_pump.py").write_text("# Setup: Priming\n", encoding="UTF-8")
+    cache = sp.TestTypeCache.load(cache_file)
+    result = sp.categorise_protocols_by_setup(test_automation_dir, root, ".py", cache)
+    assert read_paths == ["test_pump.py"]
+    assert len(result["priming"]) == len(expected["cleaning"])
+
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_categorise_protocols_by_setup_with_jobs_keeps_document_order(temp_dir: Path, use_cache: bool):
+    export_file_name, test_automation_dir = create_export(temp_dir)
+    root = sp.parse_xml_file(export_file_name)
+    expected = sp.categorise_protocols_by_setup(test_automation_dir, root, ".py")
+
+    cache = sp.TestTypeCache() if use_cache else None
+    result = sp.categorise_protocols_by_setup(test_automation_dir, root, ".py", cache, jobs=4)
+
+    assert result == expected
+    assert list(result) == list(expected)